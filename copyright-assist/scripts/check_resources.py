@@ -10,9 +10,17 @@ import os
 import argparse
 import sys
 import logging
+import multiprocessing
 from pathlib import Path
-from typing import List, Dict, Set
+from typing import Callable, List, Dict, Optional, Set, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 import json
+import time
+import hashlib
+import math
+import zlib
+from datetime import datetime
+from itertools import repeat
 
 # 配置日志
 logging.basicConfig(
@@ -43,11 +51,62 @@ MIN_REQUIREMENTS = {
     }
 }
 
+# 截图像素分析：每张图最多采样的像素数，以及判定“信息量过低”的阈值
+SCREENSHOT_MAX_SAMPLED_PIXELS = 40000
+# 每张图最多按 Average/Paeth 滤波逐字节还原的字节数（这两种滤波只能用 Python 循环还原），
+# 超出后停止解码，只用已解码区域的采样点
+SCREENSHOT_MAX_SLOW_DECODE_BYTES = 1024 * 1024
+SCREENSHOT_MIN_ENTROPY = 1.0   # 亮度直方图熵（比特）
+SCREENSHOT_MIN_STDDEV = 6.0    # 亮度标准差
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+# PNG 颜色类型对应的通道数：灰度、RGB、调色板、灰度+Alpha、RGBA
+PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# 打印报告时按目录分组最多显示的条目数
+BREAKDOWN_PRINT_LIMIT = 10
+
+# 检查报告历史记录默认目录
+DEFAULT_HISTORY_DIR = './.check_history'
+
+# 检查规则版本：统计或判断规则变化时递增，旧版本记录的类别结果不再复用
+CHECK_VERSION = 2
+
+# 各类别合并到报告中的消息列表（按类别顺序依次追加，条数记录在类别指纹的 counts 中）
+REPORT_MESSAGE_KEYS = ('warnings', 'recommendations', 'issues')
+
+# 进程池使用 spawn 启动方式：进程池在工作线程中创建，fork 可能复制其他线程持有的日志或导入锁导致子进程死锁
+PROCESS_POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+# 计算文件指纹时每次读取的字节数
+HASH_CHUNK_SIZE = 1024 * 1024
+
 # 忽略的目录
 IGNORE_DIRS = {
     '__pycache__', 'node_modules', '.git', '.venv', 'venv', 'env',
     'dist', 'build', 'target', '.idea', '.vscode', 'vendor',
-    'logs', 'tmp', 'temp', 'cache', '.cache'
+    'logs', 'tmp', 'temp', 'cache', '.cache', '.check_history'
+}
+
+# 各语言注释语法：行注释前缀、块注释（开始, 结束）标记与字符串引号，均为字节串以便按字节流处理
+_C_STYLE = {'line': (b'//',), 'block': ((b'/*', b'*/'),), 'string': (b'"', b"'")}
+_JS_STYLE = {**_C_STYLE, 'string': (b'"', b"'", b'`')}
+COMMENT_SYNTAX = {
+    '.py': {'line': (b'#',), 'block': ((b'"""', b'"""'), (b"'''", b"'''")), 'string': (b'"', b"'")},
+    '.rb': {'line': (b'#',), 'block': ((b'=begin', b'=end'),), 'string': (b'"', b"'")},
+    '.php': {'line': (b'//', b'#'), 'block': ((b'/*', b'*/'),), 'string': (b'"', b"'")},
+    # Rust 的单引号多用于生命周期标注，只把双引号当作字符串
+    '.rs': {**_C_STYLE, 'string': (b'"',)},
+    '.js': _JS_STYLE, '.ts': _JS_STYLE, '.go': _JS_STYLE,
+    '.java': _C_STYLE, '.c': _C_STYLE, '.cpp': _C_STYLE, '.swift': _C_STYLE,
+    '.kt': _C_STYLE, '.cs': _C_STYLE, '.m': _C_STYLE,
+}
+
+# 扩展名对应的语言名称（用于分语言统计）
+LANGUAGE_NAMES = {
+    '.py': 'Python', '.java': 'Java', '.c': 'C', '.cpp': 'C++', '.js': 'JavaScript',
+    '.ts': 'TypeScript', '.go': 'Go', '.rs': 'Rust', '.rb': 'Ruby', '.php': 'PHP',
+    '.swift': 'Swift', '.kt': 'Kotlin', '.cs': 'C#', '.m': 'Objective-C'
 }
 
 
@@ -71,19 +130,470 @@ def find_files_by_type(directory: Path, extensions: Set[str]) -> List[Path]:
     return files
 
 
-def count_lines_in_code(files: List[Path]) -> int:
-    """统计代码总行数"""
-    total_lines = 0
+def _string_end(line: bytes, start: int, quote: bytes) -> int:
+    """从 start 开始查找未被反斜杠转义的结束引号，找不到返回 -1"""
+    while True:
+        end = line.find(quote, start)
+        if end < 0:
+            return -1
+        escape = end
+        while escape > start and line[escape - 1] == 0x5C:
+            escape -= 1
+        if (end - escape) % 2 == 0:
+            return end
+        start = end + 1
+
+
+def _classify_block_line(line: bytes, pos: int, syntax: Dict) -> Tuple[bool, Optional[bytes]]:
+    """
+    从 pos 开始判断一行剩余部分（块注释之外）是否含代码
+    
+    按出现顺序处理块注释、行注释和字符串字面量：字符串内的注释标记不算注释；
+    同一行内找不到结束引号时把引号当作普通字符（如 Rust 生命周期标注）。
+    
+    Returns:
+        (该行是否含代码, 行尾仍未闭合的块注释结束标记或 None)
+    """
+    line_marks = syntax['line']
+    has_code = False
+    while True:
+        rest = line[pos:].strip()
+        if not rest or rest.startswith(line_marks):
+            return has_code, None
+        # 查找最先出现的块注释开始标记、行注释标记或引号（位置相同时块注释优先，如 Python 的三引号）
+        idx, kind, open_mark, close_mark = -1, None, b'', b''
+        for candidate_open, candidate_close in syntax['block']:
+            found = line.find(candidate_open, pos)
+            if found >= 0 and (idx < 0 or found < idx):
+                idx, kind, open_mark, close_mark = found, 'block', candidate_open, candidate_close
+        for mark in line_marks:
+            found = line.find(mark, pos)
+            if found >= 0 and (idx < 0 or found < idx):
+                idx, kind = found, 'line'
+        for quote in syntax['string']:
+            found = line.find(quote, pos)
+            if found >= 0 and (idx < 0 or found < idx):
+                idx, kind, open_mark = found, 'string', quote
+        if kind is None or kind == 'line':
+            return True, None
+        if kind == 'string':
+            has_code = True
+            end = _string_end(line, idx + 1, open_mark)
+            pos = idx + 1 if end < 0 else end + 1
+            continue
+        if line[pos:idx].strip():
+            has_code = True
+        end = line.find(close_mark, idx + len(open_mark))
+        if end < 0:
+            return has_code, close_mark
+        pos = end + len(close_mark)
+
+
+def _count_plain(stripped: List[bytes], line_marks: Tuple[bytes, ...]) -> Tuple[int, int, int]:
+    """按简单规则（空行 / 行注释开头 / 其余为代码）批量统计，全部为 C 级操作"""
+    blank = stripped.count(b'')
+    comment = sum(map(bytes.startswith, stripped, repeat(line_marks)))
+    return len(stripped) - blank - comment, comment, blank
+
+
+def _classify_chunk(data: bytes, syntax: Dict, close_mark: Optional[bytes]) -> Tuple[int, int, int, Optional[bytes]]:
+    """
+    分类一段由完整行组成的字节数据（最后一段可以不以换行结尾）
+    
+    close_mark 为上一段结束时仍未闭合的块注释结束标记。
+    
+    Returns:
+        (代码行数, 注释行数, 空行数, 本段结束时仍未闭合的块注释结束标记或 None)
+    """
+    lines = data.split(b'\n')
+    if lines[-1] == b'':
+        lines.pop()  # 末尾换行之后不构成新行
+    stripped = list(map(bytes.strip, lines))
+    total_lines = len(lines)
+    line_marks = syntax['line']
+    
+    code = comment = blank = 0
+    line_no = 0  # 当前待处理的行号
+    offset = 0   # 当前行在 data 中的起始偏移
+    pos = 0      # 当前行内待判断部分的起始位置
+    # 各块注释开始标记的下一次出现位置（缓存，避免对不存在的标记反复全文查找）
+    next_open = {open_mark: data.find(open_mark) for open_mark, _ in syntax['block']}
+    
+    while line_no < total_lines:
+        if close_mark is not None:
+            # 块注释内部：直接定位结束标记，中间的行批量计为注释行或空行
+            close_at = data.find(close_mark, offset)
+            close_line = total_lines if close_at < 0 else line_no + data.count(b'\n', offset, close_at)
+            inner = stripped[line_no:close_line]
+            inner_blank = inner.count(b'')
+            blank += inner_blank
+            comment += len(inner) - inner_blank
+            if close_at < 0:
+                break
+            line_no = close_line
+            offset = data.rfind(b'\n', 0, close_at) + 1
+            pos = close_at - offset + len(close_mark)
+        else:
+            # 普通区域：直到下一个块注释开始标记所在行为止，批量分类
+            for open_mark, found in next_open.items():
+                if 0 <= found < offset:
+                    next_open[open_mark] = data.find(open_mark, offset)
+            markers = [found for found in next_open.values() if found >= 0]
+            marker = min(markers) if markers else -1
+            end_line = total_lines if marker < 0 else line_no + data.count(b'\n', offset, marker)
+            c, m, b = _count_plain(stripped[line_no:end_line], line_marks)
+            code, comment, blank = code + c, comment + m, blank + b
+            if marker < 0:
+                break
+            line_no = end_line
+            offset = data.rfind(b'\n', 0, marker) + 1
+            pos = 0
+        
+        # 含块注释标记的行（或块注释闭合所在行）逐字判断
+        has_code, close_mark = _classify_block_line(lines[line_no], pos, syntax)
+        if has_code:
+            code += 1
+        else:
+            comment += 1
+        offset += len(lines[line_no]) + 1
+        line_no += 1
+    
+    return code, comment, blank, close_mark
+
+
+def _line_chunks(f, size: int = HASH_CHUNK_SIZE):
+    """按块读取文件，每块在最后一个换行处截断，不完整的行留到下一块"""
+    carry = b''
+    while True:
+        chunk = f.read(size)
+        if not chunk:
+            if carry:
+                yield carry
+            return
+        data = carry + chunk
+        cut = data.rfind(b'\n') + 1
+        if cut:
+            yield data[:cut]
+        carry = data[cut:]
+
+
+def classify_lines(file_path: Path) -> Dict[str, int]:
+    """
+    将源文件的每一行分类为代码行、注释行或空行
+    
+    以字节方式按块流式读取（每块约 1MB，在换行处截断），不做解码，内存占用与文件大小无关。
+    普通区域用 split/strip/count 等 C 级操作批量分类；只有 bytes.find 命中块注释标记的行
+    才逐字判断（跳过字符串字面量，字符串中的注释标记不算注释），块注释内部的行直接定位
+    结束标记后批量计数，未闭合的块注释跨块延续。
+    同一行既有代码又有注释时计为代码行（与 cloc 口径一致）。跨行字符串（如模板字符串）
+    按普通行处理。
+    
+    Returns:
+        {'code': 代码行数, 'comment': 注释行数, 'blank': 空行数, 'bytes': 文件字节数}
+    """
+    syntax = COMMENT_SYNTAX.get(file_path.suffix.lower(), _C_STYLE)
+    
+    code = comment = blank = size = 0
+    close_mark = None
+    with open(file_path, 'rb') as f:
+        for data in _line_chunks(f):
+            c, m, b, close_mark = _classify_chunk(data, syntax, close_mark)
+            code, comment, blank = code + c, comment + m, blank + b
+            size += len(data)
+    
+    return {'code': code, 'comment': comment, 'blank': blank, 'bytes': size}
+
+
+def _add_to_breakdown(breakdown: Dict[str, Dict[str, int]], key: str, size: int, lines: int) -> None:
+    """累加一个文件到分组计数器（只保存每组的文件数、字节数和行数）"""
+    stats = breakdown.get(key)
+    if stats is None:
+        stats = breakdown[key] = {'files': 0, 'bytes': 0, 'lines': 0}
+    stats['files'] += 1
+    stats['bytes'] += size
+    stats['lines'] += lines
+
+
+def _top_level_dir(file_path: Path, base_dir: Optional[Path]) -> str:
+    """文件相对基准目录的顶层目录名，直接位于基准目录下的文件记为 '.'"""
+    if base_dir is None:
+        return file_path.parent.name or '.'
+    parts = file_path.relative_to(base_dir).parts
+    return parts[0] if len(parts) > 1 else '.'
+
+
+def classify_code_lines(files: List[Path], base_dir: Optional[Path] = None) -> Dict:
+    """
+    统计所有代码文件的代码行、注释行和空行（按语言汇总并给出总计）
+    
+    在同一次读取中顺带累计按扩展名、按顶层目录的文件数、字节数和行数，
+    只保存分组计数，不保留逐文件列表。
+    
+    Args:
+        files: 代码文件列表
+        base_dir: 代码根目录（用于确定顶层目录，可选）
+    
+    Returns:
+        {'by_language': {语言: {'files', 'code', 'comment', 'blank', 'bytes'}},
+         'by_extension': {扩展名: {'files', 'bytes', 'lines'}},
+         'by_directory': {顶层目录: {'files', 'bytes', 'lines'}},
+         'total': {'files', 'code', 'comment', 'blank', 'bytes', 'lines'}}
+    """
+    by_language: Dict[str, Dict[str, int]] = {}
+    by_extension: Dict[str, Dict[str, int]] = {}
+    by_directory: Dict[str, Dict[str, int]] = {}
+    total = {'files': 0, 'code': 0, 'comment': 0, 'blank': 0, 'bytes': 0}
     
     for file_path in files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                total_lines += sum(1 for _ in f)
+            counts = classify_lines(file_path)
         except Exception as e:
             logger.warning(f"读取文件失败 {file_path}: {e}")
             continue
+        
+        suffix = file_path.suffix.lower()
+        language = LANGUAGE_NAMES.get(suffix, suffix)
+        stats = by_language.setdefault(language, {'files': 0, 'code': 0, 'comment': 0, 'blank': 0, 'bytes': 0})
+        stats['files'] += 1
+        total['files'] += 1
+        for key, value in counts.items():
+            stats[key] += value
+            total[key] += value
+        
+        lines = counts['code'] + counts['comment'] + counts['blank']
+        _add_to_breakdown(by_extension, suffix, counts['bytes'], lines)
+        _add_to_breakdown(by_directory, _top_level_dir(file_path, base_dir), counts['bytes'], lines)
     
-    return total_lines
+    total['lines'] = total['code'] + total['comment'] + total['blank']
+    return {
+        'by_language': by_language,
+        'by_extension': by_extension,
+        'by_directory': by_directory,
+        'total': total
+    }
+
+
+def _png_add(row: bytes, prev: bytes) -> bytes:
+    """逐字节计算 (row + prev) mod 256：把每个字节放进16位通道后用大整数一次相加"""
+    n = len(row)
+    wide_row = bytearray(2 * n)
+    wide_row[1::2] = row
+    wide_prev = bytearray(2 * n)
+    wide_prev[1::2] = prev
+    total = int.from_bytes(wide_row, 'big') + int.from_bytes(wide_prev, 'big')
+    return total.to_bytes(2 * n, 'big')[1::2]
+
+
+def _png_prefix_sum(row: bytes, bpp: int) -> bytes:
+    """Sub 滤波还原：按通道做 mod 256 前缀和（16位通道 + 倍增步长的并行扫描）"""
+    n = len(row)
+    wide = bytearray(2 * n)
+    wide[1::2] = row
+    value = int.from_bytes(wide, 'big')
+    mask = int.from_bytes(b'\x00\xff' * n, 'big')
+    step = bpp
+    while step < n:
+        value = (value + (value >> (16 * step))) & mask
+        step *= 2
+    return value.to_bytes(2 * n, 'big')[1::2]
+
+
+def png_unfilter(filter_type: int, row: bytes, prev: bytes, bpp: int) -> bytes:
+    """还原一行 PNG 扫描线的滤波"""
+    if filter_type == 0:
+        return row
+    if filter_type == 1:
+        return _png_prefix_sum(row, bpp)
+    if filter_type == 2:
+        return _png_add(row, prev)
+    
+    out = bytearray(row)
+    if filter_type == 3:
+        for i in range(len(out)):
+            left = out[i - bpp] if i >= bpp else 0
+            out[i] = (out[i] + ((left + prev[i]) >> 1)) & 0xFF
+    elif filter_type == 4:
+        for i in range(len(out)):
+            a = out[i - bpp] if i >= bpp else 0
+            b = prev[i]
+            c = prev[i - bpp] if i >= bpp else 0
+            pa, pb, pc = abs(b - c), abs(a - c), abs(a + b - 2 * c)
+            if pa <= pb and pa <= pc:
+                predictor = a
+            elif pb <= pc:
+                predictor = b
+            else:
+                predictor = c
+            out[i] = (out[i] + predictor) & 0xFF
+    else:
+        raise ValueError(f"未知的PNG滤波类型: {filter_type}")
+    return bytes(out)
+
+
+def _read_png_chunks(file_path: Path) -> Tuple[Dict, bytes, List[bytes]]:
+    """读取 PNG 的 IHDR、PLTE 以及全部 IDAT 数据块（仅保留压缩数据，不解压）"""
+    with open(file_path, 'rb') as f:
+        if f.read(8) != PNG_SIGNATURE:
+            raise ValueError("不是有效的PNG文件")
+        header = None
+        palette = b''
+        idat = []
+        while True:
+            length_bytes = f.read(4)
+            if len(length_bytes) < 4:
+                break
+            length = int.from_bytes(length_bytes, 'big')
+            chunk_type = f.read(4)
+            data = f.read(length)
+            f.read(4)  # CRC
+            if chunk_type == b'IHDR':
+                header = {
+                    'width': int.from_bytes(data[0:4], 'big'),
+                    'height': int.from_bytes(data[4:8], 'big'),
+                    'bit_depth': data[8],
+                    'color_type': data[9],
+                    'interlace': data[12]
+                }
+            elif chunk_type == b'PLTE':
+                palette = data
+            elif chunk_type == b'IDAT':
+                idat.append(data)
+            elif chunk_type == b'IEND':
+                break
+    if header is None:
+        raise ValueError("缺少IHDR数据块")
+    return header, palette, idat
+
+
+def analyze_png_pixels(file_path: Path, max_samples: int = SCREENSHOT_MAX_SAMPLED_PIXELS,
+                       max_slow_bytes: int = SCREENSHOT_MAX_SLOW_DECODE_BYTES) -> Dict:
+    """
+    采样分析 PNG 截图的像素统计，用于识别空白或信息量极低的截图
+    
+    用 zlib 流式解压 IDAT，只还原网格采样行以及采样行依赖的行：Up/Average/Paeth
+    滤波依赖上一行，从采样行向上追溯到最近的 None/Sub 行（或上一个已还原的行）为止，
+    其余行只解压不还原；最后一个采样行之后不再解压。
+    
+    两个上限：采样点数不超过 max_samples；按 Average/Paeth 还原的字节数不超过
+    max_slow_bytes（逐字节 Python 循环，是主要耗时），超出后停止解码，只用图像上部已解码
+    区域的采样点，结果中 truncated 为 True，decoded_rows 为已解码到的行数。
+    
+    Returns:
+        {'width', 'height', 'sampled', 'decoded_rows', 'truncated', 'entropy', 'stddev', 'low_information'}，
+        无法分析时返回 {'error': 原因}
+    """
+    try:
+        header, palette, idat = _read_png_chunks(file_path)
+    except Exception as e:
+        return {'error': str(e)}
+    
+    width, height = header['width'], header['height']
+    channels = PNG_CHANNELS.get(header['color_type'])
+    if channels is None or header['bit_depth'] not in (8, 16) or header['interlace']:
+        return {'error': '不支持的PNG格式（仅支持8/16位非隔行扫描）'}
+    if header['color_type'] == 3 and header['bit_depth'] != 8:
+        return {'error': '不支持的PNG格式（调色板图像仅支持8位）'}
+    if width == 0 or height == 0:
+        return {'error': '图像尺寸为0'}
+    
+    bytes_per_sample = header['bit_depth'] // 8
+    bpp = channels * bytes_per_sample
+    stride = width * bpp
+    
+    # 网格步长：保证采样点数不超过上限
+    step = 1
+    while (width // step + 1) * (height // step + 1) > max_samples:
+        step += 1
+    sample_columns = range(0, width, step)
+    last_sampled_row = (height - 1) // step * step
+    
+    histogram = [0] * 256
+    decompressor = zlib.decompressobj()
+    pending = b''
+    prev = bytes(stride)  # 最近一个已还原的行（window 之前的那一行）
+    window: List[bytes] = []  # 上次还原之后、尚未还原的滤波行（含滤波类型字节）
+    slow_bytes = 0
+    truncated = False
+    y = 0
+    
+    try:
+        for chunk in idat:
+            pending += decompressor.decompress(chunk)
+            pos = 0
+            while len(pending) - pos > stride and y <= last_sampled_row and not truncated:
+                window.append(pending[pos:pos + stride + 1])
+                pos += stride + 1
+                if y % step == 0:
+                    # 向上追溯依赖链：None/Sub 行不依赖上一行
+                    start = len(window) - 1
+                    while start > 0 and window[start][0] >= 2:
+                        start -= 1
+                    row = prev
+                    for filtered in window[start:]:
+                        if filtered[0] >= 3:
+                            slow_bytes += stride
+                        row = png_unfilter(filtered[0], filtered[1:], row, bpp)
+                    for x in sample_columns:
+                        offset = x * bpp
+                        if header['color_type'] == 3:
+                            index = row[offset] * 3
+                            r, g, b = palette[index:index + 3] or b'\x00\x00\x00'
+                        elif channels >= 3:
+                            r = row[offset]
+                            g = row[offset + bytes_per_sample]
+                            b = row[offset + 2 * bytes_per_sample]
+                        else:
+                            r = g = b = row[offset]
+                        histogram[(299 * r + 587 * g + 114 * b) // 1000] += 1
+                    prev = row
+                    window = []
+                    truncated = slow_bytes > max_slow_bytes and y < last_sampled_row
+                y += 1
+            pending = pending[pos:]
+            if y > last_sampled_row or truncated:
+                break
+    except Exception as e:
+        return {'error': f'PNG解码失败: {e}'}
+    
+    sampled = sum(histogram)
+    if not sampled:
+        return {'error': '未能采样到任何像素'}
+    
+    mean = sum(level * count for level, count in enumerate(histogram)) / sampled
+    variance = sum(count * (level - mean) ** 2 for level, count in enumerate(histogram)) / sampled
+    entropy = max(0.0, -sum(
+        (count / sampled) * math.log2(count / sampled) for count in histogram if count
+    ))
+    stddev = math.sqrt(variance)
+    
+    return {
+        'width': width,
+        'height': height,
+        'sampled': sampled,
+        'decoded_rows': y,
+        'truncated': truncated,
+        'entropy': round(entropy, 3),
+        'stddev': round(stddev, 2),
+        'low_information': entropy < SCREENSHOT_MIN_ENTROPY or stddev < SCREENSHOT_MIN_STDDEV
+    }
+
+
+def analyze_screenshot_pixels(files: List[Path], max_workers: Optional[int] = None) -> Dict[Path, Dict]:
+    """
+    使用进程池并行分析 PNG 截图的像素统计（CPU 密集型）
+    
+    Returns:
+        {文件路径: analyze_png_pixels 的结果}
+    """
+    png_files = [f for f in files if f.suffix.lower() == '.png']
+    if not png_files:
+        return {}
+    
+    if len(png_files) == 1:
+        return {png_files[0]: analyze_png_pixels(png_files[0])}
+    
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=PROCESS_POOL_CONTEXT) as executor:
+        return dict(zip(png_files, executor.map(analyze_png_pixels, png_files)))
 
 
 def analyze_screenshots(files: List[Path]) -> Dict:
@@ -93,7 +603,10 @@ def analyze_screenshots(files: List[Path]) -> Dict:
         return {
             'count': 0,
             'size_range': '0 KB',
-            'formats': set(),
+            'total_size_kb': 0,
+            'avg_size_kb': 0,
+            'formats': [],
+            'pixel_stats': {},
             'issues': []
         }
     
@@ -130,18 +643,50 @@ def analyze_screenshots(files: List[Path]) -> Dict:
         for file_name, size_kb in low_resolution_files:
             logger.warning(f"  - {file_name}: {size_kb:.1f} KB")
     
+    # 像素采样分析：识别空白、纯色等信息量极低的截图
+    pixel_stats = {}
+    low_information_files = []
+    for file_path, stats in analyze_screenshot_pixels(files).items():
+        pixel_stats[file_path.name] = stats
+        if 'error' in stats:
+            logger.warning(f"截图像素分析失败 {file_path}: {stats['error']}")
+            continue
+        if stats['low_information']:
+            low_information_files.append(file_path.name)
+            issues.append({
+                'file': file_path.name,
+                'issue': '截图内容接近空白或纯色，信息量过低',
+                'entropy': stats['entropy'],
+                'stddev': stats['stddev'],
+                'recommendation': '请替换为展示实际功能界面的截图，避免加载页、空白页或纯色画面'
+            })
+    
+    if low_information_files:
+        logger.warning(f"发现 {len(low_information_files)} 个信息量过低的截图:")
+        for file_name in low_information_files:
+            logger.warning(f"  - {file_name}")
+    
     return {
         'count': len(files),
         'total_size_kb': total_size / 1024,
         'avg_size_kb': avg_size / 1024,
         'formats': list(formats),
+        'pixel_stats': pixel_stats,
         'issues': issues
     }
 
 
-def check_code_sufficiency(files: List[Path]) -> Dict:
-    """检查代码是否满足软著要求"""
-    total_lines = count_lines_in_code(files)
+def check_code_sufficiency(files: List[Path], base_dir: Optional[Path] = None) -> Dict:
+    """
+    检查代码是否满足软著要求
+    
+    行数阈值按物理行（含空行和注释）判断，与官方口径一致；
+    同时给出代码/注释/空行分类统计（含按扩展名、按顶层目录的分组），
+    有效代码行不足时额外提示。
+    """
+    sloc = classify_code_lines(files, base_dir)
+    total_lines = sloc['total']['lines']
+    code_lines = sloc['total']['code']
     min_required_lines = 3000  # 60页 × 50行
     
     issues = []
@@ -154,10 +699,29 @@ def check_code_sufficiency(files: List[Path]) -> Dict:
             'recommendation': f'代码行数 ({total_lines}) 不足，建议补充至少 {min_required_lines - total_lines} 行',
             'solution': '参考文档：references/source-code-format.md 了解如何补充代码'
         })
+    elif code_lines < min_required_lines:
+        issues.append({
+            'type': 'code_effective_low',
+            'current_lines': total_lines,
+            'code_lines': code_lines,
+            'required_lines': min_required_lines,
+            'recommendation': (
+                f'物理行数 ({total_lines}) 达标，但有效代码行仅 {code_lines} 行，'
+                f'注释 {sloc["total"]["comment"]} 行、空行 {sloc["total"]["blank"]} 行，审查时可能被质疑'
+            ),
+            'solution': '建议补充实际业务代码，减少大段注释和空行填充'
+        })
     
     return {
         'total_files': len(files),
         'total_lines': total_lines,
+        'code_lines': code_lines,
+        'comment_lines': sloc['total']['comment'],
+        'blank_lines': sloc['total']['blank'],
+        'total_bytes': sloc['total']['bytes'],
+        'by_language': sloc['by_language'],
+        'by_extension': sloc['by_extension'],
+        'by_directory': sloc['by_directory'],
         'required_lines': min_required_lines,
         'sufficient': total_lines >= min_required_lines,
         'recommendation': (
@@ -169,25 +733,14 @@ def check_code_sufficiency(files: List[Path]) -> Dict:
     }
 
 
-def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -> Dict:
-    """生成资源检查报告"""
-    logger.info("开始生成资源检查报告...")
-    
-    report = {
-        'timestamp': str(Path.cwd()),
-        'status': 'unknown',
-        'categories': {},
-        'warnings': [],
-        'recommendations': [],
-        'issues': []
-    }
-    
-    # 检查源代码
+def _check_code_category(code_dir: Path, code_files: List[Path]) -> Dict:
+    """检查源代码类别，返回该类别的检查结果与问题"""
     logger.info("检查源代码...")
-    code_files = find_files_by_type(code_dir, MIN_REQUIREMENTS['code']['extensions'])
-    code_check = check_code_sufficiency(code_files)
+    result = {'warnings': [], 'recommendations': [], 'issues': []}
+    
+    code_check = check_code_sufficiency(code_files, code_dir)
     
-    report['categories']['code'] = {
+    result['category'] = {
         'description': '源代码文件',
         'found': len(code_files),
         'required': MIN_REQUIREMENTS['code']['min_count'],
@@ -196,8 +749,8 @@ def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -
     }
     
     if len(code_files) < MIN_REQUIREMENTS['code']['min_count']:
-        report['warnings'].append("源代码文件数量不足")
-        report['issues'].append({
+        result['warnings'].append("源代码文件数量不足")
+        result['issues'].append({
             'category': 'code',
             'issue': 'code_count_insufficient',
             'message': '源代码文件数量不足',
@@ -207,21 +760,26 @@ def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -
         })
     
     if not code_check['sufficient']:
-        report['warnings'].append("代码行数不满足软著要求（需要至少3000行）")
-        report['recommendations'].append(
+        result['warnings'].append("代码行数不满足软著要求（需要至少3000行）")
+        result['recommendations'].append(
             f"建议补充代码，或参考 references/source-code-format.md 了解代码格式要求"
         )
     
     # 收集代码问题
     if code_check.get('issues'):
-        report['issues'].extend(code_check['issues'])
+        result['issues'].extend(code_check['issues'])
     
-    # 检查截图
+    return result
+
+
+def _check_screenshot_category(screenshot_dir: Path, screenshot_files: List[Path]) -> Dict:
+    """检查截图类别，返回该类别的检查结果与问题"""
     logger.info("检查截图文件...")
-    screenshot_files = find_files_by_type(screenshot_dir, MIN_REQUIREMENTS['screenshot']['extensions'])
+    result = {'warnings': [], 'recommendations': [], 'issues': []}
+    
     screenshot_info = analyze_screenshots(screenshot_files)
     
-    report['categories']['screenshot'] = {
+    result['category'] = {
         'description': '软件运行截图',
         'found': screenshot_info['count'],
         'required': MIN_REQUIREMENTS['screenshot']['min_count'],
@@ -230,12 +788,12 @@ def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -
     }
     
     if screenshot_info['count'] < MIN_REQUIREMENTS['screenshot']['min_count']:
-        report['warnings'].append(f"截图数量不足（需要至少{MIN_REQUIREMENTS['screenshot']['min_count']}张）")
-        report['recommendations'].append(
+        result['warnings'].append(f"截图数量不足（需要至少{MIN_REQUIREMENTS['screenshot']['min_count']}张）")
+        result['recommendations'].append(
             f"建议准备软件运行截图，包括：登录界面、主要功能模块、数据操作、报表导出等场景，每个场景至少2-3张截图。"
             f"参考文档：references/user-manual-guide.md 了解截图规范。"
         )
-        report['issues'].append({
+        result['issues'].append({
             'category': 'screenshot',
             'issue': 'screenshot_count_insufficient',
             'message': '截图数量不足',
@@ -246,17 +804,22 @@ def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -
     
     # 收集截图问题
     if screenshot_info.get('issues'):
-        report['issues'].extend(screenshot_info['issues'])
-        report['warnings'].append("部分截图可能存在问题（分辨率过低）")
-        report['recommendations'].append(
-            "建议检查截图分辨率，确保至少1280x720，文件大小建议大于100KB。"
+        result['issues'].extend(screenshot_info['issues'])
+        result['warnings'].append("部分截图可能存在问题（分辨率过低或内容接近空白）")
+        result['recommendations'].append(
+            "建议检查截图分辨率，确保至少1280x720，文件大小建议大于100KB；"
+            "避免提交加载页、空白页或纯色画面。"
         )
     
-    # 检查文档
+    return result
+
+
+def _check_document_category(doc_dir: Path, doc_files: List[Path]) -> Dict:
+    """检查项目文档类别，返回该类别的检查结果与问题"""
     logger.info("检查项目文档...")
-    doc_files = find_files_by_type(doc_dir, MIN_REQUIREMENTS['document']['extensions'])
+    result = {'warnings': [], 'recommendations': [], 'issues': []}
     
-    report['categories']['document'] = {
+    result['category'] = {
         'description': '项目文档',
         'found': len(doc_files),
         'required': MIN_REQUIREMENTS['document']['min_count'],
@@ -267,10 +830,10 @@ def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -
     }
     
     if not doc_files:
-        report['recommendations'].append(
+        result['recommendations'].append(
             "建议准备项目文档（如README、需求文档、设计文档等），有助于说明书撰写。"
         )
-        report['issues'].append({
+        result['issues'].append({
             'category': 'document',
             'issue': 'document_missing',
             'message': '未找到项目文档',
@@ -279,18 +842,338 @@ def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path) -
     else:
         logger.info(f"找到 {len(doc_files)} 个文档文件")
     
+    return result
+
+
+def _hash_file(file_path: Path) -> str:
+    """流式计算文件内容的 SHA-256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_files(files: List[Path], base_dir: Path, previous: Optional[Dict] = None) -> Dict:
+    """
+    计算一组文件的内容指纹
+    
+    大小和修改时间与上次记录一致时直接沿用上次的哈希，不再读取文件内容。
+    
+    Args:
+        files: 文件列表
+        base_dir: 用于计算相对路径的基准目录
+        previous: 上次运行该类别的指纹（可选）
+    
+    Returns:
+        {'digest': 类别整体指纹, 'files': {相对路径: {'size', 'mtime_ns', 'sha256'}}}
+    """
+    previous_files = (previous or {}).get('files', {})
+    fingerprints = {}
+    
+    for file_path in files:
+        rel_path = file_path.relative_to(base_dir).as_posix()
+        try:
+            stat = file_path.stat()
+            old = previous_files.get(rel_path)
+            if old and old['size'] == stat.st_size and old['mtime_ns'] == stat.st_mtime_ns:
+                sha256 = old['sha256']
+            else:
+                sha256 = _hash_file(file_path)
+        except Exception as e:
+            logger.warning(f"计算文件指纹失败 {file_path}: {e}")
+            continue
+        fingerprints[rel_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': sha256}
+    
+    digest = hashlib.sha256()
+    for rel_path in sorted(fingerprints):
+        digest.update(rel_path.encode('utf-8') + b'\0' + fingerprints[rel_path]['sha256'].encode('ascii') + b'\n')
+    
+    return {'digest': digest.hexdigest(), 'files': fingerprints}
+
+
+def _category_result_from_report(report: Dict, name: str) -> Optional[Dict]:
+    """
+    从报告中还原单个类别的检查结果：类别详情取自 categories，
+    警告、建议和问题按各类别指纹中记录的条数从合并后的列表中切出
+    
+    Returns:
+        类别检查结果，报告缺少所需信息时返回 None
+    """
+    offsets = dict.fromkeys(REPORT_MESSAGE_KEYS, 0)
+    for category in report.get('categories', {}):
+        counts = report.get('fingerprints', {}).get(category, {}).get('counts')
+        if counts is None:
+            return None
+        if category == name:
+            result = {'category': report['categories'][name]}
+            for key in REPORT_MESSAGE_KEYS:
+                result[key] = report.get(key, [])[offsets[key]:offsets[key] + counts[key]]
+            return result
+        for key in REPORT_MESSAGE_KEYS:
+            offsets[key] += counts[key]
+    return None
+
+
+def _run_category(name: str, func: Callable[[Path, List[Path]], Dict], directory: Path,
+                  previous: Optional[Dict]) -> Tuple[Dict, Dict, float, bool]:
+    """
+    执行单个类别的检查并记录耗时（秒）
+    
+    类别指纹与上次运行一致时直接复用上次结果，跳过该类别的全部分析。
+    
+    Returns:
+        (类别检查结果, 类别指纹（含检查规则版本和各类消息条数）, 耗时, 是否复用上次结果)
+    """
+    start = time.perf_counter()
+    files = find_files_by_type(directory, MIN_REQUIREMENTS[name]['extensions'])
+    previous_fingerprint = (previous or {}).get('fingerprints', {}).get(name)
+    fingerprint = fingerprint_files(files, directory, previous_fingerprint)
+    fingerprint['version'] = CHECK_VERSION
+    
+    result = None
+    if previous_fingerprint and previous_fingerprint.get('version') == CHECK_VERSION \
+            and previous_fingerprint.get('digest') == fingerprint['digest']:
+        result = _category_result_from_report(previous, name)
+    reused = result is not None
+    if reused:
+        logger.info(f"{name} 类别内容未变化，复用上次检查结果")
+    else:
+        result = func(directory, files)
+    
+    fingerprint['counts'] = {key: len(result[key]) for key in REPORT_MESSAGE_KEYS}
+    return result, fingerprint, time.perf_counter() - start, reused
+
+
+def generate_check_report(code_dir: Path, doc_dir: Path, screenshot_dir: Path,
+                          previous: Optional[Dict] = None) -> Dict:
+    """
+    生成资源检查报告
+    
+    代码、截图、文档三类检查相互独立且以I/O为主，使用线程池并发执行；
+    结果按固定顺序（code → screenshot → document）合并，保证报告内容确定。
+    
+    Args:
+        code_dir: 代码目录
+        doc_dir: 文档目录
+        screenshot_dir: 截图目录
+        previous: 上次的检查报告（可选），内容未变化的类别直接复用其结果
+    """
+    logger.info("开始生成资源检查报告...")
+    
+    report = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'status': 'unknown',
+        'directories': {
+            'code': str(code_dir.resolve()),
+            'screenshot': str(screenshot_dir.resolve()),
+            'document': str(doc_dir.resolve())
+        },
+        'categories': {},
+        'warnings': [],
+        'recommendations': [],
+        'issues': [],
+        'timings': {},
+        'reused_categories': [],
+        'fingerprints': {}
+    }
+    
+    checks = [
+        ('code', _check_code_category, code_dir),
+        ('screenshot', _check_screenshot_category, screenshot_dir),
+        ('document', _check_document_category, doc_dir),
+    ]
+    
+    total_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        futures = [
+            (name, executor.submit(_run_category, name, func, directory, previous))
+            for name, func, directory in checks
+        ]
+        # 按提交顺序收集结果，而非完成顺序
+        for name, future in futures:
+            result, fingerprint, elapsed, reused = future.result()
+            report['categories'][name] = result['category']
+            report['warnings'].extend(result['warnings'])
+            report['recommendations'].extend(result['recommendations'])
+            report['issues'].extend(result['issues'])
+            report['timings'][name] = round(elapsed, 3)
+            report['fingerprints'][name] = fingerprint
+            if reused:
+                report['reused_categories'].append(name)
+    report['timings']['total'] = round(time.perf_counter() - total_start, 3)
+    
     # 总体状态
-    code_ok = report['categories']['code']['sufficient'] and code_check['sufficient']
+    code_ok = report['categories']['code']['sufficient'] and report['categories']['code']['details']['sufficient']
     screenshot_ok = report['categories']['screenshot']['sufficient']
-    no_critical_issues = len([i for i in report['issues'] if i.get('type') == 'code_insufficient']) == 0
     
     report['status'] = 'ready' if (code_ok and screenshot_ok) else 'needs_action'
     
     logger.info(f"资源检查完成，状态: {report['status']}")
+    logger.info("各类别耗时: " + ", ".join(f"{k}={v:.3f}s" for k, v in report['timings'].items()))
     
     return report
 
 
+def get_project_key(code_dir: Path, project: Optional[str] = None) -> str:
+    """
+    生成历史记录使用的项目键
+    
+    未指定项目名时使用代码目录名加绝对路径哈希，避免同名目录互相覆盖。
+    """
+    if project:
+        return project.replace('/', '_').replace('\\', '_')
+    resolved = code_dir.resolve()
+    path_hash = hashlib.sha256(str(resolved).encode('utf-8')).hexdigest()[:8]
+    return f"{resolved.name or 'root'}_{path_hash}"
+
+
+def save_report_history(report: Dict, history_dir: Path, project_key: str) -> Path:
+    """将检查报告保存到历史记录目录（按项目区分，文件名按时间排序）"""
+    project_dir = history_dir / project_key
+    project_dir.mkdir(parents=True, exist_ok=True)
+    history_path = project_dir / f"{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.json"
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False)
+    logger.info(f"检查报告已写入历史记录: {history_path}")
+    return history_path
+
+
+def load_previous_report(history_dir: Path, project_key: str, reference: str = 'last') -> Optional[Dict]:
+    """
+    读取历史检查报告
+    
+    Args:
+        history_dir: 历史记录目录
+        project_key: 项目键
+        reference: 'last' 表示该项目最近一次记录，否则视为报告JSON文件路径
+    
+    Returns:
+        报告字典，不存在时返回 None
+    """
+    if reference == 'last':
+        project_dir = history_dir / project_key
+        candidates = sorted(project_dir.glob('*.json')) if project_dir.exists() else []
+        if not candidates:
+            return None
+        report_path = candidates[-1]
+    else:
+        report_path = Path(reference)
+        if not report_path.exists():
+            logger.warning(f"历史报告不存在: {report_path}")
+            return None
+    
+    try:
+        with open(report_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.warning(f"读取历史报告失败 {report_path}: {e}")
+        return None
+
+
+def _issue_key(issue: Dict) -> str:
+    """问题的稳定标识（用于比较两次运行的问题列表）"""
+    return json.dumps(issue, sort_keys=True, ensure_ascii=False)
+
+
+def diff_reports(previous: Dict, current: Dict) -> Dict:
+    """
+    比较两次检查报告
+    
+    按类别比较文件指纹：类别整体指纹一致时直接跳过该类别的逐文件比较。
+    
+    Returns:
+        {'previous_timestamp', 'status', 'files', 'lines', 'issues'}
+    """
+    diff = {
+        'previous_timestamp': previous.get('timestamp'),
+        'status': {'previous': previous.get('status'), 'current': current.get('status')},
+        'files': {},
+        'lines': {},
+        'issues': {'added': [], 'resolved': []}
+    }
+    
+    previous_fps = previous.get('fingerprints', {})
+    for name, fingerprint in current.get('fingerprints', {}).items():
+        old = previous_fps.get(name, {})
+        if old.get('digest') == fingerprint['digest']:
+            continue
+        old_files = old.get('files', {})
+        new_files = fingerprint['files']
+        diff['files'][name] = {
+            'added': sorted(set(new_files) - set(old_files)),
+            'removed': sorted(set(old_files) - set(new_files)),
+            'modified': sorted(
+                path for path in set(new_files) & set(old_files)
+                if new_files[path]['sha256'] != old_files[path]['sha256']
+            )
+        }
+    
+    # 代码行数变化（总计与分语言）
+    old_code = previous.get('categories', {}).get('code', {}).get('details', {})
+    new_code = current.get('categories', {}).get('code', {}).get('details', {})
+    for key in ('total_lines', 'code_lines', 'comment_lines', 'blank_lines'):
+        before, after = old_code.get(key, 0), new_code.get(key, 0)
+        if before != after:
+            diff['lines'][key] = {'previous': before, 'current': after, 'delta': after - before}
+    old_languages = old_code.get('by_language', {})
+    new_languages = new_code.get('by_language', {})
+    for language in sorted(set(old_languages) | set(new_languages)):
+        before = old_languages.get(language, {}).get('code', 0)
+        after = new_languages.get(language, {}).get('code', 0)
+        if before != after:
+            diff['lines'].setdefault('by_language', {})[language] = {
+                'previous': before, 'current': after, 'delta': after - before
+            }
+    
+    # 问题列表变化
+    old_issues = {_issue_key(issue): issue for issue in previous.get('issues', [])}
+    new_issues = {_issue_key(issue): issue for issue in current.get('issues', [])}
+    diff['issues']['added'] = [issue for key, issue in new_issues.items() if key not in old_issues]
+    diff['issues']['resolved'] = [issue for key, issue in old_issues.items() if key not in new_issues]
+    
+    return diff
+
+
+def print_diff(diff: Dict):
+    """打印两次检查之间的差异"""
+    print("\n" + "=" * 80)
+    print(f"与上次检查的差异（上次: {diff['previous_timestamp']}）")
+    print("=" * 80)
+    
+    status = diff['status']
+    if status['previous'] != status['current']:
+        print(f"\n状态: {status['previous']} → {status['current']}")
+    
+    if not diff['files']:
+        print("\n文件: 无变化")
+    for name, changes in diff['files'].items():
+        print(f"\n【{name}】")
+        for label, key in (('新增', 'added'), ('删除', 'removed'), ('修改', 'modified')):
+            if changes[key]:
+                print(f"  {label} {len(changes[key])} 个:")
+                for path in changes[key][:10]:
+                    print(f"    - {path}")
+                if len(changes[key]) > 10:
+                    print(f"    ... 还有 {len(changes[key]) - 10} 个文件")
+    
+    if diff['lines']:
+        print("\n代码行数变化:")
+        for key, change in diff['lines'].items():
+            if key == 'by_language':
+                for language, lang_change in change.items():
+                    print(f"  {language}: {lang_change['previous']} → {lang_change['current']} ({lang_change['delta']:+d})")
+            else:
+                print(f"  {key}: {change['previous']} → {change['current']} ({change['delta']:+d})")
+    
+    for label, key in (('新增问题', 'added'), ('已解决问题', 'resolved')):
+        if diff['issues'][key]:
+            print(f"\n{label}:")
+            for issue in diff['issues'][key]:
+                print(f"  - {issue.get('message') or issue.get('issue') or issue.get('recommendation')}")
+    print("=" * 80 + "\n")
+
+
 def print_report(report: Dict):
     """打印检查报告"""
     print("\n" + "=" * 80)
@@ -307,6 +1190,15 @@ def print_report(report: Dict):
             details = info['details']
             print(f"  代码总行数: {details['total_lines']} 行")
             print(f"  要求行数: {details['required_lines']} 行")
+            print(f"  代码/注释/空行: {details['code_lines']} / {details['comment_lines']} / {details['blank_lines']}")
+            for language, stats in sorted(details['by_language'].items()):
+                print(f"    - {language}: {stats['files']} 个文件, 代码 {stats['code']}, "
+                      f"注释 {stats['comment']}, 空行 {stats['blank']}")
+            if details.get('by_directory'):
+                print(f"  按顶层目录（行数前{BREAKDOWN_PRINT_LIMIT}）:")
+                top_dirs = sorted(details['by_directory'].items(), key=lambda item: -item[1]['lines'])
+                for name, stats in top_dirs[:BREAKDOWN_PRINT_LIMIT]:
+                    print(f"    - {name}: {stats['files']} 个文件, {stats['lines']} 行, {stats['bytes'] / 1024:.1f} KB")
             print(f"  状态: {'✓ 符合' if details['sufficient'] else '✗ 不符合'}")
             
             if details.get('issues'):
@@ -364,6 +1256,12 @@ def print_report(report: Dict):
         for i, rec in enumerate(report['recommendations'], 1):
             print(f"  {i}. {rec}")
     
+    # 打印各类别耗时
+    if report.get('timings'):
+        print("\n耗时:")
+        for name, seconds in report['timings'].items():
+            print(f"  {name}: {seconds:.3f} 秒")
+    
     # 打印总体状态
     print("\n" + "=" * 80)
     if report['status'] == 'ready':
@@ -384,12 +1282,24 @@ def main():
   
   # 检查指定目录并输出JSON报告
   python check_resources.py --code-dir ./src --doc-dir ./docs --screenshot-dir ./screenshots --output report.json
+  
+  # 与该项目上一次检查结果比较（读取并写入 ./.check_history 中的历史记录）
+  python check_resources.py --code-dir ./src --diff-against last
+  
+  # 把历史记录保存在指定目录，下次检查时复用内容未变化的类别结果
+  python check_resources.py --code-dir ./src --history-dir ~/.cache/check_history
         """
     )
     parser.add_argument('--code-dir', type=str, required=True, help='代码目录路径')
     parser.add_argument('--doc-dir', type=str, default='./docs', help='文档目录路径（默认./docs）')
     parser.add_argument('--screenshot-dir', type=str, default='./screenshots', help='截图目录路径（默认./screenshots）')
     parser.add_argument('--output', type=str, help='输出JSON报告文件路径（可选）')
+    parser.add_argument('--history-dir', type=str,
+                       help=f'检查报告历史记录目录（指定后读取并保存历史记录；只指定 --diff-against last 时为{DEFAULT_HISTORY_DIR}）')
+    parser.add_argument('--project', type=str, help='历史记录中的项目名（默认按代码目录生成）')
+    parser.add_argument('--no-history', action='store_true', help='不读取也不保存历史记录（覆盖 --history-dir）')
+    parser.add_argument('--diff-against', type=str,
+                       help='与历史报告比较：last 表示该项目最近一次记录，或指定报告JSON路径')
     
     args = parser.parse_args()
     
@@ -402,12 +1312,35 @@ def main():
     logger.info(f"文档目录: {doc_dir}")
     logger.info(f"截图目录: {screenshot_dir}")
     
+    # 只有指定 --history-dir 或 --diff-against last 时才读取和保存历史记录，默认不在当前目录写入文件
+    use_history = not args.no_history and bool(args.history_dir or args.diff_against == 'last')
+    history_dir = Path(args.history_dir or DEFAULT_HISTORY_DIR)
+    project_key = get_project_key(code_dir, args.project)
+    
+    # 读取上次报告（用于复用未变化类别的结果和差异比较）
+    previous = None
+    if args.diff_against and args.diff_against != 'last':
+        previous = load_previous_report(history_dir, project_key, args.diff_against)
+    elif use_history:
+        previous = load_previous_report(history_dir, project_key)
+    
     # 生成检查报告
-    report = generate_check_report(code_dir, doc_dir, screenshot_dir)
+    report = generate_check_report(code_dir, doc_dir, screenshot_dir, previous)
     
     # 打印报告
     print_report(report)
     
+    # 打印差异
+    if args.diff_against:
+        if previous:
+            report['diff'] = diff_reports(previous, report)
+            print_diff(report['diff'])
+        else:
+            logger.warning("没有可比较的历史报告，跳过差异比较")
+    
+    if use_history:
+        save_report_history(report, history_dir, project_key)
+    
     # 保存JSON报告
     if args.output:
         output_path = Path(args.output)
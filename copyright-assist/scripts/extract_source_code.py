@@ -90,6 +90,52 @@ def count_lines_in_code(files: List[Path]) -> int:
     return total_lines
 
 
+def collect_code_stats(files: List[Path], code_dir: Path) -> Dict:
+    """
+    统计代码总行数，并在同一次读取中按扩展名、按顶层目录汇总
+    
+    与 count_lines_in_code 一样以文本模式逐行读取计数，不把整个文件读入内存；
+    只保存分组计数，不保留逐文件列表。
+    
+    Returns:
+        {'total_lines', 'total_bytes',
+         'by_extension': {扩展名: {'files', 'bytes', 'lines'}},
+         'by_directory': {顶层目录: {'files', 'bytes', 'lines'}}}
+    """
+    stats = {'total_lines': 0, 'total_bytes': 0, 'by_extension': {}, 'by_directory': {}}
+    
+    for file_path in files:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                size = os.fstat(f.fileno()).st_size
+                lines = sum(1 for _ in f)
+        except Exception as e:
+            logger.warning(f"读取文件失败 {file_path}: {e}")
+            continue
+        
+        stats['total_lines'] += lines
+        stats['total_bytes'] += size
+        
+        parts = file_path.relative_to(code_dir).parts
+        top_dir = parts[0] if len(parts) > 1 else '.'
+        for breakdown, key in ((stats['by_extension'], file_path.suffix.lower()),
+                               (stats['by_directory'], top_dir)):
+            group = breakdown.setdefault(key, {'files': 0, 'bytes': 0, 'lines': 0})
+            group['files'] += 1
+            group['bytes'] += size
+            group['lines'] += lines
+    
+    return stats
+
+
+def log_code_stats(stats: Dict) -> None:
+    """将按扩展名、按顶层目录的统计写入提取日志"""
+    for title, key in (('按扩展名统计', 'by_extension'), ('按顶层目录统计', 'by_directory')):
+        logger.info(f"{title}:")
+        for name, item in sorted(stats[key].items(), key=lambda entry: -entry[1]['lines']):
+            logger.info(f"  {name}: {item['files']} 个文件, {item['lines']} 行, {item['bytes'] / 1024:.1f} KB")
+
+
 def extract_main_code(files: List[Path]) -> Optional[Path]:
     """查找主入口文件（main函数）"""
     main_files = []
@@ -477,9 +523,11 @@ def main():
     # 查找主入口文件
     main_file = extract_main_code(code_files)
     
-    # 统计总行数
-    total_lines = count_lines_in_code(code_files)
+    # 统计总行数（同时按扩展名、顶层目录汇总）
+    code_stats = collect_code_stats(code_files, code_dir)
+    total_lines = code_stats['total_lines']
     logger.info(f"代码总行数: {total_lines}")
+    log_code_stats(code_stats)
     
     # 判断提取策略
     strategy, required_lines = determine_extraction_strategy(total_lines)
@@ -7,12 +7,26 @@
 
 import os
 import argparse
+import codecs
+import csv
+import glob
+import hashlib
+import json
 import sys
 import logging
+import multiprocessing
+import shutil
+import struct
+import tempfile
+import time
 import zipfile
+import zlib
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime
-from typing import List, Optional
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from check_resources import PNG_CHANNELS, PNG_SIGNATURE, png_unfilter
 
 # 配置日志
 logging.basicConfig(
@@ -24,25 +38,291 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 已压缩格式：再次 deflate 几乎没有收益，直接以存储模式写入
+STORED_EXTENSIONS = {
+    '.pdf', '.docx', '.xlsx', '.pptx', '.odt', '.zip', '.gz', '.7z', '.rar',
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.mp4', '.mp3'
+}
+
+# 文本等其他格式的默认 deflate 压缩级别（0-9）
+DEFAULT_COMPRESS_LEVEL = 6
+
+# ZIP 格式（无 ZIP64）单个成员和整个归档的大小上限
+ZIP32_LIMIT = 0xFFFFFFFF
+
+# 可复现构建：成员固定时间戳（可用 SOURCE_DATE_EPOCH 环境变量覆盖）与固定权限
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+REPRODUCIBLE_FILE_MODE = 0o644
+
+# ZIP 注释中输入指纹的前缀，用于识别已有归档是否由相同输入生成
+FINGERPRINT_PREFIX = 'copyright-assist-fingerprint:'
+
+# 指纹格式版本：打包格式变化时递增，使旧归档失效
+FINGERPRINT_VERSION = 1
+
+# 批量打包默认并发数
+DEFAULT_BATCH_WORKERS = 4
+
+# 批量清单中每条记录的必填字段
+BATCH_REQUIRED_FIELDS = ('software_name', 'version', 'manual', 'code')
+
+# 读取输入文件时每次读取的字节数
+READ_CHUNK_SIZE = 1024 * 1024
+
+# 进程池使用 spawn 启动方式：批量打包时进程池在工作线程中启动工作进程，fork 可能复制其他线程持有的日志或导入锁导致子进程死锁
+PROCESS_POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+# 成员压缩结果不超过该大小时留在内存中，超过时写入临时文件
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# ZIP 结构开销：本地文件头 30 字节、中央目录项 46 字节（各含一次文件名）、目录结束记录 22 字节
+ZIP_LOCAL_HEADER_SIZE = 30
+ZIP_CENTRAL_HEADER_SIZE = 46
+ZIP_END_RECORD_SIZE = 22
+
+# 分卷文件名格式：软件名称_版本号_part01of03.zip
+VOLUME_SUFFIX_FORMAT = '_part{index:02d}of{total:02d}'
+
+# 估算分卷清单空间时额外预留的字节数
+VOLUME_RESERVE_SLACK = 256
+
+# 大小参数支持的单位
+SIZE_UNITS = {'': 1, 'B': 1, 'K': 1024, 'KB': 1024, 'M': 1024 ** 2, 'MB': 1024 ** 2, 'G': 1024 ** 3, 'GB': 1024 ** 3}
+
+# 截图目录收集的图片格式
+SCREENSHOT_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+
+# 设计文档目录收集的文件格式（含架构图、流程图等图片）
+DESIGN_DOC_EXTENSIONS = {'.pdf', '.doc', '.docx', '.md', '.txt', '.rtf', '.odt'} | SCREENSHOT_EXTENSIONS
+
+# PNG 无损优化：重新压缩 IDAT 使用的 zlib 级别
+PNG_OPTIMIZE_LEVEL = 9
+
+# 优化时保留的数据块（IHDR/IDAT/IEND 单独处理），其余辅助数据块全部去除
+PNG_KEPT_CHUNKS = {b'PLTE', b'tRNS'}
+# 字节按有符号数解释后的绝对值，用于滤波选择启发式
+PNG_ABS_TABLE = bytes(min(value, 256 - value) for value in range(256))
 
-def find_files_by_pattern(directory: Path, patterns: List[str]) -> List[Path]:
-    """查找匹配模式的文件"""
+# 输入文件扫描结果缓存：{绝对路径: 扫描结果（只含元数据，不含文件内容）}，按大小和修改时间判断是否失效
+_INPUT_CACHE: Dict[Path, Dict] = {}
+
+# 工作区索引缓存文件格式版本
+WORKSPACE_INDEX_VERSION = 2
+
+# 自动发现：候选文件的扩展名及文件名关键词权重
+DISCOVERY_RULES = {
+    'manual': {
+        'extensions': {'.pdf': 2, '.docx': 1, '.doc': 1, '.md': 0},
+        'keywords': {'说明书': 4, 'manual': 3, '手册': 3, '用户': 1, '设计': 1, 'guide': 1}
+    },
+    'code': {
+        'extensions': {'.txt': 1},
+        'keywords': {'源代码': 4, 'formatted_code': 4, 'code': 3, '源码': 3, 'source': 2}
+    }
+}
+
+# 自动发现时不作为候选的文件名关键词（本工具生成的清单等）
+DISCOVERY_EXCLUDE_KEYWORDS = ('资源清单', 'requirements', 'license', 'readme')
+
+# 列出候选文件时显示的数量
+DISCOVERY_TOP_N = 5
+
+# 工作区索引进程内缓存：{工作区绝对路径: 索引}
+_WORKSPACE_INDEX: Dict[Path, Dict] = {}
+
+
+def load_workspace_index(workspace: Path, cache_file: Optional[Path] = None) -> Dict:
+    """
+    读取并增量刷新工作区索引
+    
+    索引按目录记录文件名和子目录名及目录的修改时间。刷新时只 stat 各目录，
+    修改时间未变的目录直接复用缓存的列表，只有新增、删除或重命名过文件的目录才重新列出，
+    大型共享工作区无需每次完整遍历。索引在进程内缓存；指定缓存文件时还会读取和保存到该文件，
+    未指定时不在工作区中写入任何文件。
+    
+    目录的遍历顺序、文件的列出顺序以及对符号链接的处理与 os.walk 一致
+    （不跳过隐藏文件和目录，指向目录的符号链接不展开）。
+    
+    Args:
+        workspace: 工作区根目录
+        cache_file: 索引缓存文件（可选）
+    
+    Returns:
+        {'version', 'root', 'dirs': {相对路径: {'mtime_ns', 'files', 'subdirs'}}}，dirs 按 os.walk 的顺序排列
+    """
+    root = workspace.resolve()
+    index = _WORKSPACE_INDEX.get(root)
+    if index is None and cache_file and cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"无法读取工作区索引缓存，将重新建立: {e}")
+            index = None
+        if index and (index.get('version') != WORKSPACE_INDEX_VERSION or index.get('root') != str(root)):
+            index = None
+    if index is None:
+        index = {'version': WORKSPACE_INDEX_VERSION, 'root': str(root), 'dirs': {}}
+    
+    cached_dirs = index['dirs']
+    dirs = {}
+    listed = 0
+    pending = ['.']
+    while pending:
+        relative = pending.pop()
+        directory = root / relative
+        try:
+            mtime_ns = directory.stat().st_mtime_ns
+        except OSError:
+            continue
+        entry = cached_dirs.get(relative)
+        if entry is None or entry['mtime_ns'] != mtime_ns:
+            files, subdirs = [], []
+            try:
+                with os.scandir(directory) as iterator:
+                    for item in iterator:
+                        try:
+                            is_dir = item.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if not is_dir:
+                            files.append(item.name)
+                        elif not item.is_symlink():
+                            subdirs.append(item.name)
+            except OSError as e:
+                logger.warning(f"无法读取目录 {directory}: {e}")
+                continue
+            entry = {'mtime_ns': mtime_ns, 'files': files, 'subdirs': subdirs}
+            listed += 1
+        dirs[relative] = entry
+        # 子目录逆序入栈，出栈顺序即 os.walk 的自顶向下顺序
+        pending.extend(os.path.normpath(os.path.join(relative, name)) for name in reversed(entry['subdirs']))
+    
+    changed = listed > 0 or len(dirs) != len(cached_dirs)
+    index['dirs'] = dirs
+    _WORKSPACE_INDEX[root] = index
+    logger.info(f"工作区索引: {len(dirs)} 个目录，重新列出 {listed} 个")
+    
+    # 原地覆盖写入：改写已有文件不会改变所在目录的修改时间，避免下次刷新时重新列出该目录
+    # （读到写了一半的文件时按解析失败处理，重新建立索引）
+    if changed and cache_file:
+        try:
+            with open(cache_file, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False)
+        except OSError as e:
+            logger.warning(f"无法保存工作区索引缓存: {e}")
+    return index
+
+
+def find_files_by_pattern(directory: Path, patterns: List[str],
+                          cache_file: Optional[Path] = None) -> List[Path]:
+    """查找匹配模式的文件（通过工作区索引查询，不重新遍历目录）"""
     files = []
     
     if not directory.exists():
         logger.warning(f"目录不存在: {directory}")
         return files
     
-    for root, dirs, file_names in os.walk(directory):
-        for file_name in file_names:
-            file_path = Path(root) / file_name
+    index = load_workspace_index(directory, cache_file)
+    for relative, entry in index['dirs'].items():
+        for file_name in entry['files']:
             # 检查文件名是否匹配任一模式
             if any(pattern in file_name.lower() for pattern in patterns):
-                files.append(file_path)
+                files.append(directory / relative / file_name)
     
     return files
 
 
+def rank_candidates(files: List[Path], kind: str,
+                    software_name: Optional[str] = None,
+                    version: Optional[str] = None) -> List[Dict]:
+    """
+    为自动发现的候选文件打分排序
+    
+    评分依据：文件名关键词和扩展名、文件名或路径中的软件名称/版本号、
+    修改时间（越新越高）以及大小是否满足打包验证的最低要求。
+    
+    Args:
+        files: 候选文件
+        kind: 'manual' 或 'code'
+    
+    Returns:
+        按得分从高到低排列的 [{'path', 'score', 'size', 'mtime', 'reasons'}]
+    """
+    rules = DISCOVERY_RULES[kind]
+    candidates = []
+    for path in files:
+        name = path.name.lower()
+        suffix = path.suffix.lower()
+        if suffix not in rules['extensions'] or any(word in name for word in DISCOVERY_EXCLUDE_KEYWORDS):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        
+        score = float(rules['extensions'][suffix])
+        reasons = [suffix]
+        for keyword, weight in rules['keywords'].items():
+            if keyword in name:
+                score += weight
+                reasons.append(keyword)
+        if software_name and software_name.lower() in name:
+            score += 3
+            reasons.append('软件名称')
+        if version:
+            if version in name:
+                score += 2
+                reasons.append('版本号')
+            elif version in path.parent.as_posix():
+                score += 1
+                reasons.append('版本目录')
+        # 与 validate_package_structure 的阈值对应：说明书至少10KB，代码至少3000行（按每行至少10字节估算）
+        min_size = 10 * 1024 if kind == 'manual' else 3000 * 10
+        if stat.st_size < min_size:
+            score -= 5
+            reasons.append('文件过小')
+        candidates.append({
+            'path': path, 'score': score, 'size': stat.st_size,
+            'mtime': stat.st_mtime, 'reasons': reasons
+        })
+    
+    if candidates:
+        oldest = min(candidate['mtime'] for candidate in candidates)
+        newest = max(candidate['mtime'] for candidate in candidates)
+        for candidate in candidates:
+            if newest > oldest:
+                candidate['score'] += 2 * (candidate['mtime'] - oldest) / (newest - oldest)
+            candidate['score'] = round(candidate['score'], 2)
+    return sorted(candidates, key=lambda candidate: (-candidate['score'], -candidate['mtime'], str(candidate['path'])))
+
+
+def discover_inputs(workspace: Path, software_name: Optional[str] = None,
+                    version: Optional[str] = None,
+                    cache_file: Optional[Path] = None) -> Dict[str, List[Dict]]:
+    """
+    在工作区中自动发现说明书和源代码文件候选
+    
+    Returns:
+        {'manual': 排序后的候选列表, 'code': 排序后的候选列表}
+    """
+    extensions = {suffix for rules in DISCOVERY_RULES.values() for suffix in rules['extensions']}
+    files = find_files_by_pattern(workspace, sorted(extensions), cache_file)
+    return {kind: rank_candidates(files, kind, software_name, version) for kind in DISCOVERY_RULES}
+
+
+def log_candidates(kind_label: str, candidates: List[Dict], limit: int = DISCOVERY_TOP_N) -> None:
+    """输出得分最高的若干候选文件"""
+    if not candidates:
+        logger.info(f"{kind_label}: 未找到候选文件")
+        return
+    logger.info(f"{kind_label}候选（前 {min(limit, len(candidates))} 个，共 {len(candidates)} 个）:")
+    for rank, candidate in enumerate(candidates[:limit], 1):
+        modified = datetime.fromtimestamp(candidate['mtime']).strftime('%Y-%m-%d %H:%M')
+        logger.info(f"  {rank}. [{candidate['score']:.2f}] {candidate['path']} "
+                    f"({candidate['size'] / 1024:.1f} KB, {modified}; {', '.join(candidate['reasons'])})")
+
+
 def generate_zip_filename(software_name: str, version: str) -> str:
     """
     生成符合命名规范的ZIP文件名
@@ -56,6 +336,61 @@ def generate_zip_filename(software_name: str, version: str) -> str:
     return filename
 
 
+def scan_input_file(file_path: Path) -> Dict:
+    """
+    单次流式读取输入文件，同时得到大小、行数、SHA-256、CRC-32 以及是否为合法 UTF-8
+    
+    结果按绝对路径缓存（大小或修改时间变化时重新扫描），供验证、清单生成、指纹计算和
+    ZIP 写入共用，避免重复读取同一文件。缓存只保存元数据，不保存文件内容，
+    批量打包时不会把各申请的输入留在内存中；写 ZIP 时再按块读取文件。
+    
+    Returns:
+        {'size', 'lines', 'sha256', 'crc32', 'utf8', 'mtime_ns'}
+    """
+    resolved = file_path.resolve()
+    stat = resolved.stat()
+    cached = _INPUT_CACHE.get(resolved)
+    if cached and cached['size'] == stat.st_size and cached['mtime_ns'] == stat.st_mtime_ns:
+        return cached
+    
+    sha256 = hashlib.sha256()
+    crc = 0
+    size = 0
+    newlines = 0
+    last_byte = b''
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    utf8 = True
+    with open(resolved, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+            newlines += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+            if utf8:
+                try:
+                    decoder.decode(chunk)
+                except UnicodeDecodeError:
+                    utf8 = False
+    if utf8:
+        try:
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            utf8 = False
+    
+    info = {
+        'size': size,
+        # 最后一行没有换行符时也计为一行
+        'lines': newlines + (1 if last_byte and last_byte != b'\n' else 0),
+        'sha256': sha256.hexdigest(),
+        'crc32': crc,
+        'utf8': utf8,
+        'mtime_ns': stat.st_mtime_ns
+    }
+    _INPUT_CACHE[resolved] = info
+    return info
+
+
 def validate_package_structure(software_name: str, version: str, 
                             manual_file: Optional[Path], 
                             code_file: Optional[Path]) -> List[str]:
@@ -77,17 +412,20 @@ def validate_package_structure(software_name: str, version: str,
     
     # 检查文件大小
     if manual_file and manual_file.exists():
-        size_kb = manual_file.stat().st_size / 1024
-        if size_kb < 10:  # 小于10KB可能内容不足
-            errors.append(f"说明书文件过小 ({size_kb:.1f} KB)，可能内容不足")
-            logger.warning(f"说明书文件大小: {size_kb:.1f} KB")
+        try:
+            size_kb = scan_input_file(manual_file)['size'] / 1024
+            if size_kb < 10:  # 小于10KB可能内容不足
+                errors.append(f"说明书文件过小 ({size_kb:.1f} KB)，可能内容不足")
+                logger.warning(f"说明书文件大小: {size_kb:.1f} KB")
+        except Exception as e:
+            errors.append(f"无法读取说明书文件: {e}")
     
     if code_file and code_file.exists():
-        size_kb = code_file.stat().st_size / 1024
-        lines = 0
         try:
-            with open(code_file, 'r', encoding='utf-8') as f:
-                lines = sum(1 for _ in f)
+            info = scan_input_file(code_file)
+            if not info['utf8']:  # 源代码文件必须为UTF-8编码
+                raise ValueError("不是有效的UTF-8编码")
+            lines = info['lines']
             
             if lines < 3000:
                 errors.append(f"源代码行数不足 ({lines} 行)，建议至少3000行")
@@ -98,12 +436,587 @@ def validate_package_structure(software_name: str, version: str,
     return errors
 
 
+def choose_compression(arcname: str, compress_level: int) -> Tuple[int, int]:
+    """
+    按压缩策略为成员选择压缩方式
+    
+    Returns:
+        (zipfile.ZIP_STORED 或 zipfile.ZIP_DEFLATED, 压缩级别)
+    """
+    if Path(arcname).suffix.lower() in STORED_EXTENSIONS or compress_level == 0:
+        return zipfile.ZIP_STORED, 0
+    return zipfile.ZIP_DEFLATED, compress_level
+
+
+def compress_member(source: Dict, compress_level: int) -> Dict:
+    """
+    按压缩策略压缩单个成员（zlib 压缩期间释放 GIL，可在线程池中并行）
+    
+    文件成员按块读取：存储模式的成员不读取内容，写 ZIP 时直接从源文件拷贝；
+    deflate 的结果写入临时文件（不超过 SPOOL_MAX_SIZE 时留在内存中）。
+    
+    Args:
+        source: {'arcname', 'data'（内存中的内容）或 'path'（文件成员）, 'date_time', 'external_attr',
+                 'crc32'/'size'(可选，已知时不再重复计算)}
+        compress_level: deflate 压缩级别
+    
+    Returns:
+        成员信息字典：arcname、压缩数据（'payload' 字节串、'payload_file' 临时文件或
+        'payload_path' 源文件之一）、CRC、原始/压缩大小、压缩方式、耗时等
+    """
+    start = time.perf_counter()
+    arcname = source['arcname']
+    compress_type, level = choose_compression(arcname, compress_level)
+    member = {
+        'arcname': arcname,
+        'compress_type': compress_type,
+        'level': level,
+        'date_time': source['date_time'],
+        'external_attr': source['external_attr']
+    }
+    
+    data = source.get('data')
+    if data is not None:
+        crc = source['crc32'] if source.get('crc32') is not None else zlib.crc32(data)
+        payload = data
+        if compress_type == zipfile.ZIP_DEFLATED:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+            payload = compressor.compress(data) + compressor.flush()
+            # 压缩后反而变大时退回存储模式
+            if len(payload) >= len(data):
+                member.update(compress_type=zipfile.ZIP_STORED, level=0)
+                payload = data
+        member.update(payload=payload, crc=crc, file_size=len(data), compress_size=len(payload))
+    elif compress_type == zipfile.ZIP_STORED and source.get('crc32') is not None:
+        member.update(payload_path=source['path'], crc=source['crc32'],
+                      file_size=source['size'], compress_size=source['size'])
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if compress_type == zipfile.ZIP_DEFLATED else None
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+        crc = size = 0
+        with open(source['path'], 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b''):
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                if compressor:
+                    spool.write(compressor.compress(chunk))
+        if compressor:
+            spool.write(compressor.flush())
+        compress_size = spool.tell()
+        if not compressor or compress_size >= size:
+            # 存储模式，或压缩后反而变大：写 ZIP 时直接拷贝源文件
+            spool.close()
+            member.update(compress_type=zipfile.ZIP_STORED, level=0, payload_path=source['path'],
+                          compress_size=size)
+        else:
+            member.update(payload_file=spool, compress_size=compress_size)
+        member.update(crc=crc, file_size=size)
+    
+    member['seconds'] = time.perf_counter() - start
+    return member
+
+
+def _write_payload(f, member: Dict) -> None:
+    """写出成员的压缩数据：内存中的字节串、临时文件，或按块拷贝源文件（存储模式）"""
+    if 'payload' in member:
+        f.write(member['payload'])
+        return
+    if 'payload_file' in member:
+        member['payload_file'].seek(0)
+        shutil.copyfileobj(member['payload_file'], f, READ_CHUNK_SIZE)
+        return
+    written = 0
+    with open(member['payload_path'], 'rb') as source:
+        for chunk in iter(lambda: source.read(READ_CHUNK_SIZE), b''):
+            f.write(chunk)
+            written += len(chunk)
+    if written != member['compress_size']:
+        raise ValueError(f"文件在打包过程中被修改: {member['payload_path']}")
+
+
+def release_members(members: List[Dict]) -> None:
+    """关闭成员压缩结果的临时文件"""
+    for member in members:
+        if 'payload_file' in member:
+            member['payload_file'].close()
+
+
+def _dos_date_time(date_time: Tuple[int, ...]) -> Tuple[int, int]:
+    """将 (年, 月, 日, 时, 分, 秒) 转为 ZIP 使用的 DOS 日期和时间"""
+    year, month, day, hour, minute, second = date_time[:6]
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_date, dos_time
+
+
+def write_zip(zip_path: Path, members: List[Dict], comment: bytes = b'',
+              create_system: Optional[int] = None) -> None:
+    """
+    将已压缩好的成员依次写入 ZIP 文件（本地文件头 + 数据 + 中央目录）
+    
+    成员已在线程池中完成压缩，这里只做顺序拼装；结构与 zipfile 生成的一致，
+    可被任意 ZIP 工具读取。不支持 ZIP64（单个成员或整个归档超过 4GB）。
+    先写入临时文件再原子替换，中途失败不会留下不完整的归档。
+    
+    Args:
+        zip_path: 输出路径
+        members: compress_member 返回的成员列表（按写入顺序）
+        comment: ZIP 归档注释
+        create_system: 中央目录中的创建系统标识（默认按当前平台，可复现构建时固定为3）
+    """
+    if create_system is None:
+        create_system = 0 if os.name == 'nt' else 3
+    central_directory = []
+    tmp_path = zip_path.with_name(zip_path.name + '.tmp')
+    
+    with open(tmp_path, 'wb') as f:
+        for member in members:
+            offset = f.tell()
+            if member['compress_size'] > ZIP32_LIMIT or member['file_size'] > ZIP32_LIMIT or offset > ZIP32_LIMIT:
+                raise ValueError(f"成员过大，不支持超过4GB的ZIP: {member['arcname']}")
+            
+            try:
+                filename = member['arcname'].encode('ascii')
+                flag_bits = 0
+            except UnicodeEncodeError:
+                filename = member['arcname'].encode('utf-8')
+                flag_bits = 0x800  # 文件名使用 UTF-8 编码
+            dos_date, dos_time = _dos_date_time(member['date_time'])
+            
+            f.write(struct.pack(
+                zipfile.structFileHeader, zipfile.stringFileHeader,
+                20, 0, flag_bits, member['compress_type'], dos_time, dos_date,
+                member['crc'], member['compress_size'], member['file_size'],
+                len(filename), 0
+            ))
+            f.write(filename)
+            _write_payload(f, member)
+            
+            central_directory.append(struct.pack(
+                zipfile.structCentralDir, zipfile.stringCentralDir,
+                20, create_system, 20, 0, flag_bits, member['compress_type'], dos_time, dos_date,
+                member['crc'], member['compress_size'], member['file_size'],
+                len(filename), 0, 0, 0, 0, member['external_attr'], offset
+            ) + filename)
+        
+        directory_offset = f.tell()
+        directory = b''.join(central_directory)
+        if directory_offset + len(directory) > ZIP32_LIMIT:
+            raise ValueError("ZIP文件过大，不支持超过4GB的ZIP")
+        f.write(directory)
+        f.write(struct.pack(
+            zipfile.structEndArchive, zipfile.stringEndArchive,
+            0, 0, len(members), len(members), len(directory), directory_offset, len(comment)
+        ))
+        f.write(comment)
+    
+    # 替换正式文件前先回读校验，避免磁盘写满等情况留下损坏的归档
+    errors = verify_zip(tmp_path, members)
+    if errors:
+        tmp_path.unlink()
+        for error in errors:
+            logger.error(f"  {error}")
+        raise ValueError(f"ZIP写入校验失败: {zip_path}")
+    os.replace(tmp_path, zip_path)
+
+
+def verify_zip(zip_path: Path, members: Optional[List[Dict]] = None) -> List[str]:
+    """
+    流式回读归档的每个成员，校验 CRC 和大小（只在内存中分块解压，不写入磁盘）
+    
+    Args:
+        zip_path: ZIP 文件路径
+        members: 写入时的成员列表（可选），提供时同时核对成员名、CRC 和原始大小与写入时一致
+    
+    Returns:
+        校验错误列表（空列表表示校验通过）
+    """
+    errors = []
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            infos = zf.infolist()
+            for info in infos:
+                crc = 0
+                size = 0
+                try:
+                    with zf.open(info) as member_file:
+                        for chunk in iter(lambda: member_file.read(READ_CHUNK_SIZE), b''):
+                            crc = zlib.crc32(chunk, crc)
+                            size += len(chunk)
+                except (EOFError, zlib.error, zipfile.BadZipFile) as e:
+                    errors.append(f"成员读取失败: {info.filename}（{e}）")
+                    continue
+                if crc != info.CRC or size != info.file_size:
+                    errors.append(f"成员校验失败: {info.filename}（CRC {crc:08x}/{info.CRC:08x}，"
+                                  f"大小 {size}/{info.file_size}）")
+    except (OSError, EOFError, zlib.error, zipfile.BadZipFile) as e:
+        return errors + [f"无法读取归档 {zip_path}: {e}"]
+    
+    if members is not None:
+        written = {member['arcname']: (member['crc'], member['file_size']) for member in members}
+        found = {info.filename: (info.CRC, info.file_size) for info in infos}
+        for arcname in sorted(set(written) - set(found)):
+            errors.append(f"归档中缺少成员: {arcname}")
+        for arcname in sorted(set(found) - set(written)):
+            errors.append(f"归档中有多余成员: {arcname}")
+        for arcname in sorted(set(written) & set(found)):
+            if written[arcname] != found[arcname]:
+                errors.append(f"成员与写入时不一致: {arcname}")
+    return errors
+
+
+def _file_member_source(file_path: Path, arcname: str) -> Dict:
+    """构造文件成员：大小和 CRC 取自扫描缓存（内容在压缩和写 ZIP 时按块读取），修改时间和权限与 zipfile.write 的取值方式一致"""
+    zinfo = zipfile.ZipInfo.from_file(file_path, arcname)
+    info = scan_input_file(file_path)
+    return {
+        'arcname': arcname,
+        'path': file_path,
+        'size': info['size'],
+        'crc32': info['crc32'],
+        'date_time': zinfo.date_time,
+        'external_attr': zinfo.external_attr
+    }
+
+
+def build_members(sources: List[Dict],
+                  compress_level: int = DEFAULT_COMPRESS_LEVEL,
+                  max_workers: Optional[int] = None) -> List[Dict]:
+    """
+    在线程池中并行压缩所有成员，按输入顺序返回
+    
+    Args:
+        sources: 成员列表，见 compress_member
+        compress_level: 文本等可压缩格式的 deflate 级别
+        max_workers: 线程数（默认由线程池决定）
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(compress_member, source, compress_level) for source in sources]
+        return [future.result() for future in futures]
+
+
+def collect_directory_files(directory: Path, extensions: set) -> List[Path]:
+    """递归收集目录下指定扩展名的文件（跳过隐藏文件和目录），按相对路径排序"""
+    files = []
+    for root, dirs, file_names in os.walk(directory):
+        dirs[:] = [d for d in dirs if not d.startswith('.')]
+        for file_name in file_names:
+            if not file_name.startswith('.') and Path(file_name).suffix.lower() in extensions:
+                files.append(Path(root) / file_name)
+    return sorted(files, key=lambda path: path.relative_to(directory).as_posix())
+
+
+def _png_subtract(row: bytes, prev: bytes) -> bytes:
+    """逐字节计算 (row - prev) mod 256：每个16位通道先加256再相减，通道间不会借位"""
+    n = len(row)
+    wide_row = bytearray(b'\x01\x00' * n)
+    wide_row[1::2] = row
+    wide_prev = bytearray(2 * n)
+    wide_prev[1::2] = prev
+    total = int.from_bytes(wide_row, 'big') - int.from_bytes(wide_prev, 'big')
+    return total.to_bytes(2 * n, 'big')[1::2]
+
+
+def _png_refilter(filtered: bytes, width: int, height: int, bpp: int, row_bytes: int) -> bytes:
+    """
+    还原全部扫描线后逐行重新选择滤波（None/Sub/Up 中按"有符号字节绝对值之和最小"启发式选取）
+    
+    Sub/Up 可用大整数一次算完整行，代价与解码相当；Average/Paeth 需逐字节计算，不参与候选。
+    """
+    stride = row_bytes + 1
+    if len(filtered) != stride * height:
+        raise ValueError("IDAT 数据长度与图像尺寸不符")
+    
+    out = bytearray()
+    prev = bytes(row_bytes)
+    for y in range(height):
+        start = y * stride
+        raw = png_unfilter(filtered[start], filtered[start + 1:start + stride], prev, bpp)
+        candidates = (
+            (0, raw),
+            (1, _png_subtract(raw, bytes(bpp) + raw[:-bpp])),
+            (2, _png_subtract(raw, prev))
+        )
+        filter_type, row = min(candidates, key=lambda item: sum(item[1].translate(PNG_ABS_TABLE)))
+        out.append(filter_type)
+        out += row
+        prev = raw
+    return bytes(out)
+
+
+def _png_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """按 PNG 格式拼装数据块：长度 + 类型 + 数据 + CRC"""
+    return (len(data).to_bytes(4, 'big') + chunk_type + data
+            + zlib.crc32(data, zlib.crc32(chunk_type)).to_bytes(4, 'big'))
+
+
+def optimize_png(data: bytes, level: int = PNG_OPTIMIZE_LEVEL) -> bytes:
+    """
+    无损优化 PNG：去除辅助数据块、重新选择扫描线滤波并以更高的 zlib 级别重新压缩
+    
+    只保留 IHDR/PLTE/tRNS/IDAT/IEND（tRNS 决定透明度，属于像素语义的一部分），像素数据不变。
+    隔行扫描或位深小于8的图像不重新滤波，仅重新压缩原滤波数据。优化结果不小于原文件时返回原数据。
+    """
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError("不是有效的PNG文件")
+    
+    pos = len(PNG_SIGNATURE)
+    header = None
+    kept = []
+    idat = []
+    while pos + 8 <= len(data):
+        length = int.from_bytes(data[pos:pos + 4], 'big')
+        chunk_type = data[pos + 4:pos + 8]
+        chunk_data = data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if chunk_type == b'IHDR':
+            header = chunk_data
+        elif chunk_type == b'IDAT':
+            idat.append(chunk_data)
+        elif chunk_type in PNG_KEPT_CHUNKS:
+            kept.append((chunk_type, chunk_data))
+        elif chunk_type == b'IEND':
+            break
+        elif not chunk_type[0] & 0x20:
+            # 未知的关键数据块无法安全处理，保持原样
+            return data
+    if header is None or not idat:
+        raise ValueError("缺少IHDR或IDAT数据块")
+    
+    filtered = zlib.decompress(b''.join(idat))
+    width = int.from_bytes(header[0:4], 'big')
+    height = int.from_bytes(header[4:8], 'big')
+    bit_depth, color_type, interlace = header[8], header[9], header[12]
+    
+    candidates = [filtered]
+    if interlace == 0 and bit_depth >= 8 and color_type in PNG_CHANNELS:
+        bpp = PNG_CHANNELS[color_type] * bit_depth // 8
+        candidates.append(_png_refilter(filtered, width, height, bpp, width * bpp))
+    compressed = min((zlib.compress(candidate, level) for candidate in candidates), key=len)
+    
+    optimized = PNG_SIGNATURE + _png_chunk(b'IHDR', header)
+    for chunk_type, chunk_data in kept:
+        optimized += _png_chunk(chunk_type, chunk_data)
+    optimized += _png_chunk(b'IDAT', compressed) + _png_chunk(b'IEND', b'')
+    return optimized if len(optimized) < len(data) else data
+
+
+def _optimize_png_file(file_path: Path) -> Dict:
+    """进程池任务：读取并优化单个 PNG，失败时返回原始数据和错误信息"""
+    start = time.perf_counter()
+    data = file_path.read_bytes()
+    try:
+        optimized, error = optimize_png(data), None
+    except (ValueError, zlib.error) as e:
+        optimized, error = data, str(e)
+    return {
+        'data': optimized,
+        'original_size': len(data),
+        'optimized_size': len(optimized),
+        'seconds': time.perf_counter() - start,
+        'error': error
+    }
+
+
+def optimize_images(files: List[Path], max_workers: Optional[int] = None,
+                    executor: Optional[Executor] = None) -> Dict[Path, Dict]:
+    """
+    在进程池中并行无损优化 PNG 图片（滤波选择为纯 Python 计算，受 GIL 限制，需多进程）
+    
+    Args:
+        files: 候选文件（只处理 PNG）
+        max_workers: 新建进程池时的进程数
+        executor: 共用的进程池（批量打包时各条目共用一个，避免每个条目各开一个进程池争抢CPU）
+    
+    Returns:
+        {文件路径: {'data', 'original_size', 'optimized_size', 'seconds', 'error'}}
+    """
+    pngs = [path for path in files if path.suffix.lower() == '.png']
+    if not pngs:
+        return {}
+    
+    logger.info(f"  无损优化 {len(pngs)} 个PNG图片...")
+    if executor is not None:
+        results = dict(zip(pngs, executor.map(_optimize_png_file, pngs)))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=PROCESS_POOL_CONTEXT) as own_executor:
+            results = dict(zip(pngs, own_executor.map(_optimize_png_file, pngs)))
+    
+    saved_total = 0
+    for path, result in results.items():
+        saved = result['original_size'] - result['optimized_size']
+        saved_total += saved
+        if result['error']:
+            logger.warning(f"    {path.name}: 无法优化（{result['error']}），按原文件打包")
+        else:
+            logger.info(
+                f"    {path.name}: {result['original_size'] / 1024:.1f} KB -> "
+                f"{result['optimized_size'] / 1024:.1f} KB，节省 {saved / 1024:.1f} KB，"
+                f"用时 {result['seconds'] * 1000:.0f} ms"
+            )
+    original_total = sum(result['original_size'] for result in results.values())
+    ratio = saved_total / original_total * 100 if original_total else 0
+    logger.info(f"    图片优化合计节省 {saved_total / 1024:.1f} KB ({ratio:.1f}%)")
+    return results
+
+
+def parse_size(text: str) -> int:
+    """解析带单位的大小（如 20M、500KB、1G；按1024进制），返回字节数"""
+    value = text.strip().upper()
+    number = value.rstrip('BKMG')
+    unit = value[len(number):]
+    if not number or unit not in SIZE_UNITS:
+        raise ValueError(f"无法解析的大小: {text}")
+    size = int(float(number) * SIZE_UNITS[unit])
+    if size <= 0:
+        raise ValueError(f"大小必须大于0: {text}")
+    return size
+
+
+def member_footprint(member: Dict) -> int:
+    """成员在 ZIP 中占用的字节数：本地文件头、中央目录项（各含文件名）和压缩数据"""
+    name_length = len(member['arcname'].encode('utf-8'))
+    return ZIP_LOCAL_HEADER_SIZE + ZIP_CENTRAL_HEADER_SIZE + 2 * name_length + member['compress_size']
+
+
+def plan_volumes(members: List[Dict], max_volume_size: int, reserve: int) -> List[List[Dict]]:
+    """
+    按成员顺序把成员分配到各分卷，每卷（含预留的分卷清单空间）不超过上限
+    
+    Args:
+        members: 已压缩的成员列表（不含资源清单）
+        max_volume_size: 单个分卷的字节上限
+        reserve: 每卷预留给分卷清单和目录结束记录的字节数
+    
+    Returns:
+        分卷列表，每项为该卷的成员列表
+    
+    Raises:
+        ValueError: 单个成员已超过分卷上限
+    """
+    capacity = max_volume_size - reserve
+    volumes = [[]]
+    used = 0
+    for member in members:
+        footprint = member_footprint(member)
+        if footprint > capacity:
+            raise ValueError(f"文件 {member['arcname']} 压缩后 {footprint / 1024:.1f} KB，"
+                             f"超过分卷可用空间 {capacity / 1024:.1f} KB，无法分卷")
+        if volumes[-1] and used + footprint > capacity:
+            volumes.append([])
+            used = 0
+        volumes[-1].append(member)
+        used += footprint
+    return volumes
+
+
+def create_volume_section(index: int, volume_names: List[str], volumes: List[List[Dict]]) -> str:
+    """生成分卷清单的分卷说明：当前卷号、全部分卷文件名及每卷包含的成员"""
+    section = []
+    section.append("")
+    section.append("=" * 80)
+    section.append(f"分卷信息: 第 {index} 卷 / 共 {len(volume_names)} 卷")
+    section.append("=" * 80)
+    for number, (name, volume) in enumerate(zip(volume_names, volumes), 1):
+        marker = "（本卷）" if number == index else ""
+        section.append(f"\n第 {number} 卷: {name}{marker}")
+        for member in volume:
+            section.append(f"   {member['arcname']} ({member['file_size'] / 1024:.1f} KB)")
+    section.append("")
+    section.append("提交时请上传全部分卷，各分卷可独立解压，内含相同的完整资源清单。")
+    section.append("")
+    return '\n'.join(section)
+
+
+def _volumes_complete(paths: List[Path]) -> bool:
+    """分卷文件是否齐全：数量与文件名中的总卷数一致"""
+    totals = {path.stem.rsplit('of', 1)[-1] for path in paths}
+    return len(totals) == 1 and int(totals.pop()) == len(paths)
+
+
+def find_existing_outputs(output_dir: Path, zip_filename: str) -> List[Path]:
+    """查找已有的打包结果：单个归档或同名的全部分卷"""
+    stem = Path(zip_filename).stem
+    outputs = sorted(output_dir.glob(f"{glob.escape(stem)}_part[0-9][0-9]of[0-9][0-9].zip"))
+    single = output_dir / zip_filename
+    if single.exists():
+        outputs.insert(0, single)
+    return outputs
+
+
+def reproducible_date_time() -> Tuple[int, ...]:
+    """可复现构建使用的固定时间戳：优先 SOURCE_DATE_EPOCH，否则为 1980-01-01"""
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch and epoch.isdigit():
+        return max(datetime.fromtimestamp(int(epoch), timezone.utc).timetuple()[:6], REPRODUCIBLE_DATE_TIME)
+    return REPRODUCIBLE_DATE_TIME
+
+
+def compute_input_fingerprint(software_name: str, version: str, inputs: List[Tuple[str, Path]],
+                              compress_level: int, optimize_pngs: bool = False,
+                              max_volume_size: Optional[int] = None) -> str:
+    """
+    计算全部输入的指纹：软件名称、版本号、压缩级别、分卷上限以及每个成员名与内容的 SHA-256
+    
+    任一输入内容、成员命名或打包参数（包括增加、修改或去掉分卷上限）变化都会得到不同的指纹。
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{FINGERPRINT_VERSION}\0{software_name}\0{version}\0{compress_level}\0"
+                  f"{max_volume_size or 0}\0".encode('utf-8'))
+    if optimize_pngs and any(Path(arcname).suffix.lower() == '.png' for arcname, _ in inputs):
+        digest.update(f"png-optimize-{PNG_OPTIMIZE_LEVEL}\0".encode('ascii'))
+    digest.update(repr(reproducible_date_time()).encode('ascii'))
+    for arcname, file_path in sorted(inputs):
+        digest.update(f"{arcname}\0{scan_input_file(file_path)['sha256']}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def read_archive_fingerprint(zip_path: Path) -> Optional[str]:
+    """读取已有归档注释中的输入指纹（只读取中央目录，不解压成员）"""
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            comment = zf.comment.decode('utf-8', errors='ignore')
+    except (OSError, zipfile.BadZipFile):
+        return None
+    if comment.startswith(FINGERPRINT_PREFIX):
+        return comment[len(FINGERPRINT_PREFIX):]
+    return None
+
+
+def log_compression_report(members: List[Dict], wall_seconds: float) -> None:
+    """逐成员输出压缩方式、节省的大小和耗时，以及并行压缩节省的时间"""
+    logger.info("  压缩统计:")
+    for member in members:
+        method = f"deflate-{member['level']}" if member['compress_type'] == zipfile.ZIP_DEFLATED else 'store'
+        saved = member['file_size'] - member['compress_size']
+        ratio = saved / member['file_size'] * 100 if member['file_size'] else 0
+        logger.info(
+            f"    {member['arcname']}: [{method}] {member['file_size'] / 1024:.1f} KB -> "
+            f"{member['compress_size'] / 1024:.1f} KB，节省 {saved / 1024:.1f} KB ({ratio:.0f}%)，"
+            f"用时 {member['seconds'] * 1000:.1f} ms"
+        )
+    serial_seconds = sum(member['seconds'] for member in members)
+    logger.info(
+        f"    合计压缩用时 {serial_seconds * 1000:.1f} ms，并行实际用时 {wall_seconds * 1000:.1f} ms，"
+        f"节省 {max(serial_seconds - wall_seconds, 0) * 1000:.1f} ms"
+    )
+
+
 def package_submission(software_name: str, 
                      version: str,
                      manual_file: Path,
                      code_file: Path,
                      output_dir: Path,
-                     rename_files: bool = True) -> Path:
+                     rename_files: bool = True,
+                     compress_level: int = DEFAULT_COMPRESS_LEVEL,
+                     max_workers: Optional[int] = None,
+                     reproducible: bool = False,
+                     force: bool = False,
+                     screenshot_dir: Optional[Path] = None,
+                     design_doc_dir: Optional[Path] = None,
+                     optimize_pngs: bool = True,
+                     max_volume_size: Optional[int] = None,
+                     image_executor: Optional[Executor] = None) -> List[Path]:
     """
     打包软著申请材料
     
@@ -114,9 +1027,20 @@ def package_submission(software_name: str,
         code_file: 源代码文件路径
         output_dir: 输出目录
         rename_files: 是否重命名文件为标准格式
+        compress_level: 文本等可压缩格式的 deflate 级别（已压缩格式始终使用存储模式）
+        max_workers: 并行压缩的线程数
+        reproducible: 可复现构建（固定时间戳、成员排序、固定权限），并在输入指纹
+            与已有归档一致时跳过打包
+        force: 可复现构建时即使指纹一致也重新打包
+        screenshot_dir: 截图目录（可选），图片放入ZIP内的"截图"目录
+        design_doc_dir: 设计文档目录（可选），文件放入ZIP内的"设计文档"目录
+        optimize_pngs: 打包前在进程池中无损优化PNG图片
+        max_volume_size: 单个ZIP的字节上限（可选），超过时拆分为编号分卷，
+            每卷可独立解压并附带完整资源清单和分卷说明
+        image_executor: 优化PNG使用的进程池（可选，批量打包时共用；默认每次新建）
     
     Returns:
-        生成的ZIP文件路径
+        生成的ZIP文件路径列表（未分卷时只有一个）；每个文件写入后都已回读校验
     """
     # 验证包结构
     logger.info("验证包结构...")
@@ -127,6 +1051,20 @@ def package_submission(software_name: str,
             logger.error(f"  {error}")
         raise ValueError("包结构验证失败")
     
+    # 收集可选的截图和设计文档目录：[(ZIP内路径, 文件路径)]
+    extra_files = []
+    for directory, extensions, label in ((screenshot_dir, SCREENSHOT_EXTENSIONS, '截图'),
+                                         (design_doc_dir, DESIGN_DOC_EXTENSIONS, '设计文档')):
+        if not directory:
+            continue
+        if not directory.is_dir():
+            raise ValueError(f"{label}目录不存在: {directory}")
+        folder = f"{software_name}_{version}_{label}" if rename_files else directory.name
+        files = collect_directory_files(directory, extensions)
+        if not files:
+            logger.warning(f"{label}目录中没有可打包的文件: {directory}")
+        extra_files.extend((f"{folder}/{path.relative_to(directory).as_posix()}", path) for path in files)
+    
     # 创建输出目录
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -136,45 +1074,170 @@ def package_submission(software_name: str,
     
     logger.info(f"正在打包: {zip_path}")
     
-    # 创建ZIP文件
-    with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        # 确定ZIP内的文件名
-        if rename_files:
-            manual_zip_name = f"{software_name}_{version}_说明书{manual_file.suffix}"
-            code_zip_name = f"{software_name}_{version}_源代码{code_file.suffix}"
+    # 确定ZIP内的文件名
+    if rename_files:
+        manual_zip_name = f"{software_name}_{version}_说明书{manual_file.suffix}"
+        code_zip_name = f"{software_name}_{version}_源代码{code_file.suffix}"
+    else:
+        manual_zip_name = manual_file.name
+        code_zip_name = code_file.name
+    
+    fingerprint = None
+    if reproducible:
+        fingerprint = compute_input_fingerprint(
+            software_name, version,
+            [(manual_zip_name, manual_file), (code_zip_name, code_file)] + extra_files,
+            compress_level,
+            optimize_pngs=optimize_pngs,
+            max_volume_size=max_volume_size
+        )
+        logger.info(f"  输入指纹: {fingerprint}")
+        existing = find_existing_outputs(output_dir, zip_filename)
+        if (not force and existing
+                and all(read_archive_fingerprint(path) == fingerprint for path in existing)
+                and (existing == [zip_path] or zip_path not in existing and _volumes_complete(existing))):
+            logger.info("输入未变化，已存在相同指纹的归档，跳过打包")
+            return existing
+    
+    sources = []
+    
+    # 添加说明书文件
+    logger.info(f"  添加: {manual_file.name} -> {manual_zip_name}")
+    sources.append(_file_member_source(manual_file, manual_zip_name))
+    
+    # 添加源代码文件
+    logger.info(f"  添加: {code_file.name} -> {code_zip_name}")
+    sources.append(_file_member_source(code_file, code_zip_name))
+    
+    # 添加截图和设计文档，PNG 先在进程池中无损优化
+    optimized = optimize_images([path for _, path in extra_files], executor=image_executor) if optimize_pngs else {}
+    manifest_extras = []
+    for arcname, path in extra_files:
+        source = _file_member_source(path, arcname)
+        result = optimized.get(path)
+        if result and result['optimized_size'] < result['original_size']:
+            source['data'] = result['data']
+            source['crc32'] = None
+            size, sha256 = len(result['data']), hashlib.sha256(result['data']).hexdigest()
         else:
-            manual_zip_name = manual_file.name
-            code_zip_name = code_file.name
+            info = scan_input_file(path)
+            size, sha256 = info['size'], info['sha256']
+        manifest_extras.append({'arcname': arcname, 'path': path, 'size': size, 'sha256': sha256})
+        sources.append(source)
+    if extra_files:
+        logger.info(f"  添加: 截图/设计文档 {len(extra_files)} 个文件")
+    
+    # 资源清单（分卷时每卷附加分卷说明）
+    if reproducible:
+        build_time = datetime(*reproducible_date_time()).strftime('%Y-%m-%d %H:%M:%S')
+        manifest = create_manifest(software_name, version, manual_file, code_file,
+                                   build_time=build_time, fingerprint=fingerprint,
+                                   extra_files=manifest_extras)
+    else:
+        manifest = create_manifest(software_name, version, manual_file, code_file,
+                                   extra_files=manifest_extras)
+    manifest_name = f"{software_name}_{version}_资源清单.txt"
+    
+    def manifest_member(text: str) -> Dict:
+        source = {
+            'arcname': manifest_name,
+            'data': text.encode('utf-8'),
+            'date_time': datetime.now().timetuple()[:6],
+            'external_attr': 0o600 << 16
+        }
+        if reproducible:
+            source['date_time'] = reproducible_date_time()
+            source['external_attr'] = (0o100000 | REPRODUCIBLE_FILE_MODE) << 16
+        return compress_member(source, compress_level)
+    
+    # 可复现构建：成员按名称排序，统一时间戳和权限
+    if reproducible:
+        fixed_date_time = reproducible_date_time()
+        for source in sources:
+            source['date_time'] = fixed_date_time
+            source['external_attr'] = (0o100000 | REPRODUCIBLE_FILE_MODE) << 16
+        sources.sort(key=lambda source: source['arcname'])
+    
+    # 并行压缩各成员后顺序拼装ZIP
+    start = time.perf_counter()
+    members = build_members(sources, compress_level, max_workers)
+    try:
+        wall_seconds = time.perf_counter() - start
+        comment = f"{FINGERPRINT_PREFIX}{fingerprint}".encode('ascii') if reproducible else b''
+        create_system = 3 if reproducible else None
         
-        # 添加说明书文件
-        logger.info(f"  添加: {manual_file.name} -> {manual_zip_name}")
-        zipf.write(manual_file, manual_zip_name)
+        def with_manifest(volume_members: List[Dict], manifest_text: str) -> List[Dict]:
+            result = volume_members + [manifest_member(manifest_text)]
+            if reproducible:
+                result.sort(key=lambda member: member['arcname'])
+            return result
         
-        # 添加源代码文件
-        logger.info(f"  添加: {code_file.name} -> {code_zip_name}")
-        zipf.write(code_file, code_zip_name)
+        single_members = with_manifest(members, manifest)
+        single_size = (sum(member_footprint(member) for member in single_members)
+                       + ZIP_END_RECORD_SIZE + len(comment))
         
-        # 可选：添加资源清单
-        manifest = create_manifest(software_name, version, manual_file, code_file)
-        zipf.writestr(f"{software_name}_{version}_资源清单.txt", manifest)
-        logger.info(f"  添加: 资源清单.txt")
+        if max_volume_size and single_size > max_volume_size:
+            # 按每个成员单独成卷（分卷说明最长）估算每卷清单占用的空间，另留少量余量应对压缩率波动
+            placeholder_name = zip_path.stem + VOLUME_SUFFIX_FORMAT.format(index=99, total=99) + '.zip'
+            placeholder = manifest + create_volume_section(
+                99, [placeholder_name] * len(members), [[member] for member in members]
+            )
+            reserve = (member_footprint(manifest_member(placeholder)) + ZIP_END_RECORD_SIZE
+                       + len(comment) + VOLUME_RESERVE_SLACK)
+            volumes = plan_volumes(members, max_volume_size, reserve)
+            if len(volumes) > 99:
+                raise ValueError(f"分卷数 {len(volumes)} 超过99，请增大 --max-volume-size")
+            volume_names = [zip_path.stem + VOLUME_SUFFIX_FORMAT.format(index=index, total=len(volumes)) + '.zip'
+                            for index in range(1, len(volumes) + 1)]
+            outputs = []
+            for index, (name, volume) in enumerate(zip(volume_names, volumes), 1):
+                volume_path = output_dir / name
+                volume_manifest = manifest + create_volume_section(index, volume_names, volumes)
+                write_zip(volume_path, with_manifest(volume, volume_manifest),
+                          comment=comment, create_system=create_system)
+                outputs.append(volume_path)
+        else:
+            write_zip(zip_path, single_members, comment=comment, create_system=create_system)
+            outputs = [zip_path]
+        log_compression_report(members, wall_seconds)
+    finally:
+        release_members(members)
+    
+    # 清理上次打包留下的、本次未生成的归档或分卷
+    for stale in find_existing_outputs(output_dir, zip_filename):
+        if stale not in outputs:
+            logger.info(f"  删除过期的打包结果: {stale.name}")
+            stale.unlink()
     
     # 显示ZIP文件信息
-    zip_size_kb = zip_path.stat().st_size / 1024
-    logger.info(f"打包完成!")
-    logger.info(f"  文件: {zip_path}")
-    logger.info(f"  大小: {zip_size_kb:.1f} KB")
+    logger.info(f"打包完成!（已回读校验全部成员的CRC和大小）")
+    for output in outputs:
+        logger.info(f"  文件: {output}")
+        logger.info(f"  大小: {output.stat().st_size / 1024:.1f} KB")
     logger.info(f"  包含文件:")
-    logger.info(f"    1. {software_name}_{version}_说明书{manual_file.suffix}")
-    logger.info(f"    2. {software_name}_{version}_源代码{code_file.suffix}")
-    logger.info(f"    3. {software_name}_{version}_资源清单.txt")
+    logger.info(f"    1. {manual_zip_name}")
+    logger.info(f"    2. {code_zip_name}")
+    logger.info(f"    3. {manifest_name}" + ("（每个分卷各一份）" if len(outputs) > 1 else ""))
+    if extra_files:
+        logger.info(f"    4. 截图/设计文档 {len(extra_files)} 个文件")
     
-    return zip_path
+    return outputs
 
 
 def create_manifest(software_name: str, version: str,
-                   manual_file: Path, code_file: Path) -> str:
-    """创建资源清单"""
+                   manual_file: Path, code_file: Path,
+                   build_time: Optional[str] = None,
+                   fingerprint: Optional[str] = None,
+                   extra_files: Optional[List[Dict]] = None) -> str:
+    """
+    创建资源清单
+    
+    Args:
+        build_time: 打包时间（默认当前时间；可复现构建时传入固定时间）
+        fingerprint: 输入指纹（可复现构建时写入清单）
+        extra_files: 截图/设计文档列表 [{'arcname', 'path', 'size', 'sha256'}]，
+            大小和校验值为ZIP内（PNG优化后）的文件
+    """
     manifest = []
     manifest.append("=" * 80)
     manifest.append("软件著作权申请材料清单")
@@ -182,33 +1245,40 @@ def create_manifest(software_name: str, version: str,
     manifest.append("")
     manifest.append(f"软件名称: {software_name}")
     manifest.append(f"版本号: {version}")
-    manifest.append(f"打包时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    manifest.append(f"打包时间: {build_time or datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if fingerprint:
+        manifest.append(f"输入指纹: {fingerprint}")
     manifest.append("")
     manifest.append("-" * 80)
     manifest.append("包含文件:")
     manifest.append("-" * 80)
     
-    # 添加说明书信息
-    manual_size_kb = manual_file.stat().st_size / 1024
+    # 添加说明书信息（大小和校验值取自扫描缓存，不再重复读取文件）
+    manual_info = scan_input_file(manual_file)
     manifest.append(f"\n1. 说明书文件")
     manifest.append(f"   文件名: {software_name}_{version}_说明书{manual_file.suffix}")
     manifest.append(f"   原始路径: {manual_file}")
-    manifest.append(f"   文件大小: {manual_size_kb:.1f} KB")
+    manifest.append(f"   文件大小: {manual_info['size'] / 1024:.1f} KB")
+    manifest.append(f"   SHA-256: {manual_info['sha256']}")
     
     # 添加源代码信息
-    code_size_kb = code_file.stat().st_size / 1024
-    code_lines = 0
-    try:
-        with open(code_file, 'r', encoding='utf-8') as f:
-            code_lines = sum(1 for _ in f)
-    except Exception:
-        pass
+    code_info = scan_input_file(code_file)
     
     manifest.append(f"\n2. 源代码文件")
     manifest.append(f"   文件名: {software_name}_{version}_源代码{code_file.suffix}")
     manifest.append(f"   原始路径: {code_file}")
-    manifest.append(f"   文件大小: {code_size_kb:.1f} KB")
-    manifest.append(f"   代码行数: {code_lines} 行")
+    manifest.append(f"   文件大小: {code_info['size'] / 1024:.1f} KB")
+    manifest.append(f"   代码行数: {code_info['lines']} 行")
+    manifest.append(f"   SHA-256: {code_info['sha256']}")
+    
+    if extra_files:
+        total_kb = sum(item['size'] for item in extra_files) / 1024
+        manifest.append(f"\n3. 截图及设计文档（共 {len(extra_files)} 个文件，{total_kb:.1f} KB）")
+        for item in extra_files:
+            manifest.append(f"   {item['arcname']}")
+            manifest.append(f"     原始路径: {item['path']}")
+            manifest.append(f"     文件大小: {item['size'] / 1024:.1f} KB")
+            manifest.append(f"     SHA-256: {item['sha256']}")
     
     manifest.append("")
     manifest.append("=" * 80)
@@ -218,11 +1288,182 @@ def create_manifest(software_name: str, version: str,
     manifest.append("2. 确保说明书页数符合要求（通常60页以上）")
     manifest.append("3. 确保源代码格式符合软著申请要求")
     manifest.append("4. 如有任何问题，请参考相关文档或联系技术支持")
+    manifest.append("5. 可使用 sha256sum（Windows: certutil -hashfile <文件> SHA256）核对上述 SHA-256 校验值")
     manifest.append("")
     
     return '\n'.join(manifest)
 
 
+def load_batch_file(batch_file: Path) -> List[Dict]:
+    """
+    读取批量打包清单（CSV 或 YAML）
+    
+    CSV 需包含表头 software_name,version,manual,code，可选 output、screenshots、design_docs 列；
+    YAML 为同样字段的列表，或 {submissions: [...]}。相对路径相对于清单所在目录。
+    """
+    suffix = batch_file.suffix.lower()
+    if suffix == '.csv':
+        with open(batch_file, 'r', encoding='utf-8-sig', newline='') as f:
+            entries = [dict(row) for row in csv.DictReader(f)]
+    elif suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("读取YAML清单需要安装 PyYAML（pip install pyyaml），或改用CSV格式")
+        with open(batch_file, 'r', encoding='utf-8') as f:
+            loaded = yaml.safe_load(f) or []
+        entries = loaded.get('submissions', []) if isinstance(loaded, dict) else loaded
+    else:
+        raise ValueError(f"不支持的批量清单格式: {batch_file.suffix}（支持 .csv/.yaml/.yml）")
+    
+    base_dir = batch_file.parent
+    for entry in entries:
+        for key in ('manual', 'code', 'output', 'screenshots', 'design_docs'):
+            if entry.get(key):
+                path = Path(str(entry[key]).strip())
+                entry[key] = path if path.is_absolute() else base_dir / path
+        for key in ('software_name', 'version'):
+            if entry.get(key) is not None:
+                entry[key] = str(entry[key]).strip()
+    return entries
+
+
+def validate_batch(entries: List[Dict], default_output: Path) -> Tuple[List[Dict], List[Dict]]:
+    """
+    打包前统一验证全部条目（必填字段、文件存在、包结构、输出路径冲突）
+    
+    Returns:
+        (可打包的条目列表, 验证失败的结果列表)
+    """
+    valid = []
+    failures = []
+    targets: Dict[Path, int] = {}
+    
+    for index, entry in enumerate(entries, 1):
+        label = f"#{index} {entry.get('software_name') or '?'} {entry.get('version') or '?'}"
+        missing = [field for field in BATCH_REQUIRED_FIELDS if not entry.get(field)]
+        if missing:
+            errors = [f"缺少字段: {', '.join(missing)}"]
+        else:
+            entry['output'] = Path(entry.get('output') or default_output)
+            errors = validate_package_structure(
+                entry['software_name'], entry['version'], Path(entry['manual']), Path(entry['code'])
+            )
+            target = (entry['output'] / generate_zip_filename(entry['software_name'], entry['version'])).resolve()
+            if target in targets:
+                errors.append(f"输出文件与第 {targets[target]} 条重复: {target}")
+            else:
+                targets[target] = index
+        
+        if errors:
+            logger.error(f"批量清单 {label} 验证失败:")
+            for error in errors:
+                logger.error(f"  {error}")
+            failures.append({
+                'index': index,
+                'software_name': entry.get('software_name'),
+                'version': entry.get('version'),
+                'status': 'invalid',
+                'error': '; '.join(error.strip() for error in errors)
+            })
+        else:
+            entry['index'] = index
+            valid.append(entry)
+    
+    return valid, failures
+
+
+def _package_batch_entry(entry: Dict, options: Dict) -> Dict:
+    """打包批量清单中的一条记录，失败时返回错误信息而不抛出异常"""
+    result = {
+        'index': entry['index'],
+        'software_name': entry['software_name'],
+        'version': entry['version']
+    }
+    start = time.perf_counter()
+    try:
+        zip_paths = package_submission(
+            software_name=entry['software_name'],
+            version=entry['version'],
+            manual_file=Path(entry['manual']),
+            code_file=Path(entry['code']),
+            output_dir=entry['output'],
+            screenshot_dir=entry.get('screenshots'),
+            design_doc_dir=entry.get('design_docs'),
+            **options
+        )
+        result.update(status='success', zip_path=str(zip_paths[0]),
+                      size=sum(path.stat().st_size for path in zip_paths))
+        if len(zip_paths) > 1:
+            result['volumes'] = [str(path) for path in zip_paths]
+    except Exception as e:
+        logger.error(f"打包失败 #{entry['index']} {entry['software_name']} {entry['version']}: {e}")
+        result.update(status='failed', error=str(e))
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def package_batch(entries: List[Dict], default_output: Path,
+                  batch_workers: int = DEFAULT_BATCH_WORKERS, **options) -> List[Dict]:
+    """
+    批量打包：先统一验证全部条目，再并发打包验证通过的条目
+    
+    单个条目失败不影响其他条目。各条目的PNG优化共用一个进程池（进程数默认为CPU核数），
+    不随并发条目数成倍增加。
+    
+    Args:
+        entries: load_batch_file 返回的条目列表
+        default_output: 条目未指定 output 时的输出目录
+        batch_workers: 并发打包的条目数
+        **options: 传给 package_submission 的其他参数（rename_files、compress_level 等）
+    
+    Returns:
+        按清单顺序排列的结果列表，每项含 status（success/failed/invalid）、zip_path、size、error，
+        分卷时另含 volumes（zip_path 为第一卷，size 为全部分卷合计）
+    """
+    logger.info(f"批量清单共 {len(entries)} 条，开始统一验证...")
+    valid, results = validate_batch(entries, default_output)
+    logger.info(f"验证通过 {len(valid)} 条，验证失败 {len(results)} 条")
+    
+    image_executor = None
+    if options.get('optimize_pngs', True) and any(entry.get('screenshots') or entry.get('design_docs')
+                                                  for entry in valid):
+        image_executor = ProcessPoolExecutor(mp_context=PROCESS_POOL_CONTEXT)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, batch_workers)) as executor:
+            futures = [executor.submit(_package_batch_entry, entry, {**options, 'image_executor': image_executor})
+                       for entry in valid]
+            results.extend(future.result() for future in futures)
+    finally:
+        if image_executor is not None:
+            image_executor.shutdown()
+    
+    return sorted(results, key=lambda result: result['index'])
+
+
+def print_batch_summary(results: List[Dict]) -> None:
+    """输出批量打包汇总：成功、失败数量及各条目的大小或错误原因"""
+    succeeded = [result for result in results if result['status'] == 'success']
+    failed = [result for result in results if result['status'] != 'success']
+    total_size = sum(result['size'] for result in succeeded)
+    
+    logger.info("")
+    logger.info("=" * 80)
+    logger.info("批量打包汇总")
+    logger.info("=" * 80)
+    logger.info(f"总数: {len(results)}，成功: {len(succeeded)}，失败: {len(failed)}，"
+                f"总大小: {total_size / 1024:.1f} KB")
+    for result in results:
+        label = f"#{result['index']} {result['software_name']} {result['version']}"
+        if result['status'] == 'success':
+            volumes = f"，共 {len(result['volumes'])} 卷" if result.get('volumes') else ''
+            logger.info(f"  ✓ {label}: {result['zip_path']} ({result['size'] / 1024:.1f} KB{volumes}, "
+                        f"{result['seconds']:.2f}s)")
+        else:
+            status = '验证失败' if result['status'] == 'invalid' else '打包失败'
+            logger.info(f"  ✗ {label}: {status} - {result['error']}")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='软著申请材料打包工具',
@@ -242,26 +1483,132 @@ def main():
   python package_submission.py --software-name "用户管理系统" --version 1.0.0 \\
       --manual ./用户说明书.pdf --code ./formatted_code.txt \\
       --no-rename
+  
+  # 自动发现说明书和源代码（按文件名、版本号、修改时间和大小打分，选最高分）
+  python package_submission.py --software-name "用户管理系统" --version 1.0.0 --auto --workspace ./project
+  
+  # 只列出候选文件
+  python package_submission.py --list-candidates --workspace ./project
+  
+  # 批量打包（CSV/YAML清单，统一验证后并发打包，失败条目不影响其他条目）
+  python package_submission.py --batch ./submissions.csv --output ./output --summary-json ./summary.json
+  
+  # 同时打包截图和设计文档（PNG自动无损压缩）
+  python package_submission.py --software-name "用户管理系统" --version 1.0.0 \\
+      --manual ./用户说明书.pdf --code ./formatted_code.txt \\
+      --screenshots ./screenshots --design-docs ./docs/design
+  
+  # 上传平台限制单文件大小时按20MB拆分为分卷（用户管理系统_1.0.0_part01of03.zip 等）
+  python package_submission.py --software-name "用户管理系统" --version 1.0.0 \\
+      --manual ./用户说明书.pdf --code ./formatted_code.txt \\
+      --screenshots ./screenshots --max-volume-size 20M
+  
+  # 可复现构建（相同输入生成完全相同的ZIP，输入未变化时跳过打包）
+  python package_submission.py --software-name "用户管理系统" --version 1.0.0 \\
+      --manual ./用户说明书.pdf --code ./formatted_code.txt \\
+      --reproducible
         """
     )
-    parser.add_argument('--software-name', type=str, required=True, 
+    parser.add_argument('--software-name', type=str, 
                        help='软件名称（如: 用户管理系统）')
-    parser.add_argument('--version', type=str, required=True, 
+    parser.add_argument('--version', type=str, 
                        help='软件版本号（如: 1.0.0）')
-    parser.add_argument('--manual', type=str, required=True, 
+    parser.add_argument('--manual', type=str, 
                        help='说明书文件路径（支持PDF、Word、Markdown等格式）')
-    parser.add_argument('--code', type=str, required=True, 
+    parser.add_argument('--code', type=str, 
                        help='源代码文件路径（通常是extract_source_code.py生成的TXT文件）')
+    parser.add_argument('--screenshots', type=str,
+                       help='截图目录（可选，打包其中的图片）')
+    parser.add_argument('--design-docs', type=str,
+                       help='设计文档目录（可选，打包其中的文档和图片）')
+    parser.add_argument('--no-optimize-images', action='store_true',
+                       help='不对PNG图片做无损优化（默认打包前去除辅助数据块并重新压缩）')
+    parser.add_argument('--auto', action='store_true',
+                       help='未指定 --manual/--code 时在工作区中自动发现并选择得分最高的文件')
+    parser.add_argument('--list-candidates', action='store_true',
+                       help='只列出工作区中说明书和源代码的候选文件，不打包')
+    parser.add_argument('--workspace', type=str, default='.',
+                       help='自动发现使用的工作区目录（默认当前目录）')
+    parser.add_argument('--index-cache', type=str,
+                       help='工作区索引缓存文件（可选，指定后增量刷新并保存索引；建议放在工作区之外）')
+    parser.add_argument('--batch', type=str,
+                       help='批量打包清单（CSV/YAML，字段: software_name,version,manual,code[,output,screenshots,design_docs]）')
+    parser.add_argument('--batch-workers', type=int, default=DEFAULT_BATCH_WORKERS,
+                       help=f'批量打包时并发处理的条目数（默认{DEFAULT_BATCH_WORKERS}）')
+    parser.add_argument('--summary-json', type=str,
+                       help='批量打包汇总输出为JSON文件（可选）')
     parser.add_argument('--output', type=str, default='./output', 
                        help='输出目录（默认./output）')
     parser.add_argument('--no-rename', action='store_true',
                        help='不重命名文件，使用原始文件名')
+    parser.add_argument('--compress-level', type=int, default=DEFAULT_COMPRESS_LEVEL,
+                       choices=range(0, 10), metavar='{0-9}',
+                       help=f'文本等可压缩文件的deflate级别（默认{DEFAULT_COMPRESS_LEVEL}；PDF/DOCX/图片等始终存储不压缩）')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='并行压缩的线程数（默认自动）')
+    parser.add_argument('--reproducible', action='store_true',
+                       help='可复现构建：固定时间戳、成员排序、固定权限；输入未变化时跳过打包')
+    parser.add_argument('--max-volume-size', type=parse_size, default=None,
+                       help='单个ZIP的大小上限（如 20M、500K），超过时拆分为编号分卷，每卷附带资源清单')
+    parser.add_argument('--force', action='store_true',
+                       help='与 --reproducible 一起使用，即使输入未变化也重新打包')
     
     args = parser.parse_args()
     
     logger.info("=" * 80)
     logger.info("软著申请材料打包工具")
     logger.info("=" * 80)
+    
+    if args.batch:
+        try:
+            entries = load_batch_file(Path(args.batch))
+        except Exception as e:
+            logger.error(f"读取批量清单失败: {e}")
+            sys.exit(1)
+        
+        results = package_batch(
+            entries, Path(args.output),
+            batch_workers=args.batch_workers,
+            rename_files=not args.no_rename,
+            compress_level=args.compress_level,
+            max_workers=args.workers,
+            reproducible=args.reproducible,
+            force=args.force,
+            optimize_pngs=not args.no_optimize_images,
+            max_volume_size=args.max_volume_size
+        )
+        print_batch_summary(results)
+        
+        if args.summary_json:
+            summary_path = Path(args.summary_json)
+            summary_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(summary_path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, ensure_ascii=False)
+            logger.info(f"汇总已保存到: {summary_path}")
+        
+        sys.exit(0 if all(result['status'] == 'success' for result in results) else 1)
+    
+    if args.list_candidates or args.auto:
+        candidates = discover_inputs(Path(args.workspace), args.software_name, args.version,
+                                     Path(args.index_cache) if args.index_cache else None)
+        if args.list_candidates:
+            log_candidates('说明书', candidates['manual'])
+            log_candidates('源代码', candidates['code'])
+            sys.exit(0)
+        for name, label in (('manual', '说明书'), ('code', '源代码')):
+            if getattr(args, name):
+                continue
+            if not candidates[name]:
+                logger.error(f"工作区 {args.workspace} 中未找到{label}文件，请通过 --{name} 指定")
+                sys.exit(1)
+            log_candidates(label, candidates[name], limit=3)
+            setattr(args, name, str(candidates[name][0]['path']))
+            logger.info(f"自动选择{label}: {getattr(args, name)}")
+    
+    missing = [name for name in ('software_name', 'version', 'manual', 'code') if not getattr(args, name)]
+    if missing:
+        parser.error("未使用 --batch 时必须提供: " + ', '.join('--' + name.replace('_', '-') for name in missing))
+    
     logger.info(f"软件名称: {args.software_name}")
     logger.info(f"版本号: {args.version}")
     
@@ -281,20 +1628,29 @@ def main():
     
     # 打包
     try:
-        zip_path = package_submission(
+        zip_paths = package_submission(
             software_name=args.software_name,
             version=args.version,
             manual_file=manual_file,
             code_file=code_file,
             output_dir=output_dir,
-            rename_files=not args.no_rename
+            rename_files=not args.no_rename,
+            compress_level=args.compress_level,
+            max_workers=args.workers,
+            reproducible=args.reproducible,
+            force=args.force,
+            screenshot_dir=Path(args.screenshots) if args.screenshots else None,
+            design_doc_dir=Path(args.design_docs) if args.design_docs else None,
+            optimize_pngs=not args.no_optimize_images,
+            max_volume_size=args.max_volume_size
         )
         
         logger.info("")
         logger.info("=" * 80)
         logger.info("✓ 打包成功!")
         logger.info("=" * 80)
-        logger.info(f"输出文件: {zip_path}")
+        for zip_path in zip_paths:
+            logger.info(f"输出文件: {zip_path}")
         logger.info("可以直接用于软著申请上传")
         
     except Exception as e:
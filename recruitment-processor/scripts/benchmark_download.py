@@ -0,0 +1,514 @@
+#!/usr/bin/env python3
+"""
+图片下载基准测试与验证工具
+在本机启动一个模拟图片服务器（独立进程），可配置延迟、错误、重定向、限流、错误的 Content-Type
+和传输中断，不访问外网即可：
+- check：逐一验证 download_image 的各个分支（成功、跳过、SSL、超时、非图片内容、重试、续传等）
+- bench：测量单个下载与批量下载模式的吞吐量、尾延迟和内存峰值，用于离线对比性能改动
+- serve：单独运行模拟服务器，便于手动调试
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import random
+import hashlib
+import argparse
+import tempfile
+import threading
+import tracemalloc
+import multiprocessing
+from collections import Counter
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode, urlparse, parse_qs
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from download_image import DownloadCache, ImageSkipped, download_image, download_batch
+
+
+# 模拟服务器默认每秒允许的请求数（limited=1 的请求超过时返回 429）
+DEFAULT_SERVER_RPS = 50
+
+# 模拟服务器发送响应体的分块大小
+SERVE_CHUNK_SIZE = 16 * 1024
+
+# 基准测试默认参数：图片数量、单张大小、服务端延迟
+DEFAULT_BENCH_COUNT = 200
+DEFAULT_BENCH_SIZE_KB = 256
+DEFAULT_BENCH_LATENCY_MS = 20
+
+
+@lru_cache(maxsize=256)
+def make_image_payload(kind: str, width: int, height: int, size: int) -> bytes:
+    """
+    生成指定类型、尺寸和字节数的图片内容：文件头真实可解析（探测阶段可读出尺寸），其余为确定性的随机填充
+
+    小于文件头长度的 size 按文件头长度生成。
+    """
+    if kind == 'png':
+        ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+        header = (b'\x89PNG\r\n\x1a\n' + struct.pack('>I', len(ihdr)) + b'IHDR' + ihdr
+                  + struct.pack('>I', 0))
+    elif kind == 'gif':
+        header = b'GIF89a' + struct.pack('<HH', width, height) + b'\x80\x00\x00' + b'\x00' * 6
+    elif kind == 'webp':
+        bits = (width - 1) | ((height - 1) << 14)
+        header = (b'RIFF' + struct.pack('<I', max(size, 30) - 8) + b'WEBPVP8L'
+                  + struct.pack('<I', max(size, 30) - 20) + b'\x2f' + bits.to_bytes(4, 'little'))
+    else:
+        sof = b'\xff\xc0' + struct.pack('>HBHHB', 11, 8, height, width, 1) + b'\x01\x11\x00'
+        header = b'\xff\xd8' + b'\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00' + sof
+    filler = random.Random(f"{kind}:{width}x{height}:{size}").randbytes(max(0, size - len(header)))
+    return header + filler
+
+
+class TokenBucketGate:
+    """模拟服务器端的限流：每秒补充 rate 个令牌，没有令牌时请求被拒绝（返回 429）"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    模拟图片服务器的请求处理：/image/<文件名>?<参数>
+
+    参数：
+        type / width / height / bytes: 图片类型（默认取扩展名）、像素尺寸和字节数
+        latency: 返回响应头前的延迟（秒）；bandwidth: 每个连接的发送速率（KB/s）
+        status: 直接返回该状态码；fail: 该URL的前 N 次请求返回 503（或 fail_status 指定的状态码）
+        retry_after: 与 fail/status 一起返回的 Retry-After 秒数
+        redirect: 先经过 N 次 302 重定向；content_type: 覆盖 Content-Type
+        drop: 第一次请求只发送一半内容后断开连接；limited: 受服务器整体限流约束
+        misalign: 范围请求返回的 206 从请求位置之前 N 字节开始（模拟不遵守 Range 起始位置的服务器）
+    支持 ETag/If-None-Match（304）和 Range/If-Range（206）。
+    """
+
+    protocol_version = 'HTTP/1.1'
+    server_version = 'StandIn/1.0'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_text(self, status: int, text: str, headers: Optional[Dict[str, str]] = None):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/plain; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def do_GET(self, head: bool = False):
+        parsed = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        if not parsed.path.startswith('/image/'):
+            self._send_text(404, 'not found')
+            return
+
+        with self.server.lock:
+            self.server.counts[self.path] += 1
+            count = self.server.counts[self.path]
+
+        time.sleep(float(params.get('latency', 0)))
+
+        retry_headers = {'Retry-After': params['retry_after']} if 'retry_after' in params else None
+        if params.get('limited') and not self.server.gate.allow():
+            self._send_text(429, 'too many requests', {'Retry-After': params.get('retry_after', '1')})
+            return
+        if 'status' in params:
+            self._send_text(int(params['status']), 'error', retry_headers)
+            return
+        if count <= int(params.get('fail', 0)):
+            self._send_text(int(params.get('fail_status', 503)), 'temporarily unavailable', retry_headers)
+            return
+        hops = int(params.get('redirect', 0))
+        if hops > 0:
+            params['redirect'] = str(hops - 1)
+            self.send_response(302)
+            self.send_header('Location', f"{parsed.path}?{urlencode(params)}")
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        name = parsed.path.rsplit('/', 1)[-1]
+        kind = params.get('type') or os.path.splitext(name)[1].lstrip('.').replace('jpg', 'jpeg') or 'jpeg'
+        body = make_image_payload(kind, int(params.get('width', 800)), int(params.get('height', 600)),
+                                  int(params.get('bytes', 100 * 1024)))
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        content_type = params.get('content_type', f"image/{kind}")
+
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        start, end = 0, len(body) - 1
+        range_header = self.headers.get('Range', '')
+        if_range = self.headers.get('If-Range')
+        if range_header.startswith('bytes=') and (if_range is None or if_range == etag):
+            first, _, last = range_header[6:].partition('-')
+            if first.isdigit() and int(first) < len(body):
+                start = max(0, int(first) - int(params.get('misalign', 0)))
+                end = min(int(last), end) if last.isdigit() else end
+            else:
+                self._send_text(416, 'range not satisfiable', {'Content-Range': f"bytes */{len(body)}"})
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f"bytes {start}-{end}/{len(body)}")
+        else:
+            self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('ETag', etag)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        if head:
+            return
+
+        payload = memoryview(body)[start:end + 1]
+        if params.get('drop') and count == int(params.get('fail', 0)) + 1 and start == 0:
+            payload = payload[:len(payload) // 2]
+            self.close_connection = True
+        bandwidth = float(params.get('bandwidth', 0)) * 1024
+        try:
+            for offset in range(0, len(payload), SERVE_CHUNK_SIZE):
+                chunk = payload[offset:offset + SERVE_CHUNK_SIZE]
+                self.wfile.write(chunk)
+                if bandwidth:
+                    time.sleep(len(chunk) / bandwidth)
+            if self.close_connection:
+                self.wfile.flush()
+                self.connection.shutdown(socket.SHUT_RDWR)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    """模拟服务器：记录每个URL的请求次数（用于 fail/drop），客户端断开连接不输出异常"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, port: int = 0, rps: float = DEFAULT_SERVER_RPS):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.gate = TokenBucketGate(rps)
+
+    def handle_error(self, request, client_address):
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def _serve_in_process(port_queue, rps: float) -> None:
+    server = StandInHTTPServer(0, rps)
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StandInServer:
+    """在独立进程中运行模拟服务器（避免与下载线程争用 GIL 影响测量），用作 with 语句的上下文"""
+
+    def __init__(self, rps: float = DEFAULT_SERVER_RPS):
+        self.rps = rps
+        self.process = None
+        self.port = None
+
+    def __enter__(self):
+        port_queue = multiprocessing.Queue()
+        self.process = multiprocessing.Process(target=_serve_in_process, args=(port_queue, self.rps), daemon=True)
+        self.process.start()
+        self.port = port_queue.get(timeout=10)
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
+
+    def url(self, name: str, scheme: str = 'http', **params) -> str:
+        """构造模拟图片地址，params 为 StandInHandler 支持的参数"""
+        query = f"?{urlencode(params)}" if params else ''
+        return f"{scheme}://127.0.0.1:{self.port}/image/{name}{query}"
+
+
+def unused_port() -> int:
+    """返回一个当前没有监听的本机端口（用于模拟连接失败）"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _check_revalidation(server: StandInServer, output_dir: str) -> str:
+    """缓存过期后第二次下载应以 304 重新验证命中，不重新传输"""
+    cache = DownloadCache(os.path.join(output_dir, 'cache'), ttl=0)
+    url = server.url('revalidate.jpg', bytes=50 * 1024)
+    download_image(url, output_dir, cache=cache, quiet=True)
+    download_image(url, output_dir, cache=cache, quiet=True)
+    if cache.stats['revalidated'] != 1:
+        raise AssertionError(f"重新验证命中 {cache.stats['revalidated']} 次，应为 1 次")
+    return 'success'
+
+
+def build_scenarios(server: StandInServer) -> List[Dict]:
+    """
+    download_image 各分支的验证场景
+
+    每项含 name、url、options（传给 download_image）、expect（success/skipped/error）
+    和 message（错误或跳过原因应包含的文字）；run 为自定义验证函数时忽略 url。
+    """
+    return [
+        {'name': '正常下载', 'url': server.url('ok.jpg', bytes=200 * 1024), 'expect': 'success',
+         'size': 200 * 1024},
+        {'name': '多次重定向', 'url': server.url('redirect.png', redirect=3), 'expect': 'success'},
+        {'name': '非图片内容', 'url': server.url('page.jpg', content_type='text/html'), 'expect': 'error',
+         'message': '不是图片'},
+        {'name': '404', 'url': server.url('missing.jpg', status=404), 'expect': 'error', 'message': '404'},
+        {'name': '超时', 'url': server.url('slow.jpg', latency=2), 'options': {'timeout': 0.5, 'retries': 0},
+         'expect': 'error', 'message': '超时'},
+        {'name': 'SSL错误', 'url': server.url('tls.jpg', scheme='https'), 'expect': 'error', 'message': 'SSL'},
+        {'name': '连接失败', 'url': f"http://127.0.0.1:{unused_port()}/image/closed.jpg",
+         'options': {'retries': 0}, 'expect': 'error', 'message': '网络连接失败'},
+        {'name': '5xx后重试成功', 'url': server.url('flaky.jpg', fail=2), 'options': {'retries': 3},
+         'expect': 'success'},
+        {'name': '重试次数用尽', 'url': server.url('down.jpg', status=500), 'options': {'retries': 1},
+         'expect': 'error', 'message': '已重试 1 次'},
+        {'name': '429遵循Retry-After', 'url': server.url('throttled.jpg', fail=1, fail_status=429, retry_after=1),
+         'options': {'retries': 1}, 'expect': 'success'},
+        {'name': 'Retry-After过长放弃', 'url': server.url('busy.jpg', status=503, retry_after=3600),
+         'options': {'retries': 3}, 'expect': 'error', 'message': 'Retry-After'},
+        {'name': '超过大小上限', 'url': server.url('huge.jpg', bytes=300 * 1024),
+         'options': {'max_bytes': 100 * 1024}, 'expect': 'error', 'message': '超过上限'},
+        {'name': '中断后续传', 'url': server.url('drop.jpg', bytes=400 * 1024, drop=1), 'options': {'retries': 1},
+         'expect': 'success', 'size': 400 * 1024},
+        {'name': '续传范围不一致时从头下载',
+         'url': server.url('misaligned.jpg', bytes=400 * 1024, drop=1, misalign=1024),
+         'options': {'retries': 1}, 'expect': 'success', 'size': 400 * 1024},
+        {'name': '跳过追踪像素', 'url': server.url('pixel.gif', width=1, height=1, bytes=43),
+         'options': {'min_bytes': 2048}, 'expect': 'skipped', 'message': '字节'},
+        {'name': '跳过小图标', 'url': server.url('icon.png', width=32, height=32, bytes=6 * 1024),
+         'options': {'min_dimension': 48}, 'expect': 'skipped', 'message': '像素'},
+        {'name': '探测后续传', 'url': server.url('probed.png', width=1200, height=900, bytes=300 * 1024),
+         'options': {'min_bytes': 2048, 'min_dimension': 48}, 'expect': 'success', 'size': 300 * 1024},
+        {'name': '缓存304重新验证', 'run': _check_revalidation, 'expect': 'success'},
+    ]
+
+
+def run_checks(server: StandInServer) -> List[Dict]:
+    """逐一运行验证场景，返回每个场景的 name、passed、detail"""
+    results = []
+    with tempfile.TemporaryDirectory() as output_dir:
+        for scenario in build_scenarios(server):
+            options = {'retries': 0, **scenario.get('options', {})}
+            start = time.perf_counter()
+            try:
+                if 'run' in scenario:
+                    outcome, detail = scenario['run'](server, output_dir), ''
+                else:
+                    path = download_image(scenario['url'], output_dir, quiet=True, **options)
+                    outcome, detail = 'success', path
+                    if 'size' in scenario and os.path.getsize(path) != scenario['size']:
+                        outcome, detail = 'error', f"文件大小 {os.path.getsize(path)}，应为 {scenario['size']}"
+            except ImageSkipped as e:
+                outcome, detail = 'skipped', str(e)
+            except Exception as e:
+                outcome, detail = 'error', str(e)
+            passed = outcome == scenario['expect'] and scenario.get('message', '') in detail
+            results.append({'name': scenario['name'], 'passed': passed, 'outcome': outcome,
+                            'detail': detail, 'seconds': round(time.perf_counter() - start, 3)})
+    return results
+
+
+def percentile(values: List[float], q: float) -> float:
+    """最近秩百分位数（q 取 0-100）"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def measure(mode: str, run: Callable[[], List[Dict]]) -> Dict:
+    """运行一种下载模式并统计吞吐量、延迟分布和内存峰值（tracemalloc 统计的 Python 分配）"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = run()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies = [result['seconds'] for result in results]
+    succeeded = [result for result in results if result['status'] == 'success']
+    total_bytes = sum(result['bytes'] for result in succeeded)
+    return {
+        'mode': mode,
+        'count': len(results),
+        'success': len(succeeded),
+        'errors': len(results) - len(succeeded),
+        'seconds': round(elapsed, 3),
+        'images_per_second': round(len(succeeded) / elapsed, 1) if elapsed else 0,
+        'mb_per_second': round(total_bytes / 1024 / 1024 / elapsed, 2) if elapsed else 0,
+        'latency_ms': {name: round(percentile(latencies, q) * 1000, 1)
+                       for name, q in (('p50', 50), ('p95', 95), ('p99', 99), ('max', 100))},
+        'peak_memory_mb': round(peak / 1024 / 1024, 2)
+    }
+
+
+def run_benchmark(server: StandInServer, args: argparse.Namespace) -> List[Dict]:
+    """按参数生成图片地址，分别以单个下载（逐个调用、不复用连接）和批量下载模式测量"""
+    params = {'bytes': int(args.size_kb * 1024), 'latency': args.latency_ms / 1000}
+    if args.bandwidth_kb:
+        params['bandwidth'] = args.bandwidth_kb
+    failing = set(random.Random(0).sample(range(args.count), int(args.count * args.error_rate)))
+    options = {'retries': args.retries, 'min_bytes': 2048 if args.probe else 0,
+               'min_dimension': 48 if args.probe else 0}
+
+    def make_urls(mode: str) -> List[str]:
+        # 每种模式使用不同的URL，fail 参数按URL计数，互不影响
+        return [server.url(f"bench_{index:05d}.jpg", run=mode, **params, **({'fail': 1} if index in failing else {}))
+                for index in range(args.count)]
+
+    def single(urls: List[str], output_dir: str) -> List[Dict]:
+        results = []
+        for url in urls:
+            start = time.perf_counter()
+            try:
+                path = download_image(url, output_dir, quiet=True, **options)
+                result = {'status': 'success', 'bytes': os.path.getsize(path)}
+            except Exception as e:
+                result = {'status': 'error', 'error': str(e)}
+            result['seconds'] = time.perf_counter() - start
+            results.append(result)
+        return results
+
+    def batch(urls: List[str], output_dir: str) -> List[Dict]:
+        return download_batch(urls, output_dir, workers=args.workers, per_host=args.per_host, **options)
+
+    reports = []
+    for mode in (mode.strip() for mode in args.modes.split(',')):
+        runner = {'single': single, 'batch': batch}.get(mode)
+        if runner is None:
+            raise ValueError(f"未知的下载模式: {mode}（可选 single、batch）")
+        urls = make_urls(mode)
+        with tempfile.TemporaryDirectory() as output_dir:
+            report = measure(mode, lambda: runner(urls, output_dir))
+        reports.append(report)
+        print(format_report(report), file=sys.stderr)
+    return reports
+
+
+def format_report(report: Dict) -> str:
+    latency = report['latency_ms']
+    return (f"{report['mode']:<6} 成功 {report['success']}/{report['count']}，用时 {report['seconds']:.2f} 秒，"
+            f"{report['images_per_second']} 张/秒，{report['mb_per_second']} MB/秒，"
+            f"延迟 p50 {latency['p50']}ms / p95 {latency['p95']}ms / p99 {latency['p99']}ms / "
+            f"max {latency['max']}ms，内存峰值 {report['peak_memory_mb']} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='图片下载基准测试与验证工具（本机模拟服务器，不访问外网）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 验证 download_image 的各个分支（SSL、超时、非图片内容、重试、续传、探测跳过等）
+  python benchmark_download.py check
+
+  # 200 张 256KB 图片、服务端延迟 20ms，对比单个下载与批量下载
+  python benchmark_download.py bench --count 200 --size-kb 256 --latency-ms 20 --workers 16 --per-host 8
+
+  # 10% 的请求先返回 503，结果保存为 JSON 便于对比
+  python benchmark_download.py bench --error-rate 0.1 --retries 2 --json-output ./bench.json
+
+  # 单独运行模拟服务器
+  python benchmark_download.py serve --port 8765
+        """
+    )
+    subparsers = parser.add_subparsers(dest="action", help="操作类型")
+
+    check_parser = subparsers.add_parser("check", help="验证下载各分支的行为")
+    check_parser.add_argument('--json-output', help='验证结果输出文件（JSON）')
+
+    bench_parser = subparsers.add_parser("bench", help="测量吞吐量、尾延迟和内存峰值")
+    bench_parser.add_argument('--count', type=int, default=DEFAULT_BENCH_COUNT,
+                              help=f'图片数量（默认：{DEFAULT_BENCH_COUNT}）')
+    bench_parser.add_argument('--size-kb', type=float, default=DEFAULT_BENCH_SIZE_KB,
+                              help=f'单张图片大小（KB，默认：{DEFAULT_BENCH_SIZE_KB}）')
+    bench_parser.add_argument('--latency-ms', type=float, default=DEFAULT_BENCH_LATENCY_MS,
+                              help=f'服务端返回响应头前的延迟（毫秒，默认：{DEFAULT_BENCH_LATENCY_MS}）')
+    bench_parser.add_argument('--bandwidth-kb', type=float, default=0,
+                              help='每个连接的发送速率（KB/秒），0 表示不限（默认：0）')
+    bench_parser.add_argument('--error-rate', type=float, default=0,
+                              help='第一次请求返回 503 的图片比例（默认：0）')
+    bench_parser.add_argument('--retries', type=int, default=0, help='下载重试次数（默认：0）')
+    bench_parser.add_argument('--workers', type=int, default=16, help='批量下载并发数（默认：16）')
+    bench_parser.add_argument('--per-host', type=int, default=8, help='每个主机的最大并发连接数（默认：8）')
+    bench_parser.add_argument('--probe', action='store_true', help='启用下载前探测（计入探测请求的开销）')
+    bench_parser.add_argument('--modes', default='single,batch', help='测量的模式，逗号分隔（默认：single,batch）')
+    bench_parser.add_argument('--json-output', help='测量结果输出文件（JSON）')
+
+    serve_parser = subparsers.add_parser("serve", help="单独运行模拟服务器")
+    serve_parser.add_argument('--port', type=int, default=8765, help='监听端口（默认：8765）')
+    serve_parser.add_argument('--rps', type=float, default=DEFAULT_SERVER_RPS,
+                              help=f'limited=1 的请求每秒上限（默认：{DEFAULT_SERVER_RPS}）')
+
+    args = parser.parse_args()
+
+    if args.action == "serve":
+        server = StandInHTTPServer(args.port, args.rps)
+        print(f"模拟服务器已启动: http://127.0.0.1:{args.port}/image/sample.jpg?bytes=102400&latency=0.05")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.action == "check":
+        with StandInServer() as server:
+            results = run_checks(server)
+        for result in results:
+            flag = 'PASS' if result['passed'] else 'FAIL'
+            print(f"{flag}  {result['name']:<16} {result['outcome']:<8} {result['seconds']:.2f}s  {result['detail'][:120]}")
+        failed = sum(1 for result in results if not result['passed'])
+        print(f"验证完成: 共 {len(results)} 个场景，通过 {len(results) - failed} 个，失败 {failed} 个", file=sys.stderr)
+        output = results
+    elif args.action == "bench":
+        with StandInServer() as server:
+            output = run_benchmark(server, args)
+        failed = 0
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+    if args.json_output:
+        Path(args.json_output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+        print(f"结果已保存到: {args.json_output}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+招聘信息总结报告生成工具
+逐条读取提取记录（posting_store 数据库的筛选结果或 extract_fields 的 JSON Lines），
+边读边把每条招聘信息写入报告，同时累计公司/城市计数、薪资分位数（流式分位数草图）
+和即将截止的岗位（有界堆），内存占用与记录数无关
+"""
+
+import os
+import sys
+import json
+import math
+import heapq
+import shutil
+import argparse
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from extract_fields import format_salary
+from posting_store import CONDITION_KEYS, DEFAULT_DB, PostingStore, parse_conditions
+
+
+# 薪资分位数的相对误差（1% 时薪资范围 0.1K-10000K 最多约 600 个桶）
+SKETCH_ACCURACY = 0.01
+
+# 公司计数最多跟踪的公司数，超出后按 Misra-Gries 算法近似计数
+DEFAULT_COMPANY_CAPACITY = 1000
+
+# 报告中列出的公司/城市数与即将截止的岗位数
+DEFAULT_TOP = 20
+DEFAULT_UPCOMING = 20
+
+# 报告中的字段顺序与显示名称
+SUMMARY_FIELDS = [('company_type', '企业性质'), ('education', '学历要求'), ('experience', '工作经验')]
+
+
+class QuantileSketch:
+    """
+    流式分位数草图（对数分桶，相对误差不超过 accuracy）
+
+    每个值落入 ⌈log_γ(x)⌉ 号桶（γ = (1+a)/(1-a)），只保存各桶计数，
+    查询分位数时返回所在桶的中点；桶数只取决于数值范围，与记录数无关。
+    """
+
+    def __init__(self, accuracy: float = SKETCH_ACCURACY):
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        if value <= 0:
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = 2 * self.gamma ** index / (self.gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+
+class TopCounter:
+    """
+    有界计数器（Misra-Gries）
+
+    不同取值不超过 capacity 时计数精确；超出后所有计数减一并去掉归零的值（均摊每条 O(1)），
+    真实计数在 [计数, 计数 + 累计减少次数] 之间，出现次数超过 总数/(capacity+1) 的值一定保留。
+    """
+
+    def __init__(self, capacity: int = DEFAULT_COMPANY_CAPACITY):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.error = 0
+        self.total = 0
+
+    def add(self, key: str) -> None:
+        self.total += 1
+        if key in self.counts:
+            self.counts[key] += 1
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = 1
+        else:
+            self.error += 1
+            self.counts = {other: count - 1 for other, count in self.counts.items() if count > 1}
+
+    def most_common(self, n: int) -> List[Tuple[str, int]]:
+        """返回 [(值, 计数下限)]，按计数降序（真实计数最多再多 error）"""
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+
+class UpcomingDeadlines:
+    """即将截止的岗位：有界大顶堆，只保留截止时间最早的 size 条"""
+
+    def __init__(self, today: str, size: int = DEFAULT_UPCOMING):
+        self.today = today
+        self.size = size
+        self.heap: List[Tuple[int, int, Dict]] = []
+        self.seen = 0
+
+    def add(self, record: Dict) -> None:
+        deadline = record.get('deadline')
+        if not deadline or deadline == '招满即止' or deadline < self.today:
+            return
+        try:
+            ordinal = date.fromisoformat(deadline).toordinal()
+        except ValueError:
+            return
+        self.seen += 1
+        entry = {key: record.get(key) for key in ('title', 'company', 'deadline', 'path')}
+        # 堆顶是已保留岗位中截止最晚的一条；seen 用作同一天截止时的次序，避免比较字典
+        item = (-ordinal, -self.seen, entry)
+        if len(self.heap) < self.size:
+            heapq.heappush(self.heap, item)
+        elif item > self.heap[0]:
+            heapq.heapreplace(self.heap, item)
+
+    def sorted(self) -> List[Dict]:
+        return [entry for _, _, entry in sorted(self.heap, reverse=True)]
+
+
+class ReportBuilder:
+    """
+    流式报告生成器
+
+    每条记录的招聘信息立即写入临时正文文件，统计量随记录累计；
+    finish 时先写报告概览和统计，再把正文按块拷贝到报告末尾。
+    """
+
+    def __init__(self, output: Path, today: str, top: int = DEFAULT_TOP, upcoming: int = DEFAULT_UPCOMING,
+                 company_capacity: int = DEFAULT_COMPANY_CAPACITY):
+        self.output = output
+        self.top = top
+        self.total = 0
+        self.salary = QuantileSketch()
+        self.negotiable = 0
+        self.companies = TopCounter(company_capacity)
+        # 城市取值有限（extract_fields.CITIES），精确计数
+        self.cities: Dict[str, int] = {}
+        self.summary: Dict[str, Dict[str, int]] = {field: {} for field, _ in SUMMARY_FIELDS}
+        self.until_filled = 0
+        self.upcoming = UpcomingDeadlines(today, upcoming)
+        self.missing: Dict[str, int] = {}
+        output.parent.mkdir(parents=True, exist_ok=True)
+        self._body: TextIO = tempfile.TemporaryFile('w+', encoding='utf-8', dir=output.parent)
+
+    def add(self, record: Dict) -> None:
+        """累计一条记录；缺少必需字段或不是对象时抛出 KeyError/TypeError/AttributeError，此时统计量不变"""
+        # 先格式化正文：缺少 path 等字段的记录在修改任何统计量之前就报错
+        posting = format_posting(record)
+        self.total += 1
+        salary = record.get('salary') or {}
+        if salary.get('negotiable'):
+            self.negotiable += 1
+        elif salary.get('min') is not None and salary.get('unit') == 'K/月':
+            self.salary.add((salary['min'] + (salary.get('max') or salary['min'])) / 2)
+        self.companies.add(record.get('company') or '未提及')
+        for city in (record.get('location') or {}).get('cities') or ['未提及']:
+            self.cities[city] = self.cities.get(city, 0) + 1
+        for field, _ in SUMMARY_FIELDS:
+            value = record.get(field) or '未提及'
+            self.summary[field][value] = self.summary[field].get(value, 0) + 1
+        if record.get('deadline') == '招满即止':
+            self.until_filled += 1
+        self.upcoming.add(record)
+        for field in record.get('unresolved') or []:
+            self.missing[field] = self.missing.get(field, 0) + 1
+        self._body.write(posting)
+
+    def finish(self, title: str, notes: Iterable[str] = ()) -> None:
+        """写出报告（先写临时文件再替换，生成过程中断时不会留下半份报告）"""
+        tmp_path = self.output.with_name(self.output.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(f"# {title}\n\n")
+            self._write_overview(f, notes)
+            f.write("## 招聘信息列表\n\n")
+            self._body.seek(0)
+            shutil.copyfileobj(self._body, f, 1024 * 1024)
+        self._body.close()
+        os.replace(tmp_path, self.output)
+
+    def _write_overview(self, f: TextIO, notes: Iterable[str]) -> None:
+        f.write("## 报告概览\n\n")
+        f.write(f"- 符合条件的招聘信息：{self.total} 条\n")
+        f.write(f"- 生成时间：{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        for note in notes:
+            f.write(f"- {note}\n")
+        f.write("\n### 薪资分布（K/月，取区间中点）\n\n")
+        if self.salary.count:
+            f.write("| 统计 | 最低 | P25 | 中位数 | P75 | P90 | 最高 |\n|---|---|---|---|---|---|---|\n")
+            values = [self.salary.min] + [self.salary.quantile(q) for q in (0.25, 0.5, 0.75, 0.9)] + [self.salary.max]
+            f.write(f"| {self.salary.count} 条 | " + ' | '.join(f"{value:.1f}" for value in values) + " |\n\n")
+        f.write(f"面议 {self.negotiable} 条，未提及或非月薪 {self.total - self.salary.count - self.negotiable} 条"
+                f"（分位数为近似值，相对误差不超过 {SKETCH_ACCURACY:.0%}）\n\n")
+
+        f.write("### 城市分布\n\n| 城市 | 岗位数 |\n|---|---|\n")
+        for city, count in heapq.nlargest(self.top, self.cities.items(), key=lambda item: item[1]):
+            f.write(f"| {city} | {count} |\n")
+        f.write("\n### 公司分布\n\n| 公司 | 岗位数 |\n|---|---|\n")
+        error = self.companies.error
+        for company, count in self.companies.most_common(self.top):
+            f.write(f"| {company} | {count}-{count + error} |\n" if error else f"| {company} | {count} |\n")
+        if error:
+            f.write(f"\n公司数超过 {self.companies.capacity} 家，岗位数为近似区间\n")
+
+        for field, name in SUMMARY_FIELDS:
+            counts = heapq.nlargest(self.top, self.summary[field].items(), key=lambda item: item[1])
+            f.write(f"\n### {name}\n\n" + '、'.join(f"{value} {count} 条" for value, count in counts) + "\n")
+
+        f.write(f"\n### 即将截止（最近 {self.upcoming.size} 条）\n\n")
+        upcoming = self.upcoming.sorted()
+        if upcoming:
+            f.write("| 截止时间 | 职位名称 | 公司名称 | 文档 |\n|---|---|---|---|\n")
+            for entry in upcoming:
+                f.write(f"| {entry['deadline']} | {entry['title'] or '未提及'} | {entry['company'] or '未提及'} "
+                        f"| {entry['path']} |\n")
+        f.write(f"\n{self.upcoming.today} 及以后截止 {self.upcoming.seen} 条，招满即止 {self.until_filled} 条\n\n")
+
+        if self.missing:
+            f.write("### 缺失信息\n\n" + '、'.join(f"{field} {count} 条" for field, count in
+                                               sorted(self.missing.items(), key=lambda item: -item[1])))
+            f.write("\n\n规则未能确定的字段，需要结合图片识别和阅读原文补充\n\n")
+
+
+def format_posting(record: Dict) -> str:
+    """按总结报告的招聘信息格式输出一条记录"""
+    location = record.get('location') or {}
+    place = '或'.join(location.get('cities') or []) or '未提及'
+    if location.get('district'):
+        place += f"（{location['district']}）"
+    return (f"## {record.get('title') or '未提及'} - {record.get('company') or '未提及'}\n\n"
+            f"**基本信息**\n"
+            f"- 薪资待遇：{format_salary(record.get('salary'))}\n"
+            f"- 企业性质：{record.get('company_type') or '未提及'}\n"
+            f"- 工作地点：{place}\n\n"
+            f"**时间信息**\n"
+            f"- 截止时间：{record.get('deadline') or '未提及'}\n"
+            f"- 发布时间：{record.get('published') or '未提及'}\n\n"
+            f"**要求信息**\n"
+            f"- 学历要求：{record.get('education') or '未提及'}\n"
+            f"- 工作经验：{record.get('experience') or '未提及'}\n\n"
+            f"**来源**\n"
+            f"- 文档：{record['path']}\n\n"
+            f"---\n\n")
+
+
+def read_jsonl(source: Path, skipped: List[str]) -> Iterator[Dict]:
+    """逐行读取 JSON Lines，无法解析的行记入 skipped 后跳过"""
+    with open(source, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                skipped.append(f"第{line_no}行: JSON 解析失败（{e}）")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='流式生成招聘信息总结报告（边读边写，内存占用与记录数无关）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 对数据库中符合筛选条件的岗位生成报告（按截止时间排序）
+  python build_report.py --db ./postings.db --conditions ./conditions.txt
+
+  # 直接使用 extract_fields.py 输出的 JSON Lines
+  python build_report.py --input ./postings_fields.jsonl --output ./招聘信息总结.md
+        """
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('--db', default=DEFAULT_DB, help=f'posting_store 数据库（默认：{DEFAULT_DB}）')
+    source.add_argument('--input', help='提取记录文件（JSON Lines，每行一条记录）')
+    parser.add_argument('--conditions', help='筛选条件文件（筛选条件模板格式，仅用于 --db）')
+    parser.add_argument('--where', action='append', default=[], help='单个筛选条件，如"工作地点：北京"，可重复')
+    parser.add_argument('--order-by', choices=['salary', 'deadline', 'published'], default='deadline',
+                        help='招聘信息列表的排序方式（仅用于 --db，默认：deadline）')
+    parser.add_argument('--output', help='报告文件（默认：招聘信息总结_YYYYMMDD_HHMMSS.md）')
+    parser.add_argument('--today', default=date.today().isoformat(), help='计算即将截止岗位的基准日期（默认：今天）')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help=f'列出的公司/城市数（默认：{DEFAULT_TOP}）')
+    parser.add_argument('--upcoming', type=int, default=DEFAULT_UPCOMING,
+                        help=f'列出的即将截止岗位数（默认：{DEFAULT_UPCOMING}）')
+
+    args = parser.parse_args()
+
+    output = Path(args.output or f"招聘信息总结_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md")
+    notes = []
+    skipped: List[str] = []
+    store = None
+    try:
+        if args.input:
+            records = read_jsonl(Path(args.input), skipped)
+            notes.append(f"数据来源：{args.input}")
+        else:
+            if not Path(args.db).exists():
+                print(f"ERROR:数据库不存在: {args.db}", file=sys.stderr)
+                sys.exit(1)
+            text = ''
+            if args.conditions:
+                text = Path(args.conditions).read_text(encoding='utf-8')
+            text += '\n' + '\n'.join(args.where)
+            conditions, unsupported = parse_conditions(text)
+            if unsupported:
+                print(f"以下条件不支持自动筛选，需要人工判断: {'、'.join(unsupported)}", file=sys.stderr)
+                notes.append(f"未自动筛选的条件（需人工判断）：{'、'.join(unsupported)}")
+            store = PostingStore(args.db)
+            names = {key: name for name, key in CONDITION_KEYS.items()}
+            notes.append(f"数据库共 {store.count()} 条，筛选条件："
+                         + ('；'.join(f"{names[key]}：{value}" for key, value in conditions.items()) or '无'))
+            records = store.iter_query(conditions, args.order_by)
+
+        builder = ReportBuilder(output, args.today, args.top, args.upcoming)
+        for index, record in enumerate(records, 1):
+            try:
+                builder.add(record)
+            except (KeyError, TypeError, AttributeError) as e:
+                # 缺少 path 等字段或格式不对的记录跳过，与无法解析的行一起计入概览
+                skipped.append(f"第{index}条记录: 字段缺失或格式错误（{type(e).__name__}: {e}）")
+        for message in skipped:
+            print(f"WARNING:跳过 {message}", file=sys.stderr)
+        if skipped:
+            notes.append(f"跳过无法解析或字段不完整的记录：{len(skipped)} 条")
+        builder.finish('招聘信息总结', notes)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"ERROR:报告生成失败: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if store:
+            store.close()
+
+    print(f"报告生成完成: 共 {builder.total} 条招聘信息，跳过 {len(skipped)} 条，已保存到: {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,103 +1,990 @@
 #!/usr/bin/env python3
 """
 图片下载工具
-用于从URL下载图片并保存到本地
+用于从URL下载图片并保存到本地，支持单个URL和批量并发下载
 """
 
 import os
 import sys
+import struct
+import time
+import json
+import random
+import shutil
+import hashlib
 import argparse
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from urllib.parse import urlparse
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional
 
 
-def download_image(image_url: str, output_dir: str = "./downloaded_images") -> str:
+# 批量下载默认并发数与每个主机的最大并发连接数
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST = 4
+
+# 请求超时（秒）
+DEFAULT_TIMEOUT = 30
+
+# 单个图片的默认大小上限（字节），超过时中止下载
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+# 流式下载每次读取的字节数，决定每个下载任务占用的内存
+CHUNK_SIZE = 64 * 1024
+
+# 下载中的临时文件后缀，完成后原子重命名为正式文件
+PARTIAL_SUFFIX = '.part'
+
+# 续传信息文件后缀（与临时文件并存，记录URL和 If-Range 校验值）
+RESUME_META_SUFFIX = '.json'
+
+# 下载缓存默认有效期（秒）和磁盘预算（字节）；缓存只在指定 --cache-dir 时启用
+DEFAULT_CACHE_TTL = 24 * 3600
+DEFAULT_CACHE_MAX_BYTES = 500 * 1024 * 1024
+
+# 失败重试：默认重试次数、指数退避的基数和上限（秒）
+DEFAULT_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30
+
+# Retry-After 超过该秒数时不再等待重试
+MAX_RETRY_AFTER = 120
+
+# 需要重试的HTTP状态码：限流和服务端临时错误
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+# 每个主机默认每秒请求数（令牌桶速率，0 表示不限速）
+DEFAULT_RATE_LIMIT = 10
+
+# 探测请求读取的文件头字节数（足以解析常见图片格式的类型和尺寸）
+PROBE_BYTES = 1024
+
+# 默认跳过小于 2KB 或任一边小于 48 像素的图片（追踪像素、表情、小图标，不值得OCR）
+DEFAULT_MIN_BYTES = 2 * 1024
+DEFAULT_MIN_DIMENSION = 48
+
+# 设置请求头，模拟浏览器访问
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
+}
+
+
+def create_session(workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST) -> requests.Session:
+    """
+    创建复用连接的会话：同一主机的请求复用 keep-alive 连接
+
+    Args:
+        workers: 并发线程数，决定连接池可缓存的主机数
+        per_host: 每个主机保留的最大连接数
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=max(workers, 10), pool_maxsize=per_host)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+class HostLimiter:
+    """按主机限制并发请求数，避免对同一站点同时发起过多连接"""
+
+    def __init__(self, per_host: int = DEFAULT_PER_HOST):
+        self.per_host = per_host
+        self._lock = threading.Lock()
+        self._semaphores: Dict[str, threading.BoundedSemaphore] = {}
+
+    def acquire(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.BoundedSemaphore(self.per_host)
+        semaphore.acquire()
+        return semaphore
+
+
+class RetryableError(Exception):
+    """可重试的临时错误（5xx、429 等），retry_after 为服务端要求的等待秒数"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None, status: Optional[int] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.status = status
+
+
+class RefetchRequired(Exception):
+    """
+    需要立即重新发起请求，不计入重试次数
+
+    缓存内容在验证后已被淘汰（drop_cache 为真，重新请求时不带缓存验证头），
+    或续传范围无效、服务端返回的范围与请求不一致（临时文件已丢弃，重新请求时不带 Range）。
+    """
+
+    def __init__(self, message: str, drop_cache: bool = False):
+        super().__init__(message)
+        self.drop_cache = drop_cache
+
+
+class ImageSkipped(Exception):
+    """探测后判定不值得下载的图片（追踪像素、小图标等），probe 为探测结果"""
+
+    def __init__(self, message: str, probe: Dict):
+        super().__init__(message)
+        self.probe = probe
+
+
+class TokenBucket:
+    """令牌桶：按固定速率补充令牌，允许短时突发，取不到令牌时等待"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """暂停发放令牌（收到 429/Retry-After 时，让同一主机的所有请求一起等待）"""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
+class HostRateLimiter:
+    """按主机分配令牌桶，限制每个主机每秒的请求数"""
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def bucket(self, host: str) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return bucket
+
+    def acquire(self, host: str) -> None:
+        self.bucket(host).acquire()
+
+    def pause(self, host: str, seconds: float) -> None:
+        self.bucket(host).pause(seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 响应头：秒数或 HTTP 日期"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """第 attempt 次重试前的等待秒数：指数退避 + 全抖动；服务端给出 Retry-After 时以其为准"""
+    if retry_after is not None:
+        return retry_after + random.uniform(0, BACKOFF_BASE)
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+
+class DownloadCache:
+    """
+    按URL索引、按内容哈希存储的本地下载缓存
+
+    同一内容（不同URL引用的相同logo、海报）只存一份。每个URL记录 ETag/Last-Modified，
+    在有效期（TTL）内直接使用缓存，过期后用条件请求重新验证，服务端返回304时仍使用缓存。
+    缓存总大小超过磁盘预算时，按最近使用时间淘汰最久未用的内容。
+    """
+
+    def __init__(self, cache_dir: str,
+                 ttl: float = DEFAULT_CACHE_TTL,
+                 max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.objects_dir = self.cache_dir / 'objects'
+        self.index_path = self.cache_dir / 'index.json'
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'bytes_saved': 0, 'evicted': 0}
+
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        index = {}
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+        # urls: {URL: {'sha256', 'etag', 'last_modified', 'content_type', 'validated_at'}}
+        # objects: {sha256: {'size', 'last_used'}}，按最近使用时间从旧到新排列，淘汰时从头部开始
+        self.urls: Dict[str, Dict] = index.get('urls', {})
+        self.objects: Dict[str, Dict] = dict(sorted(index.get('objects', {}).items(),
+                                                    key=lambda item: item[1]['last_used']))
+        self.total_bytes = sum(obj['size'] for obj in self.objects.values())
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """查找URL的缓存记录（内容文件已丢失的记录视为不存在）"""
+        with self._lock:
+            entry = self.urls.get(url)
+            if entry and entry['sha256'] in self.objects and self.object_path(entry['sha256']).exists():
+                return dict(entry)
+            return None
+
+    def is_fresh(self, entry: Dict) -> bool:
+        return time.time() - entry['validated_at'] < self.ttl
+
+    def conditional_headers(self, entry: Dict) -> Dict[str, str]:
+        """重新验证缓存用的条件请求头"""
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def materialize(self, url: str, entry: Dict, target: Path, revalidated: bool = False) -> bool:
+        """
+        把缓存内容复制到目标路径（先写临时文件再重命名），并记录命中
+
+        复制在锁内进行，其他线程不会在复制过程中淘汰该内容。
+
+        Returns:
+            是否命中；lookup 之后内容已被其他线程淘汰时返回 False，由调用方重新下载
+        """
+        partial = target.with_name(target.name + PARTIAL_SUFFIX)
+        with self._lock:
+            obj = self.objects.get(entry['sha256'])
+            if obj is None:
+                return False
+            try:
+                shutil.copyfile(self.object_path(entry['sha256']), partial)
+            except FileNotFoundError:
+                return False
+            os.replace(partial, target)
+            now = time.time()
+            obj['last_used'] = now
+            self._touch(entry['sha256'])
+            if revalidated:
+                self.urls[url]['validated_at'] = now
+                self.stats['revalidated'] += 1
+            else:
+                self.stats['hits'] += 1
+            self.stats['bytes_saved'] += obj['size']
+        return True
+
+    def store(self, url: str, source: Path, digest: str, headers) -> None:
+        """把下载完成的文件按内容哈希存入缓存，记录响应头，必要时淘汰旧内容"""
+        target = self.object_path(digest)
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            partial = target.with_name(f"{target.name}.{threading.get_ident()}{PARTIAL_SUFFIX}")
+            shutil.copyfile(source, partial)
+            os.replace(partial, target)
+        with self._lock:
+            now = time.time()
+            self.urls[url] = {
+                'sha256': digest,
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'content_type': headers.get('Content-Type'),
+                'validated_at': now
+            }
+            old = self.objects.pop(digest, None)
+            if old:
+                self.total_bytes -= old['size']
+            self.objects[digest] = {'size': source.stat().st_size, 'last_used': now}
+            self.total_bytes += self.objects[digest]['size']
+            self.stats['misses'] += 1
+            self._evict()
+
+    def _touch(self, digest: str) -> None:
+        """把内容移到最近使用的一端（调用方持有锁）"""
+        self.objects[digest] = self.objects.pop(digest)
+
+    def _evict(self) -> None:
+        """
+        总大小超过预算时从最久未使用的内容开始淘汰（调用方持有锁）
+
+        总大小随存入和淘汰增减，不需要每次重新累加；指向已淘汰内容的URL记录在 lookup 时视为不存在，
+        保存索引时统一清理。
+        """
+        while self.total_bytes > self.max_bytes and self.objects:
+            digest = next(iter(self.objects))
+            self.total_bytes -= self.objects.pop(digest)['size']
+            self.stats['evicted'] += 1
+            try:
+                self.object_path(digest).unlink()
+            except OSError:
+                pass
+
+    def save(self) -> None:
+        """按当前预算淘汰后保存缓存索引（先写临时文件再重命名）"""
+        with self._lock:
+            self._evict()
+            self.urls = {url: entry for url, entry in self.urls.items() if entry['sha256'] in self.objects}
+            data = {'urls': self.urls, 'objects': self.objects}
+            partial = self.index_path.with_name(self.index_path.name + PARTIAL_SUFFIX)
+            with open(partial, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(partial, self.index_path)
+
+    def summary(self) -> str:
+        stats = self.stats
+        return (f"缓存: 命中 {stats['hits']} 个，重新验证后命中 {stats['revalidated']} 个，"
+                f"未命中 {stats['misses']} 个，节省下载 {stats['bytes_saved'] / 1024 / 1024:.2f} MB，"
+                f"淘汰 {stats['evicted']} 个")
+
+
+def url_filename(image_url: str) -> str:
+    """从URL中提取文件名；URL中没有文件名时按URL的哈希生成"""
+    filename = os.path.basename(urlparse(image_url).path)
+    if not filename or '.' not in filename:
+        filename = f"image_{hashlib.sha1(image_url.encode('utf-8')).hexdigest()[:12]}.jpg"
+    return filename
+
+
+def plan_filenames(urls: List[str]) -> Dict[str, str]:
+    """为批量下载的URL分配文件名：同名文件追加URL哈希，避免并发下载时互相覆盖"""
+    names = {url: url_filename(url) for url in urls}
+    counts = Counter(names.values())
+    for url, name in names.items():
+        if counts[name] > 1:
+            stem, suffix = os.path.splitext(name)
+            names[url] = f"{stem}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}{suffix}"
+    return names
+
+
+def _resume_validator(headers) -> Optional[str]:
+    """可用于 If-Range 的校验值：强 ETag 优先，其次 Last-Modified（弱 ETag 不能用于范围请求）"""
+    etag = headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return headers.get('Last-Modified')
+
+
+def _load_partial(partial_path: Path, image_url: str) -> Optional[Dict]:
+    """读取上次中断留下的临时文件信息：同一URL且有校验值时返回 {'size', 'validator'}"""
+    meta_path = partial_path.with_name(partial_path.name + RESUME_META_SUFFIX)
+    if not partial_path.exists() or not meta_path.exists():
+        return None
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    size = partial_path.stat().st_size
+    if meta.get('url') != image_url or not meta.get('validator') or size == 0:
+        return None
+    return {'size': size, 'validator': meta['validator']}
+
+
+def _discard_partial(partial_path: Path) -> None:
+    for path in (partial_path, partial_path.with_name(partial_path.name + RESUME_META_SUFFIX)):
+        if path.exists():
+            path.unlink()
+
+
+def parse_image_header(data: bytes) -> Optional[Dict]:
+    """
+    从文件头解析图片类型和像素尺寸
+
+    支持 PNG、GIF、JPEG、WebP、BMP、ICO 和 SVG；JPEG 的尺寸位于 SOF 段，
+    文件头中元数据过长时可能解析不到尺寸，SVG 为矢量图不解析尺寸（两者均返回 None 尺寸）。
+
+    Returns:
+        {'type', 'width', 'height'}，无法识别时返回 None
+    """
+    if data.startswith(b'\x89PNG\r\n\x1a\n') and data[12:16] == b'IHDR':
+        width, height = struct.unpack('>II', data[16:24])
+        return {'type': 'png', 'width': width, 'height': height}
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        width, height = struct.unpack('<HH', data[6:10])
+        return {'type': 'gif', 'width': width, 'height': height}
+    if data.startswith(b'\xff\xd8'):
+        return {'type': 'jpeg', **_jpeg_dimensions(data)}
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return {'type': 'webp', **_webp_dimensions(data)}
+    if data.startswith(b'BM') and len(data) >= 26:
+        width, height = struct.unpack('<ii', data[18:26])
+        return {'type': 'bmp', 'width': width, 'height': abs(height)}
+    if data[:4] == b'\x00\x00\x01\x00' and len(data) >= 8:
+        # ICO 取第一个图标的尺寸，0 表示 256
+        return {'type': 'ico', 'width': data[6] or 256, 'height': data[7] or 256}
+    head = data[:256].lstrip().lower()
+    if head.startswith(b'<svg') or (head.startswith(b'<?xml') and b'<svg' in data.lower()):
+        return {'type': 'svg', 'width': None, 'height': None}
+    return None
+
+
+def _jpeg_dimensions(data: bytes) -> Dict:
+    """逐段跳过 JPEG 标记段，在 SOF0-SOF15（不含 DHT/JPG/DAC）中读取尺寸"""
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            break
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            if pos + 9 > len(data):
+                break
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return {'width': width, 'height': height}
+        pos += 2 + length
+    return {'width': None, 'height': None}
+
+
+def _webp_dimensions(data: bytes) -> Dict:
+    """WebP 三种编码格式（有损 VP8、无损 VP8L、扩展 VP8X）的尺寸"""
+    chunk = data[12:16]
+    if chunk == b'VP8 ' and len(data) >= 30:
+        width, height = struct.unpack('<HH', data[26:30])
+        return {'width': width & 0x3FFF, 'height': height & 0x3FFF}
+    if chunk == b'VP8L' and len(data) >= 25:
+        bits = int.from_bytes(data[21:25], 'little')
+        return {'width': (bits & 0x3FFF) + 1, 'height': ((bits >> 14) & 0x3FFF) + 1}
+    if chunk == b'VP8X' and len(data) >= 30:
+        return {'width': int.from_bytes(data[24:27], 'little') + 1,
+                'height': int.from_bytes(data[27:30], 'little') + 1}
+    return {'width': None, 'height': None}
+
+
+def probe_image(image_url: str, save_path: Path, headers: Dict[str, str],
+                session: Optional[requests.Session], timeout: float, resume: bool = True) -> Optional[Dict]:
+    """
+    用 Range: bytes=0-1023 请求探测图片：从文件头解析类型和尺寸，从 Content-Range/Content-Length 获取大小
+
+    服务端不支持范围请求时只读取前 1024 字节后断开。返回 206 且可续传时，
+    探测到的文件头写入临时文件，完整下载从第 1024 字节续传，探测不额外消耗流量。
+
+    Returns:
+        {'type', 'width', 'height', 'bytes'}（未知的项为 None），探测失败时返回 None（由完整下载处理错误）
+    """
+    request_headers = dict(headers)
+    request_headers['Range'] = f"bytes=0-{PROBE_BYTES - 1}"
+    try:
+        with (session or requests).get(image_url, headers=request_headers, timeout=timeout,
+                                       verify=False, allow_redirects=True, stream=True) as response:
+            if response.status_code not in (200, 206):
+                return None
+            data = b''
+            for chunk in response.iter_content(chunk_size=PROBE_BYTES):
+                data += chunk
+                if len(data) >= PROBE_BYTES:
+                    break
+            data = data[:PROBE_BYTES]
+
+            encoded = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+            content_range = response.headers.get('Content-Range', '')
+            content_length = response.headers.get('Content-Length', '')
+            total = None
+            if response.status_code == 206 and content_range.startswith('bytes 0-'):
+                size = content_range.rsplit('/', 1)[-1]
+                total = int(size) if size.isdigit() else None
+            elif response.status_code == 200 and not encoded:
+                total = int(content_length) if content_length.isdigit() else None
+            if total is None and len(data) < PROBE_BYTES and not encoded:
+                # 响应体不足探测长度，即为完整图片
+                total = len(data)
+
+            validator = _resume_validator(response.headers)
+            if (resume and validator and not encoded and response.status_code == 206
+                    and total is not None and total > len(data) == PROBE_BYTES):
+                partial_path = save_path.with_name(save_path.name + PARTIAL_SUFFIX)
+                with open(partial_path, 'wb') as f:
+                    f.write(data)
+                with open(partial_path.with_name(partial_path.name + RESUME_META_SUFFIX), 'w', encoding='utf-8') as f:
+                    json.dump({'url': image_url, 'validator': validator}, f, ensure_ascii=False)
+    except requests.exceptions.RequestException:
+        return None
+
+    info = parse_image_header(data) or {'type': None, 'width': None, 'height': None}
+    info['bytes'] = total
+    return info
+
+
+def check_probe(probe: Dict, min_bytes: int, min_dimension: int) -> Optional[str]:
+    """按阈值判断探测结果，不值得下载时返回原因（未知的大小或尺寸不作为跳过依据）"""
+    if probe['bytes'] is not None and probe['bytes'] < min_bytes:
+        return f"图片仅 {probe['bytes']} 字节，小于 {min_bytes} 字节"
+    width, height = probe['width'], probe['height']
+    if width is not None and height is not None and min(width, height) < min_dimension:
+        return f"图片尺寸 {width}x{height}，小于 {min_dimension} 像素"
+    return None
+
+
+def _fetch_image(image_url: str, save_path: Path, headers: Dict[str, str],
+                 session: Optional[requests.Session], timeout: float, max_bytes: int,
+                 cache: Optional[DownloadCache], cached: Optional[Dict],
+                 resume: bool = True) -> bool:
+    """
+    发起一次下载请求，流式写入临时文件后原子重命名
+
+    传输中途因网络原因中断时保留临时文件和校验值（ETag/Last-Modified），
+    下次请求带 Range 和 If-Range 续传；服务端返回 200（不支持范围请求或内容已变化）时从头下载。
+
+    Returns:
+        是否为缓存重新验证命中（304）
+
+    Raises:
+        RetryableError: 服务端返回 429/5xx
+        RefetchRequired: 服务端返回 304 但缓存内容已被淘汰，或续传请求返回 416 或起始位置不一致的 206
+        requests.exceptions.RequestException / Exception: 其他错误（由调用方分类处理）
+    """
+    # 先写入临时文件，完成后原子重命名，中途失败不会留下不完整的图片
+    partial_path = save_path.with_name(save_path.name + PARTIAL_SUFFIX)
+    partial = _load_partial(partial_path, image_url) if resume else None
+    request_headers = dict(headers)
+    if partial:
+        request_headers['Range'] = f"bytes={partial['size']}-"
+        request_headers['If-Range'] = partial['validator']
+
+    keep_partial = False
+    try:
+        # 流式下载图片，禁用SSL验证（用于某些有证书问题的网站）
+        with (session or requests).get(
+            image_url,
+            headers=request_headers,
+            timeout=timeout,
+            verify=False,
+            allow_redirects=True,
+            stream=True
+        ) as response:
+            # 缓存内容未变化，直接使用缓存
+            if cached and response.status_code == 304:
+                if cache.materialize(image_url, cached, save_path, revalidated=True):
+                    return True
+                # 缓存内容已被淘汰：保留续传临时文件，由调用方不带验证头重新请求
+                keep_partial = True
+                raise RefetchRequired("缓存内容已被淘汰", drop_cache=True)
+
+            # 续传位置无效（临时文件已完整或内容已变化），丢弃临时文件后由调用方不带 Range 重新请求
+            if partial and response.status_code == 416:
+                raise RefetchRequired("续传范围无效，已丢弃临时文件")
+
+            if response.status_code in RETRYABLE_STATUS:
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                message = f"HTTP {response.status_code}"
+                if retry_after is not None:
+                    message += f"（Retry-After {retry_after:.0f} 秒）"
+                raise RetryableError(message, retry_after, response.status_code)
+            response.raise_for_status()
+
+            # 检查是否为图片内容
+            content_type = response.headers.get('Content-Type', '')
+            if not content_type.startswith('image/'):
+                raise Exception(f"URL返回的不是图片内容，Content-Type: {content_type}")
+
+            # 206 且起始位置与临时文件大小一致时续传；200 时从头下载
+            # （启用了内容编码的响应解码后大小与声明不一致，不校验长度也不续传）
+            offset = 0
+            encoded = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+            content_range = response.headers.get('Content-Range', '')
+            if response.status_code == 206 and not (partial and content_range.startswith(f"bytes {partial['size']}-")):
+                # 返回的不是请求的续传范围，响应体不能当作完整文件：丢弃临时文件后由调用方不带 Range 重新请求
+                if not partial:
+                    raise Exception(f"服务端返回了未请求的部分内容: {content_range}")
+                raise RefetchRequired(f"续传范围不一致（{content_range}），已丢弃临时文件")
+            if response.status_code == 206:
+                offset = partial['size']
+                total = content_range.rsplit('/', 1)[-1]
+                expected = int(total) if total.isdigit() else None
+            else:
+                content_length = response.headers.get('Content-Length', '')
+                expected = int(content_length) if content_length.isdigit() and not encoded else None
+
+            # 声明的大小超过上限时直接放弃，不读取响应体
+            if expected is not None and expected > max_bytes:
+                raise Exception(f"图片大小 {expected} 字节超过上限 {max_bytes} 字节")
+
+            # 续传时先计算已有内容的哈希，之后分块追加写入，内存占用不超过一个分块
+            digest = hashlib.sha256()
+            if offset:
+                with open(partial_path, 'rb') as f:
+                    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+                        digest.update(chunk)
+            else:
+                # 记录校验值，传输中断后可续传
+                validator = None if encoded else _resume_validator(response.headers)
+                meta_path = partial_path.with_name(partial_path.name + RESUME_META_SUFFIX)
+                if resume and validator:
+                    with open(meta_path, 'w', encoding='utf-8') as f:
+                        json.dump({'url': image_url, 'validator': validator}, f, ensure_ascii=False)
+                elif meta_path.exists():
+                    meta_path.unlink()
+
+            received = offset
+            try:
+                with open(partial_path, 'ab' if offset else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        received += len(chunk)
+                        if received > max_bytes:
+                            raise Exception(f"图片大小超过上限 {max_bytes} 字节，已中止下载")
+                        digest.update(chunk)
+                        f.write(chunk)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError):
+                keep_partial = resume and received > 0
+                raise
+            if expected is not None and received != expected:
+                keep_partial = resume and received > 0
+                raise requests.exceptions.ChunkedEncodingError(
+                    f"连接提前关闭，已接收 {received} 字节，应为 {expected} 字节")
+
+            if cache:
+                cache.store(image_url, partial_path, digest.hexdigest(), response.headers)
+
+        os.replace(partial_path, save_path)
+        return False
+    finally:
+        # 成功时临时文件已重命名；网络中断时保留临时文件以便续传，其他失败时删除
+        if not keep_partial:
+            _discard_partial(partial_path)
+
+
+def download_image(image_url: str, output_dir: str = "./downloaded_images",
+                   session: Optional[requests.Session] = None,
+                   filename: Optional[str] = None,
+                   timeout: float = DEFAULT_TIMEOUT,
+                   max_bytes: int = DEFAULT_MAX_BYTES,
+                   cache: Optional[DownloadCache] = None,
+                   retries: int = DEFAULT_RETRIES,
+                   rate_limiter: Optional[HostRateLimiter] = None,
+                   resume: bool = True,
+                   min_bytes: int = 0,
+                   min_dimension: int = 0,
+                   quiet: bool = False) -> str:
     """
     从URL下载图片并保存到本地
 
     Args:
         image_url: 图片URL
         output_dir: 输出目录，默认为当前目录下的downloaded_images
+        session: 复用连接的会话（批量下载时共享），默认直接请求
+        filename: 保存的文件名，默认从URL中提取
+        timeout: 请求超时（秒）
+        max_bytes: 图片大小上限（字节），Content-Length 超过时不下载，传输中超过时中止
+        cache: 下载缓存（可选），有效期内直接使用缓存，过期后条件请求重新验证
+        retries: 连接失败、超时、429 和 5xx 时的最大重试次数（指数退避 + 抖动，遵循 Retry-After）
+        rate_limiter: 按主机限速的令牌桶（可选，批量下载时共享）
+        resume: 传输中断时保留临时文件，重试或下次运行时用 Range/If-Range 续传
+        min_bytes: 探测到的图片小于该字节数时跳过（与 min_dimension 均为 0 时不探测）
+        min_dimension: 探测到的图片任一边小于该像素数时跳过
+        quiet: 不输出下载成功信息（批量下载时由调用方统一输出）
 
     Returns:
         下载成功的图片本地路径
 
     Raises:
+        ImageSkipped: 探测后判定为追踪像素、小图标等不值得下载的图片
         Exception: 下载失败时抛出异常
     """
     # 创建输出目录
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
 
-    # 从URL中提取文件名
+    # 完整的保存路径
     parsed_url = urlparse(image_url)
-    filename = os.path.basename(parsed_url.path)
+    save_path = output_path / (filename or url_filename(image_url))
 
-    # 如果URL中没有文件名，使用时间戳生成
-    if not filename or '.' not in filename:
-        import time
-        filename = f"image_{int(time.time())}.jpg"
+    headers = dict(DEFAULT_HEADERS)
+    headers['Referer'] = parsed_url.scheme + '://' + parsed_url.netloc
 
-    # 完整的保存路径
-    save_path = output_path / filename
-
-    # 设置请求头，模拟浏览器访问
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'image/webp,image/apng,image/*,*/*;q=0.8',
-        'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-        'Referer': parsed_url.scheme + '://' + parsed_url.netloc
-    }
+    cached = cache.lookup(image_url) if cache else None
+    if cached and cache.is_fresh(cached):
+        if cache.materialize(image_url, cached, save_path):
+            if not quiet:
+                print(f"图片已从缓存获取: {save_path}")
+            return str(save_path)
+        # 查找后内容已被其他线程淘汰，按未缓存处理
+        cached = None
+    # 未缓存的图片先探测文件头，跳过追踪像素和小图标
+    # （缓存过或留有续传临时文件的图片已确认值得下载，不再探测）
+    partial_path = save_path.with_name(save_path.name + PARTIAL_SUFFIX)
+    if (not cached and (min_bytes > 0 or min_dimension > 0)
+            and not (resume and _load_partial(partial_path, image_url))):
+        if rate_limiter:
+            rate_limiter.acquire(parsed_url.netloc)
+        probe = probe_image(image_url, save_path, headers, session, timeout, resume)
+        reason = probe and check_probe(probe, min_bytes, min_dimension)
+        if reason:
+            _discard_partial(partial_path)
+            if not quiet:
+                print(f"跳过图片: {reason}")
+            raise ImageSkipped(reason, probe)
+    if cached:
+        headers.update(cache.conditional_headers(cached))
 
+    attempt = 0
+    retried = ''
     try:
-        # 下载图片，禁用SSL验证（用于某些有证书问题的网站）
-        response = requests.get(
-            image_url,
-            headers=headers,
-            timeout=30,
-            verify=False,
-            allow_redirects=True
-        )
-        response.raise_for_status()
+        while True:
+            if rate_limiter:
+                rate_limiter.acquire(parsed_url.netloc)
+            try:
+                revalidated = _fetch_image(image_url, save_path, headers, session, timeout,
+                                           max_bytes, cache, cached, resume)
+                break
+            except RefetchRequired as e:
+                if e.drop_cache:
+                    cached = None
+                    headers.pop('If-None-Match', None)
+                    headers.pop('If-Modified-Since', None)
+                continue
+            except (RetryableError, requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                    requests.exceptions.ChunkedEncodingError) as e:
+                retry_after = getattr(e, 'retry_after', None)
+                if (attempt >= retries or isinstance(e, requests.exceptions.SSLError)
+                        or (retry_after is not None and retry_after > MAX_RETRY_AFTER)):
+                    raise
+                delay = backoff_delay(attempt, retry_after)
+                # 被限流时暂停该主机的令牌桶，避免其他线程继续触发限流
+                if rate_limiter and getattr(e, 'status', None) in (429, 503):
+                    rate_limiter.pause(parsed_url.netloc, delay)
+                attempt += 1
+                retried = f"（已重试 {attempt} 次）"
+                time.sleep(delay)
 
-        # 检查是否为图片内容
-        content_type = response.headers.get('Content-Type', '')
-        if not content_type.startswith('image/'):
-            raise Exception(f"URL返回的不是图片内容，Content-Type: {content_type}")
-
-        # 保存图片
-        with open(save_path, 'wb') as f:
-            f.write(response.content)
-
-        print(f"图片下载成功: {save_path}")
+        if not quiet:
+            if revalidated:
+                print(f"图片未变化，已从缓存获取: {save_path}")
+            else:
+                print(f"图片下载成功: {save_path}")
         return str(save_path)
 
     except requests.exceptions.SSLError as e:
         raise Exception(f"SSL错误，无法下载图片: {str(e)}")
     except requests.exceptions.ConnectionError as e:
-        raise Exception(f"网络连接失败，请检查URL是否正确: {str(e)}")
+        raise Exception(f"网络连接失败，请检查URL是否正确{retried}: {str(e)}")
     except requests.exceptions.Timeout as e:
-        raise Exception(f"下载超时: {str(e)}")
+        raise Exception(f"下载超时{retried}: {str(e)}")
+    except RetryableError as e:
+        raise Exception(f"下载图片失败{retried}: {str(e)}")
     except requests.exceptions.RequestException as e:
-        raise Exception(f"下载图片失败: {str(e)}")
+        raise Exception(f"下载图片失败{retried}: {str(e)}")
     except Exception as e:
         raise Exception(f"保存图片失败: {str(e)}")
 
 
-def main():
-    parser = argparse.ArgumentParser(description='从URL下载图片')
-    parser.add_argument('--image-url', required=True, help='图片URL')
+def read_url_list(source: str) -> List[str]:
+    """从文件（'-' 表示标准输入）读取URL列表：每行一个，忽略空行和 # 开头的注释，保持顺序去重"""
+    stream = sys.stdin if source == '-' else open(source, 'r', encoding='utf-8')
+    try:
+        urls = [line.strip() for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return list(dict.fromkeys(url for url in urls if url and not url.startswith('#')))
+
+
+def _download_one(url: str, output_dir: str, filename: str, session: requests.Session,
+                  limiter: HostLimiter, options: Dict) -> Dict:
+    """批量下载中的单个任务：受主机并发限制，失败时返回错误信息而不抛出异常"""
+    start = time.perf_counter()
+    semaphore = limiter.acquire(urlparse(url).netloc)
+    try:
+        path = download_image(url, output_dir, session=session, filename=filename,
+                              quiet=True, **options)
+        result = {'url': url, 'status': 'success', 'path': path, 'bytes': os.path.getsize(path)}
+    except ImageSkipped as e:
+        result = {'url': url, 'status': 'skipped', 'reason': str(e), 'probe': e.probe}
+    except Exception as e:
+        result = {'url': url, 'status': 'error', 'error': str(e)}
+    finally:
+        semaphore.release()
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def download_batch(urls: Iterable[str], output_dir: str = "./downloaded_images",
+                   workers: int = DEFAULT_WORKERS, per_host: int = DEFAULT_PER_HOST,
+                   on_result=None, **options) -> List[Dict]:
+    """
+    并发批量下载图片：线程池 + 共享连接池会话 + 每主机并发限制
+
+    Args:
+        urls: 图片URL列表（重复URL只下载一次）
+        output_dir: 输出目录
+        workers: 并发线程数
+        per_host: 每个主机的最大并发请求数
+        on_result: 每个URL完成时的回调（按完成顺序调用），用于实时输出结果
+        **options: 传给 download_image 的其他参数（timeout、max_bytes 等）
+
+    Returns:
+        按输入顺序排列的结果列表，每项含 url、status（success/skipped/error）、path、reason 或 error、seconds
+    """
+    urls = list(dict.fromkeys(urls))
+    filenames = plan_filenames(urls)
+    session = create_session(workers, per_host)
+    limiter = HostLimiter(per_host)
+    results = {}
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            futures = [
+                executor.submit(_download_one, url, output_dir, filenames[url], session, limiter, options)
+                for url in urls
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['url']] = result
+                if on_result:
+                    on_result(result)
+    finally:
+        session.close()
+    return [results[url] for url in urls]
+
+
+def print_result_line(result: Dict) -> None:
+    """输出单个URL的结果行：SUCCESS:<URL>\\t<本地路径>、SKIPPED:<URL>\\t<跳过原因> 或 ERROR:<URL>\\t<错误信息>"""
+    if result['status'] == 'success':
+        print(f"SUCCESS:{result['url']}\t{result['path']}", flush=True)
+    elif result['status'] == 'skipped':
+        print(f"SKIPPED:{result['url']}\t{result['reason']}", flush=True)
+    else:
+        print(f"ERROR:{result['url']}\t{result['error']}", flush=True)
+
+
+def add_download_arguments(parser: argparse.ArgumentParser) -> None:
+    """添加下载相关的命令行参数（输出目录、并发、超时、重试、限速、大小上限、缓存），供其他脚本复用"""
     parser.add_argument('--output-dir', default='./downloaded_images', help='输出目录（默认：./downloaded_images）')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help=f'批量下载的并发数（默认：{DEFAULT_WORKERS}）')
+    parser.add_argument('--per-host', type=int, default=DEFAULT_PER_HOST,
+                        help=f'每个主机的最大并发连接数（默认：{DEFAULT_PER_HOST}）')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT,
+                        help=f'单个请求超时秒数（默认：{DEFAULT_TIMEOUT}）')
+    parser.add_argument('--cache-dir',
+                        help='下载缓存目录（指定后启用缓存，默认不使用缓存）')
+    parser.add_argument('--no-cache', action='store_true', help='不使用下载缓存（覆盖 --cache-dir）')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_CACHE_TTL / 3600,
+                        help=f'缓存有效期（小时），过期后用条件请求重新验证（默认：{DEFAULT_CACHE_TTL // 3600}）')
+    parser.add_argument('--cache-size-mb', type=float, default=DEFAULT_CACHE_MAX_BYTES / 1024 / 1024,
+                        help=f'缓存磁盘预算（MB），超过时淘汰最久未使用的内容（默认：{DEFAULT_CACHE_MAX_BYTES // 1024 // 1024}）')
+    parser.add_argument('--retries', type=int, default=DEFAULT_RETRIES,
+                        help=f'连接失败、超时、429和5xx时的最大重试次数（默认：{DEFAULT_RETRIES}）')
+    parser.add_argument('--rate-limit', type=float, default=DEFAULT_RATE_LIMIT,
+                        help=f'每个主机每秒最多请求数，0 表示不限速（默认：{DEFAULT_RATE_LIMIT}）')
+    parser.add_argument('--no-resume', action='store_true',
+                        help='传输中断时不保留临时文件续传，每次从头下载')
+    parser.add_argument('--min-size-kb', type=float, default=DEFAULT_MIN_BYTES / 1024,
+                        help=f'下载前探测文件头，小于该大小（KB）的图片跳过（默认：{DEFAULT_MIN_BYTES // 1024}）')
+    parser.add_argument('--min-dimension', type=int, default=DEFAULT_MIN_DIMENSION,
+                        help=f'下载前探测文件头，任一边小于该像素数的图片跳过（默认：{DEFAULT_MIN_DIMENSION}）；'
+                             f'与 --min-size-kb 均为 0 时不探测')
+    parser.add_argument('--max-size-mb', type=float, default=DEFAULT_MAX_BYTES / 1024 / 1024,
+                        help=f'单个图片大小上限（MB），超过时中止下载（默认：{DEFAULT_MAX_BYTES // 1024 // 1024}）')
+
+
+def build_download_options(args: argparse.Namespace) -> Dict:
+    """根据命令行参数构造传给 download_image/download_batch 的参数（启用缓存时含 cache）"""
+    options = {
+        'timeout': args.timeout,
+        'max_bytes': int(args.max_size_mb * 1024 * 1024),
+        'retries': max(0, args.retries),
+        'resume': not args.no_resume,
+        'min_bytes': max(0, int(args.min_size_kb * 1024)),
+        'min_dimension': max(0, args.min_dimension)
+    }
+    if args.rate_limit > 0:
+        options['rate_limiter'] = HostRateLimiter(args.rate_limit)
+    if args.cache_dir and not args.no_cache:
+        options['cache'] = DownloadCache(args.cache_dir, ttl=args.cache_ttl * 3600,
+                                         max_bytes=int(args.cache_size_mb * 1024 * 1024))
+    return options
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='从URL下载图片',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 下载单个图片
+  python download_image.py --image-url https://example.com/poster.jpg
+
+  # 批量下载（每行一个URL），每个URL输出一行 SUCCESS/ERROR 结果
+  python download_image.py --url-file ./urls.txt --output-dir ./images --workers 16
+
+  # 从标准输入读取URL列表
+  cat urls.txt | python download_image.py --url-file -
+        """
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--image-url', help='图片URL')
+    source.add_argument('--url-file', help="批量下载的URL列表文件，每行一个（'-' 表示从标准输入读取）")
+    add_download_arguments(parser)
 
     args = parser.parse_args()
+    options = build_download_options(args)
+    cache = options.get('cache')
+
+    if args.url_file:
+        try:
+            urls = read_url_list(args.url_file)
+        except OSError as e:
+            print(f"ERROR:无法读取URL列表: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+
+        start = time.perf_counter()
+        results = download_batch(urls, args.output_dir, workers=args.workers, per_host=args.per_host,
+                                 on_result=print_result_line, **options)
+        failed = sum(1 for result in results if result['status'] == 'error')
+        skipped = sum(1 for result in results if result['status'] == 'skipped')
+        print(f"批量下载完成: 共 {len(results)} 个，成功 {len(results) - failed - skipped} 个，"
+              f"跳过 {skipped} 个，失败 {failed} 个，用时 {time.perf_counter() - start:.2f} 秒", file=sys.stderr)
+        if cache:
+            cache.save()
+            print(cache.summary(), file=sys.stderr)
+        sys.exit(1 if failed else 0)
 
     try:
-        local_path = download_image(args.image_url, args.output_dir)
+        local_path = download_image(args.image_url, args.output_dir, **options)
         print(f"SUCCESS:{local_path}")
+    except ImageSkipped as e:
+        print(f"SKIPPED:{str(e)}")
     except Exception as e:
         print(f"ERROR:{str(e)}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        if cache:
+            cache.save()
 
 
 if __name__ == "__main__":
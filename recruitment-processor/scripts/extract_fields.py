@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+招聘信息字段提取工具
+用预编译的正则规则从招聘markdown文本中提取职位名称、公司名称、薪资、截止时间、发布时间、
+工作地点、学历、经验和企业性质，输出结构化记录；规则无法确定的字段列入 unresolved，
+只有这些字段需要再结合图片识别或人工阅读补充
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from extract_image_links import find_markdown_files
+
+
+# 需要提取的字段（规则无法确定时列入 unresolved）
+FIELDS = ('title', 'company', 'salary', 'deadline', 'published', 'location', 'education', 'experience',
+          'company_type')
+
+# 常见招聘城市：直辖市、省会、计划单列市及主要地级市
+CITIES = (
+    '北京', '上海', '天津', '重庆', '深圳', '广州', '杭州', '南京', '苏州', '成都', '武汉', '西安', '长沙',
+    '郑州', '合肥', '济南', '青岛', '厦门', '福州', '宁波', '无锡', '常州', '南通', '徐州', '温州', '嘉兴',
+    '绍兴', '金华', '台州', '佛山', '东莞', '珠海', '中山', '惠州', '汕头', '大连', '沈阳', '长春', '哈尔滨',
+    '石家庄', '太原', '呼和浩特', '南昌', '南宁', '昆明', '贵阳', '海口', '三亚', '兰州', '西宁', '银川',
+    '乌鲁木齐', '拉萨', '烟台', '潍坊', '临沂', '洛阳', '宜昌', '襄阳', '芜湖', '泉州', '漳州', '赣州',
+    '桂林', '柳州', '保定', '唐山', '廊坊', '扬州', '镇江', '盐城', '泰州', '湖州', '绵阳', '遵义', '香港',
+    '澳门', '台北'
+)
+
+# 企业性质标签（标签行的值优先于公司名称和全文）
+COMPANY_TYPE_LABELS = {'企业性质', '公司性质', '单位性质', '企业类型', '公司类型', '单位类型'}
+
+# 企业性质关键词，按优先级排列（见信息提取指南）
+COMPANY_TYPE_KEYWORDS = (
+    ('事业单位', ('事业单位', '事业编')),
+    ('国企', ('国有', '国资委', '央企', '国企', '国有企业')),
+    ('外企', ('外资', '合资', '外企', '外商独资')),
+    ('上市公司', ('上市公司', '上市企业')),
+    ('民企', ('民营', '私营', '民企', '有限责任公司')),
+)
+COMPANY_TYPES = tuple((company_type, re.compile('|'.join(keywords))) for company_type, keywords in COMPANY_TYPE_KEYWORDS)
+
+# 紧跟在企业性质关键词之后、说明描述的是客户或合作方的词（"服务国企客户""与多家外企合作"）
+COMPANY_TYPE_OTHER_PARTY = re.compile(r'[一-龥]{0,2}?(?:客户|用户|合作)')
+
+# 字段标签行：「标签：值」或「**标签**：值」
+LABEL_LINE = re.compile(r'^\s*(?:[-*+]\s*)?\**\s*([一-龥A-Za-z]{2,8})\s*\**\s*[:：]\s*\**\s*(.+?)\s*$')
+HEADING = re.compile(r'^\s{0,3}#{1,3}\s+(.+?)\s*#*\s*$')
+MARKDOWN_DECORATION = re.compile(r'[*_`>]+|!\[[^\]]*\]\([^)]*\)|\[([^\]]*)\]\([^)]*\)')
+BRACKET_TAG = re.compile(r'^[【\[]([^】\]]{1,20})[】\]]\s*')
+
+TITLE_LABELS = {'职位名称', '岗位名称', '职位', '岗位', '招聘岗位', '招聘职位'}
+COMPANY_LABELS = {'公司名称', '公司', '企业名称', '企业', '招聘单位', '单位名称', '用人单位', '招聘企业'}
+SALARY_KEYWORDS = re.compile(r'薪资|薪酬|工资|待遇|月薪|年薪|日薪|薪水|salary', re.IGNORECASE)
+DEADLINE_KEYWORDS = re.compile(r'截止|截至|报名时间|申请时间|投递时间|有效期')
+PUBLISHED_KEYWORDS = re.compile(r'发布时间|发布日期|发布于|发表于|更新时间|更新日期')
+LOCATION_KEYWORDS = re.compile(r'工作地点|工作城市|工作地址|办公地点|地点|地址|城市|base', re.IGNORECASE)
+EDUCATION_KEYWORDS = re.compile(r'学历|学位')
+EXPERIENCE_KEYWORDS = re.compile(r'经验|工作年限|年限')
+
+COMPANY_NAME = re.compile(
+    r'([一-龥A-Za-z0-9（）()]{2,30}?(?:股份有限公司|有限责任公司|有限公司|集团|研究院|研究所|银行))')
+
+# 薪资：15-25K·14薪、15k-25k、1.5-2.5万/月、8千-1.2万、8000-12000元/月、8000-1.2万/月、年薪30-40万、
+# 200元/天、15K+、18K以上
+SALARY = re.compile(
+    r'(?P<annual>年薪\s*)?'
+    r'(?P<low>\d+(?:\.\d+)?)\s*(?P<low_unit>[kK千万元])?\s*'
+    r'(?:[-~～—–至到]\s*(?P<high>\d+(?:\.\d+)?)\s*)?'
+    r'(?P<unit>[kK千]|万|元)'
+    r'(?:\s*(?:/|每|一)\s*(?P<period>月|年|天|日|小时|时))?'
+    r'(?:\s*[·•*xX×]\s*(?P<months>\d{1,2})\s*薪)?'
+    r'(?P<plus>\s*(?:\+|以上|起))?'
+)
+NEGOTIABLE = re.compile(r'面议|面谈')
+
+# 薪资单位换算为 K
+SALARY_SCALE = {'k': 1, 'K': 1, '千': 1, '万': 10, '元': 0.001}
+
+# 日期：2024-12-31、2024/12/31、2024.12.31、2024年12月31日，以及省略年份的 12月31日
+DATE = re.compile(r'(?:(?P<year>20\d{2})\s*[-/.年]\s*)?(?P<month>1[0-2]|0?[1-9])\s*[-/.月]\s*'
+                  r'(?P<day>3[01]|[12]\d|0?[1-9])(?!\d)\s*[日号]?')
+UNTIL_FILLED = re.compile(r'招满即止|招满为止|额满即止|招到即止')
+
+CITY = re.compile('|'.join(sorted(CITIES, key=len, reverse=True)))
+DISTRICT = re.compile(r'([一-龥]{1,5}?(?:新区|区|县))')
+
+EDUCATION = re.compile(r'(博士|硕士|研究生|本科|大专|专科|中专|高中)(\s*及以上|\s*以上)?|学历不限|不限学历')
+
+EXPERIENCE_RANGE = re.compile(r'(\d{1,2})\s*[-~～至到]\s*(\d{1,2})\s*年')
+EXPERIENCE_MIN = re.compile(r'(\d{1,2})\s*年\s*(?:及)?以上')
+EXPERIENCE_NONE = re.compile(r'应届生?|经验不限|不限经验|无经验要求|在校生')
+
+
+def clean_text(value: str) -> str:
+    """去除 markdown 修饰（加粗、代码、链接、图片）和首尾空白"""
+    return MARKDOWN_DECORATION.sub(lambda m: m.group(1) or '', value).strip()
+
+
+def split_lines(text: str) -> List[Tuple[str, str, str]]:
+    """把文档拆成行，标签行解析为 (标签, 值, 原行)，其他行标签和值为空"""
+    lines = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        match = LABEL_LINE.match(line)
+        if match:
+            lines.append((match.group(1), clean_text(match.group(2)), line))
+        else:
+            lines.append(('', '', line))
+    return lines
+
+
+def candidate_lines(lines: List[Tuple[str, str, str]], keywords: re.Pattern) -> Iterable[str]:
+    """产出含关键词的行（关键词所在行的匹配比全文匹配更可信）"""
+    for _, _, line in lines:
+        if keywords.search(line):
+            yield line
+
+
+def scale_salary_bounds(low: float, low_unit: Optional[str], high: Optional[float],
+                        unit: str) -> Tuple[float, Optional[float]]:
+    """
+    把薪资上下限按各自的单位换算为 K（不折算周期）
+
+    下限和上限各按自己的单位换算（8千-1.2万）；下限未写单位时与上限共用单位（15-25K），
+    但数值大于上限时按元计（8000-1.2万）。只有一个数值时单位取数字后的第一个（1.5万元）。
+    """
+    if high is None:
+        return low * SALARY_SCALE[low_unit or unit], None
+    if low_unit:
+        low_scale = SALARY_SCALE[low_unit]
+    elif unit != '元' and low > high:
+        low_scale = SALARY_SCALE['元']
+    else:
+        low_scale = SALARY_SCALE[unit]
+    return low * low_scale, high * SALARY_SCALE[unit]
+
+
+def parse_salary_match(match: re.Match) -> Dict:
+    """
+    把一个薪资匹配换算为月薪（K），年薪按12个月折算，日薪和时薪不折算
+
+    上下限的单位换算见 scale_salary_bounds。单个数值带"+""以上""起"时只有下限（max 为 None），
+    否则上下限相同。
+    """
+    unit = match.group('unit')
+    low_unit = match.group('low_unit')
+    period = match.group('period') or ('年' if match.group('annual') else '月')
+    low = float(match.group('low'))
+    high = float(match.group('high')) if match.group('high') else None
+    if high is None:
+        # 1.5万元/月：单位写在数字之后，"元"只是后缀
+        unit = low_unit or unit
+    low, high = scale_salary_bounds(low, low_unit, high, unit)
+
+    months = int(match.group('months')) if match.group('months') else None
+    salary = {'text': match.group(0).strip(), 'min': None, 'max': None, 'months': months, 'negotiable': False}
+    if period in ('天', '日', '小时', '时'):
+        salary['unit'] = f"元/{period}" if unit == '元' else f"K/{period}"
+        return salary
+    divisor = 12 if period == '年' else 1
+    salary['unit'] = 'K/月'
+    salary['min'] = round(low / divisor, 2)
+    if high is not None:
+        salary['max'] = round(high / divisor, 2)
+    elif not match.group('plus'):
+        salary['max'] = salary['min']
+    return salary
+
+
+def extract_salary(lines: List[Tuple[str, str, str]]) -> Optional[Dict]:
+    """
+    提取薪资：优先在含薪资关键词的行中查找，其次在全文中查找带 K 或"薪"的写法
+
+    面议返回 negotiable=True；只有下限（15K+、18K以上）时 max 为 None，单个数值时 max 与 min 相同。
+    """
+    for line in candidate_lines(lines, SALARY_KEYWORDS):
+        match = SALARY.search(line)
+        if match and _plausible_salary(match):
+            return parse_salary_match(match)
+        if NEGOTIABLE.search(line):
+            return {'text': '面议', 'min': None, 'max': None, 'months': None, 'unit': None, 'negotiable': True}
+    for _, _, line in lines:
+        for match in SALARY.finditer(line):
+            if match.group('unit') in 'kK' or match.group('months') or match.group('annual'):
+                if _plausible_salary(match):
+                    return parse_salary_match(match)
+    return None
+
+
+def _plausible_salary(match: re.Match) -> bool:
+    # 排除"100万用户""3000元预算"一类数字：元 需要注明周期，且数值在合理范围内
+    if match.group('unit') == '元' and not match.group('period'):
+        return False
+    monthly = parse_salary_match(match)
+    return monthly['min'] is None or 0.5 <= monthly['min'] <= 500
+
+
+def parse_date(match: re.Match, default_year: Optional[int]) -> Optional[str]:
+    year = int(match.group('year')) if match.group('year') else default_year
+    if year is None:
+        return None
+    return f"{year:04d}-{int(match.group('month')):02d}-{int(match.group('day')):02d}"
+
+
+def extract_dates(lines: List[Tuple[str, str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    提取发布时间和截止时间（YYYY-MM-DD）
+
+    截止时间取截止关键词所在行的最后一个日期（"2024-03-01至2024-03-31"取结束日期），
+    "招满即止"原样返回；省略年份的日期使用发布时间的年份，没有发布时间时视为无法确定。
+    """
+    published = None
+    for line in candidate_lines(lines, PUBLISHED_KEYWORDS):
+        match = DATE.search(line)
+        if match and match.group('year'):
+            published = parse_date(match, None)
+            break
+    default_year = int(published[:4]) if published else None
+
+    deadline = None
+    for line in candidate_lines(lines, DEADLINE_KEYWORDS):
+        dates = [parse_date(match, default_year) for match in DATE.finditer(line)]
+        dates = [date for date in dates if date]
+        if dates:
+            deadline = dates[-1]
+            break
+        if UNTIL_FILLED.search(line):
+            deadline = '招满即止'
+            break
+    if deadline is None and any(UNTIL_FILLED.search(line) for _, _, line in lines):
+        deadline = '招满即止'
+    return published, deadline
+
+
+def extract_location(lines: List[Tuple[str, str, str]], title: Optional[str]) -> Optional[Dict]:
+    """
+    提取工作地点：优先使用地点关键词所在行，其次职位名称（如"【北京】Java开发"）
+
+    多个城市用"或"连接，区域取城市之后出现的第一个"XX区/县"。
+    """
+    sources = list(candidate_lines(lines, LOCATION_KEYWORDS))
+    if title:
+        sources.append(title)
+    for line in sources:
+        cities = list(dict.fromkeys(CITY.findall(line)))
+        if cities:
+            rest = line[line.index(cities[0]) + len(cities[0]):].lstrip('市')
+            district = DISTRICT.search(rest)
+            return {'cities': cities, 'district': district.group(1) if district else None}
+    return None
+
+
+def extract_education(lines: List[Tuple[str, str, str]]) -> Optional[str]:
+    """提取最低学历要求：学历关键词所在行优先，"本科及以上"保留"及以上" """
+    for group in (list(candidate_lines(lines, EDUCATION_KEYWORDS)), [line for _, _, line in lines]):
+        for line in group:
+            match = EDUCATION.search(line)
+            if match:
+                if match.group(1) is None:
+                    return '不限'
+                level = {'研究生': '硕士', '专科': '大专'}.get(match.group(1), match.group(1))
+                return level + ('及以上' if match.group(2) else '')
+    return None
+
+
+def extract_experience(lines: List[Tuple[str, str, str]]) -> Optional[str]:
+    """提取工作经验：1-3年、3年以上、应届生可、经验不限"""
+    for line in candidate_lines(lines, EXPERIENCE_KEYWORDS):
+        match = EXPERIENCE_RANGE.search(line)
+        if match:
+            return f"{match.group(1)}-{match.group(2)}年"
+        match = EXPERIENCE_MIN.search(line)
+        if match:
+            return f"{match.group(1)}年以上"
+        if EXPERIENCE_NONE.search(line):
+            return '应届生可' if '应届' in line else '经验不限'
+    for _, _, line in lines:
+        if EXPERIENCE_NONE.search(line) and '应届' in line:
+            return '应届生可'
+    return None
+
+
+def extract_company_type(lines: List[Tuple[str, str, str]], company: Optional[str], text: str) -> Optional[str]:
+    """
+    判断企业性质：依次在企业性质标签行、公司名称和全文中按关键词优先级查找
+
+    标签行和公司名称比全文可信；关键词之后紧跟"客户""合作"等词时描述的是其他单位，不作为依据。
+    """
+    sources = [value for label, value, _ in lines if label in COMPANY_TYPE_LABELS and value]
+    if company:
+        sources.append(company)
+    sources.append(text)
+    for source in sources:
+        for company_type, pattern in COMPANY_TYPES:
+            if any(not COMPANY_TYPE_OTHER_PARTY.match(source, match.end()) for match in pattern.finditer(source)):
+                return company_type
+    return None
+
+
+def extract_title_company(lines: List[Tuple[str, str, str]]) -> Tuple[Optional[str], Optional[str]]:
+    """职位名称：标签行优先，其次第一个标题；公司名称：标签行优先，其次"XX有限公司"等全称"""
+    title = company = None
+    for label, value, _ in lines:
+        if title is None and label in TITLE_LABELS and value:
+            title = value
+        elif company is None and label in COMPANY_LABELS and value:
+            company = value
+    if title is None:
+        for _, _, line in lines:
+            match = HEADING.match(line)
+            if match:
+                title = clean_text(match.group(1))
+                break
+    if company is None:
+        for _, _, line in lines:
+            match = COMPANY_NAME.search(line)
+            if match:
+                company = match.group(1)
+                break
+    return title or None, company
+
+
+def extract_fields(text: str, path: Optional[str] = None) -> Dict:
+    """
+    从招聘文本中提取结构化字段
+
+    Args:
+        text: 文档文本（可附加图片识别出的文字）
+        path: 文档路径（写入记录，便于追溯）
+
+    Returns:
+        {'path', 'title', 'company', 'salary': {'text', 'min', 'max', 'unit', 'months', 'negotiable'},
+         'deadline', 'published', 'location': {'cities', 'district'}, 'education', 'experience',
+         'company_type', 'unresolved': [规则无法确定的字段]}
+    """
+    lines = split_lines(text)
+    title, company = extract_title_company(lines)
+    published, deadline = extract_dates(lines)
+    record = {
+        'path': path,
+        'title': title,
+        'company': company,
+        'salary': extract_salary(lines),
+        'deadline': deadline,
+        'published': published,
+        'location': extract_location(lines, title),
+        'education': extract_education(lines),
+        'experience': extract_experience(lines),
+        'company_type': extract_company_type(lines, company, text)
+    }
+    if title:
+        # 职位名称中的城市标签（【北京】）已用于工作地点
+        record['title'] = BRACKET_TAG.sub('', title) or title
+    record['unresolved'] = [field for field in FIELDS if record[field] is None]
+    return record
+
+
+def format_salary(salary: Optional[Dict]) -> str:
+    """按信息提取指南的格式输出薪资：15-25K/月、15K+/月、面议、未提及"""
+    if not salary:
+        return '未提及'
+    if salary['negotiable']:
+        return '面议'
+    if salary['min'] is None:
+        return salary['text']
+    low = f"{salary['min']:g}"
+    if salary['max'] is None:
+        text = f"{low}K+/月"
+    elif salary['max'] == salary['min']:
+        text = f"{low}K/月"
+    else:
+        text = f"{low}-{salary['max']:g}K/月"
+    if salary['months']:
+        text += f"·{salary['months']}薪"
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='从招聘markdown文档中提取结构化字段（规则提取，无法确定的字段标记为 unresolved）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 提取文件夹中所有文档的字段，每行一条JSON记录
+  python extract_fields.py --input ./postings --output ./postings_fields.jsonl
+
+  # 提取单个文档并直接输出到终端
+  python extract_fields.py --input ./postings/java.md
+        """
+    )
+    parser.add_argument('--input', required=True, help='markdown文件或文件夹路径')
+    parser.add_argument('--recursive', action='store_true', help='递归扫描子目录')
+    parser.add_argument('--output', help='输出文件（JSON Lines），默认输出到标准输出')
+
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"ERROR:路径不存在: {input_path}", file=sys.stderr)
+        sys.exit(1)
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    unresolved = Counter()
+    count = failed = 0
+    start = time.perf_counter()
+    try:
+        for md_file in find_markdown_files(input_path, args.recursive):
+            try:
+                text = md_file.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"ERROR:无法读取文档 {md_file}: {str(e)}", file=sys.stderr)
+                failed += 1
+                continue
+            record = extract_fields(text, str(md_file))
+            unresolved.update(record['unresolved'])
+            output.write(json.dumps(record, ensure_ascii=False) + '\n')
+            count += 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"提取完成: {count} 个文档，失败 {failed} 个，用时 {elapsed:.2f} 秒"
+          f"（{count / elapsed if elapsed else 0:.0f} 个/秒）", file=sys.stderr)
+    if unresolved:
+        print("需要结合图片或人工补充的字段: " + "，".join(f"{field} {n} 个" for field, n in unresolved.most_common()),
+              file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Markdown图片链接提取工具
+扫描招聘markdown文档（单个文件或文件夹），提取全部图片链接，跨文档去重后批量下载，
+并记录每张图片被哪些文档引用
+"""
+
+import io
+import os
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from download_image import add_download_arguments, build_download_options, download_batch, print_result_line
+
+
+# 支持的markdown文件扩展名
+MARKDOWN_EXTENSIONS = {'.md', '.markdown'}
+
+# 行内图片：![alt](url "title") 或 ![alt](<url>)
+# 地址中可以包含成对的括号（最多嵌套两层），如 ![x](https://a.com/a_(1).png)
+INLINE_IMAGE = re.compile(r'!\[[^\]]*\]\(\s*(?:<([^<>\n]*)>|((?:[^()\s<>]|\((?:[^()\s]|\([^()\s]*\))*\))+))'
+                          r'(?:\s+[^)]*)?\)')
+
+# 引用式图片：![alt][id]、![id][] 以及简写 ![id]
+REFERENCE_IMAGE = re.compile(r'!\[([^\]]*)\](?:\[([^\]]*)\]|(?![\[(]))')
+
+# 引用定义：[id]: url "title"（行首最多3个空格）
+REFERENCE_DEFINITION = re.compile(r'^ {0,3}\[([^\]]+)\]:\s*<?(\S+?)>?(?:\s+.*)?$')
+
+# HTML图片标签：<img src="url">（引号可选，不区分大小写）
+HTML_IMAGE = re.compile(r'<img\b[^>]*?\bsrc\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+
+# 代码块围栏：``` 或 ~~~，代码块内的内容不是图片引用
+CODE_FENCE = re.compile(r'^ {0,3}(`{3,}|~{3,})')
+
+
+def find_markdown_files(input_path: Path, recursive: bool = False) -> Iterator[Path]:
+    """逐个产出markdown文件（单个文件直接返回；文件夹按路径排序，recursive 时包含子目录）"""
+    if input_path.is_file():
+        yield input_path
+        return
+    if recursive:
+        for root, dirs, files in os.walk(input_path):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(files):
+                if Path(name).suffix.lower() in MARKDOWN_EXTENSIONS:
+                    yield Path(root) / name
+    else:
+        for path in sorted(input_path.iterdir()):
+            if path.is_file() and path.suffix.lower() in MARKDOWN_EXTENSIONS:
+                yield path
+
+
+def normalize_url(url: str) -> str:
+    """规范化图片地址：去除首尾空白，协议相对地址（//host/...）补全为 https"""
+    url = url.strip()
+    if url.startswith('//'):
+        url = 'https:' + url
+    return url
+
+
+def extract_image_links(md_file: Path) -> List[str]:
+    """逐行读取单个markdown文档，按出现顺序返回去重后的图片地址（含本地路径）"""
+    with open(md_file, 'r', encoding='utf-8', errors='replace') as f:
+        return scan_image_links(f)
+
+
+def extract_image_links_from_text(text: str) -> List[str]:
+    """从已读取的文档文本中提取图片地址（调用方已解码文档时使用，避免重复读取）"""
+    return scan_image_links(io.StringIO(text, newline=None))
+
+
+def scan_image_links(lines: Iterable[str]) -> List[str]:
+    """
+    逐行扫描markdown文本，按出现顺序返回去重后的图片地址（含本地路径）
+
+    引用式图片的定义可能出现在引用之后，因此先记录引用名，文档读完后再解析。
+    代码块中的内容不视为图片引用。
+    """
+    links: List[Tuple[str, str]] = []  # (类型, 地址或引用名)
+    definitions: Dict[str, str] = {}
+    fence = None
+
+    for line in lines:
+        fence_match = CODE_FENCE.match(line)
+        if fence_match:
+            marker = fence_match.group(1)
+            if fence is None:
+                fence = marker
+            elif marker[0] == fence[0] and len(marker) >= len(fence):
+                fence = None
+            continue
+        if fence is not None:
+            continue
+
+        definition = REFERENCE_DEFINITION.match(line)
+        if definition:
+            definitions.setdefault(definition.group(1).strip().lower(), definition.group(2))
+            continue
+
+        for match in INLINE_IMAGE.finditer(line):
+            links.append(('url', match.group(1) or match.group(2)))
+        for match in REFERENCE_IMAGE.finditer(line):
+            # ![alt][id] 使用 id；![id][] 和 ![id] 使用 alt 作为引用名
+            ref = match.group(2) or match.group(1)
+            links.append(('ref', ref.strip().lower()))
+        for match in HTML_IMAGE.finditer(line):
+            links.append(('url', match.group(1) or match.group(2) or match.group(3)))
+
+    urls = []
+    for kind, value in links:
+        url = definitions.get(value) if kind == 'ref' else value
+        if url:
+            urls.append(normalize_url(url))
+    return list(dict.fromkeys(url for url in urls if url))
+
+
+def is_remote(url: str) -> bool:
+    return url.lower().startswith(('http://', 'https://'))
+
+
+def collect_image_references(input_path: Path, recursive: bool = False) -> Dict:
+    """
+    扫描全部文档并跨文档去重
+
+    一次只读取一个文档的一行，内存占用只与不同图片地址和文档数量有关。
+
+    Returns:
+        {'documents': {文档路径: [图片地址]}, 'images': {在线图片URL: [引用它的文档]},
+         'local_images': {本地图片路径: [引用它的文档]}}
+    """
+    documents: Dict[str, List[str]] = {}
+    images: Dict[str, List[str]] = {}
+    local_images: Dict[str, List[str]] = {}
+    for md_file in find_markdown_files(input_path, recursive):
+        try:
+            urls = extract_image_links(md_file)
+        except OSError as e:
+            print(f"ERROR:无法读取文档 {md_file}: {str(e)}", file=sys.stderr)
+            continue
+        doc = str(md_file)
+        documents[doc] = urls
+        for url in urls:
+            if is_remote(url):
+                images.setdefault(url, []).append(doc)
+            else:
+                # 本地图片相对于文档所在目录
+                local = url if os.path.isabs(url) else os.path.normpath(os.path.join(md_file.parent, url))
+                local_images.setdefault(local, []).append(doc)
+    return {'documents': documents, 'images': images, 'local_images': local_images}
+
+
+def save_reference_map(references: Dict, results: Optional[List[Dict]], map_file: Path) -> None:
+    """保存图片引用关系：每张在线图片的引用文档、下载状态（含跳过原因）和本地路径，以及每个文档引用的图片"""
+    downloads = {result['url']: result for result in results or []}
+    data = {
+        'images': {
+            url: {
+                'documents': docs,
+                'status': downloads[url]['status'] if url in downloads else 'pending',
+                'path': downloads.get(url, {}).get('path'),
+                'error': downloads.get(url, {}).get('error'),
+                'skip_reason': downloads.get(url, {}).get('reason')
+            }
+            for url, docs in references['images'].items()
+        },
+        'local_images': {
+            path: {'documents': docs, 'exists': os.path.exists(path)}
+            for path, docs in references['local_images'].items()
+        },
+        'documents': references['documents']
+    }
+    map_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(map_file, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='提取markdown文档中的图片链接并批量下载',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 提取文件夹中所有文档的图片链接，去重后并发下载，并保存引用关系
+  python extract_image_links.py --input ./postings --output-dir ./downloaded_images --map-output ./image_refs.json
+
+  # 包含子目录，只提取不下载
+  python extract_image_links.py --input ./postings --recursive --no-download --map-output ./image_refs.json
+        """
+    )
+    parser.add_argument('--input', required=True, help='markdown文件或文件夹路径')
+    parser.add_argument('--recursive', action='store_true', help='递归扫描子目录')
+    parser.add_argument('--map-output', default='./image_refs.json',
+                        help='图片引用关系输出文件（默认：./image_refs.json）')
+    parser.add_argument('--no-download', action='store_true', help='只提取图片链接，不下载')
+    add_download_arguments(parser)
+
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"ERROR:路径不存在: {input_path}", file=sys.stderr)
+        sys.exit(1)
+
+    start = time.perf_counter()
+    references = collect_image_references(input_path, args.recursive)
+    reference_count = sum(len(docs) for docs in references['images'].values())
+    print(f"扫描完成: {len(references['documents'])} 个文档，在线图片 {len(references['images'])} 个"
+          f"（引用 {reference_count} 次），本地图片 {len(references['local_images'])} 个，"
+          f"用时 {time.perf_counter() - start:.2f} 秒", file=sys.stderr)
+
+    results = None
+    failed = 0
+    if not args.no_download and references['images']:
+        options = build_download_options(args)
+        results = download_batch(list(references['images']), args.output_dir, workers=args.workers,
+                                 per_host=args.per_host, on_result=print_result_line, **options)
+        failed = sum(1 for result in results if result['status'] == 'error')
+        skipped = sum(1 for result in results if result['status'] == 'skipped')
+        print(f"批量下载完成: 共 {len(results)} 个，成功 {len(results) - failed - skipped} 个，"
+              f"跳过 {skipped} 个，失败 {failed} 个", file=sys.stderr)
+        if options.get('cache'):
+            options['cache'].save()
+            print(options['cache'].summary(), file=sys.stderr)
+
+    save_reference_map(references, results, Path(args.map_output))
+    print(f"图片引用关系已保存到: {args.map_output}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
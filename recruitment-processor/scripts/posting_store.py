@@ -0,0 +1,551 @@
+#!/usr/bin/env python3
+"""
+招聘信息存储与筛选工具
+把提取出的招聘字段写入 SQLite（薪资、截止时间、发布时间、学历等列建立索引，城市单独建表索引），
+按筛选条件模板的条件直接查询，修改条件后无需重新处理源文档
+"""
+
+import re
+import sys
+import json
+import sqlite3
+import argparse
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from extract_fields import format_salary, scale_salary_bounds
+
+
+# 默认数据库文件
+DEFAULT_DB = './postings.db'
+
+# 学历层次，数值越大学历越高（"本科及以上"表示层次不低于本科）
+EDUCATION_LEVELS = {'不限': 0, '高中': 1, '中专': 1, '大专': 2, '专科': 2, '本科': 3, '硕士': 4, '研究生': 4, '博士': 5}
+
+# "招满即止"的截止时间按该日期存储，截止日期条件和排序可直接使用索引
+UNTIL_FILLED_DATE = '9999-12-31'
+
+# 没有上限的经验要求（"5年以上"、"经验不限"）用该值表示上限，便于区间比较
+OPEN_ENDED = 99
+
+# 筛选条件模板（check 用其中的示例值验证每个条件都能转换为查询）
+CONDITION_TEMPLATE = Path(__file__).resolve().parent.parent / 'references' / '筛选条件模板.md'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    title TEXT,
+    company TEXT,
+    salary_text TEXT,
+    salary_min REAL,
+    salary_max REAL,
+    salary_months INTEGER,
+    negotiable INTEGER NOT NULL DEFAULT 0,
+    deadline TEXT,
+    published TEXT,
+    district TEXT,
+    education TEXT,
+    education_level INTEGER,
+    experience TEXT,
+    experience_min INTEGER,
+    experience_max INTEGER,
+    company_type TEXT,
+    record TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS posting_cities (
+    posting_id INTEGER NOT NULL REFERENCES postings(id) ON DELETE CASCADE,
+    city TEXT NOT NULL,
+    PRIMARY KEY (city, posting_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_salary_min ON postings(salary_min);
+CREATE INDEX IF NOT EXISTS idx_postings_salary_max ON postings(salary_max);
+CREATE INDEX IF NOT EXISTS idx_postings_deadline ON postings(deadline);
+CREATE INDEX IF NOT EXISTS idx_postings_published ON postings(published);
+CREATE INDEX IF NOT EXISTS idx_postings_education ON postings(education_level);
+CREATE INDEX IF NOT EXISTS idx_postings_company_type ON postings(company_type);
+CREATE INDEX IF NOT EXISTS idx_posting_cities_posting ON posting_cities(posting_id);
+"""
+
+# 筛选条件模板中的条件名与查询参数的对应关系
+CONDITION_KEYS = {
+    '薪资范围': 'salary_range',
+    '最低薪资': 'min_salary',
+    '最高薪资': 'max_salary',
+    '工作地点': 'city',
+    '区域要求': 'district',
+    '企业性质': 'company_type',
+    '学历要求': 'education',
+    '工作经验': 'experience',
+    '截止日期': 'deadline',
+    '发布时间范围': 'published_range',
+    '关键词': 'keyword',
+}
+
+CONDITION_LINE = re.compile(r'^\s*(?:[-*]\s*)?`?([^:：`]+?)`?\s*[:：]\s*(.+?)\s*$')
+NUMBER_RANGE = re.compile(r'(\d+(?:\.\d+)?)\s*([kK千万元])?\s*(?:[-~～至到]\s*(\d+(?:\.\d+)?))?\s*([kK千]|万|元)?')
+EXPERIENCE_VALUE = re.compile(r'(\d{1,2})\s*(?:[-~～至到]\s*(\d{1,2}))?\s*年\s*(以上)?')
+DATE_VALUE = re.compile(r'20\d{2}-\d{2}-\d{2}')
+
+# 表示不限制的条件值（不生成查询条件）
+UNRESTRICTED_VALUE = re.compile(r'^(?:不限|无要求|学历不限|不限学历|经验不限|不限经验)$')
+
+
+def parse_education(value: Optional[str]) -> Optional[int]:
+    """学历要求换算为层次（"本科及以上"为本科的层次）"""
+    if not value:
+        return None
+    for name, level in EDUCATION_LEVELS.items():
+        if value.startswith(name):
+            return level
+    return None
+
+
+def parse_experience(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """
+    经验要求换算为年限区间：1-3年 → (1, 3)，5年以上 → (5, 99)，应届生可 → (0, 0)，经验不限 → (0, 99)，
+    有相关经验 → (1, 99)
+    """
+    if not value:
+        return None, None
+    if '应届' in value:
+        return 0, 0
+    if '不限' in value:
+        return 0, OPEN_ENDED
+    if '相关经验' in value:
+        return 1, OPEN_ENDED
+    match = EXPERIENCE_VALUE.search(value)
+    if not match:
+        return None, None
+    low = int(match.group(1))
+    if match.group(2):
+        return low, int(match.group(2))
+    return low, OPEN_ENDED if match.group(3) else low
+
+
+def parse_salary_value(value: str) -> Tuple[Optional[float], Optional[float]]:
+    """
+    条件中的薪资换算为月薪（K）：15-25K/月、15K、年薪30-40万、8000元、8千-1.2万、8000-1.2万
+
+    上下限的单位换算与提取时相同（见 extract_fields.scale_salary_bounds），未写单位时按 K 计。
+    """
+    match = NUMBER_RANGE.search(value)
+    if not match:
+        return None, None
+    low_unit = match.group(2)
+    high = float(match.group(3)) if match.group(3) else None
+    low, high = scale_salary_bounds(float(match.group(1)), low_unit, high, match.group(4) or low_unit or 'K')
+    divisor = 12 if '年' in value else 1
+    return round(low / divisor, 2), round(high / divisor, 2) if high is not None else None
+
+
+def split_values(value: str) -> List[str]:
+    """多值条件用"或"、"/"或逗号连接"""
+    return [part.strip() for part in re.split(r'或|/|,|，|、', value) if part.strip()]
+
+
+class PostingStore:
+    """基于 SQLite 的招聘信息存储，按路径去重（重复写入时更新）"""
+
+    def __init__(self, db_path: str = DEFAULT_DB):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def upsert(self, records: Iterable[Dict]) -> int:
+        """写入提取记录（extract_fields 的输出），同一路径的旧记录被替换，内容相同的跳过，返回写入条数"""
+        count = 0
+        with self.conn:
+            for record in records:
+                text = json.dumps(record, ensure_ascii=False)
+                row = self.conn.execute('SELECT record FROM postings WHERE path = ?', (record['path'],)).fetchone()
+                if row and row[0] == text:
+                    continue
+                salary = record.get('salary') or {}
+                location = record.get('location') or {}
+                deadline = record.get('deadline')
+                experience_min, experience_max = parse_experience(record.get('experience'))
+                self.conn.execute('DELETE FROM postings WHERE path = ?', (record['path'],))
+                cursor = self.conn.execute(
+                    'INSERT INTO postings (path, title, company, salary_text, salary_min, salary_max, salary_months, '
+                    'negotiable, deadline, published, district, education, education_level, '
+                    'experience, experience_min, experience_max, company_type, record) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (record['path'], record.get('title'), record.get('company'), salary.get('text'),
+                     salary.get('min'), salary.get('max') if salary.get('max') is not None else salary.get('min'),
+                     salary.get('months'), int(bool(salary.get('negotiable'))),
+                     UNTIL_FILLED_DATE if deadline == '招满即止' else deadline,
+                     record.get('published'), location.get('district'),
+                     record.get('education'), parse_education(record.get('education')),
+                     record.get('experience'), experience_min, experience_max, record.get('company_type'),
+                     text))
+                self.conn.executemany('INSERT OR IGNORE INTO posting_cities (posting_id, city) VALUES (?, ?)',
+                                      [(cursor.lastrowid, city) for city in location.get('cities') or []])
+                count += 1
+        # 更新统计信息，查询规划器据此在筛选条件的索引和排序索引之间选择
+        if count:
+            self.conn.execute('ANALYZE')
+        return count
+
+    def remove(self, paths: Iterable[str]) -> None:
+        with self.conn:
+            self.conn.executemany('DELETE FROM postings WHERE path = ?', [(path,) for path in paths])
+
+    def paths(self) -> Set[str]:
+        return {row[0] for row in self.conn.execute('SELECT path FROM postings')}
+
+    def count(self) -> int:
+        return self.conn.execute('SELECT COUNT(*) FROM postings').fetchone()[0]
+
+    def build_query(self, conditions: Dict[str, str], order_by: Optional[str] = None,
+                    limit: Optional[int] = None) -> Tuple[str, List]:
+        """
+        把筛选条件转换为 SQL（所有条件为"与"关系）
+
+        - 薪资范围：与岗位薪资区间有交集；最低薪资：岗位上限不低于该值（"15K+"只有下限，按下限比较）；
+          最高薪资：岗位下限不高于该值；面议或未提及薪资的岗位不满足薪资条件
+        - 工作地点/企业性质：多个值满足任一即可；学历要求："本科及以上"为本科及更高学历，"本科"为本科
+        - 工作经验：与岗位经验区间有交集（"应届生可"为经验要求是应届生可的岗位）
+        - 截止日期：截止时间不早于该日期（该日仍可投递），"招满即止"视为满足
+        - 发布时间范围：YYYY-MM-DD至YYYY-MM-DD；关键词：职位名称、公司名称或全文包含
+        - 值为"不限"等时不生成条件
+
+        Raises:
+            ValueError: 不支持的条件，或薪资、学历、经验、日期的值无法解析
+        """
+        where, params = [], []
+        for key, value in conditions.items():
+            if key not in CONDITION_KEYS.values():
+                raise ValueError(f"不支持的筛选条件: {key}")
+            if UNRESTRICTED_VALUE.match(value.strip()):
+                continue
+            if key in ('salary_range', 'min_salary', 'max_salary'):
+                low, high = parse_salary_value(value)
+                if low is None:
+                    raise ValueError(f"无法解析薪资: {value}")
+            if key == 'salary_range':
+                where.append('salary_max >= ? AND salary_min <= ?')
+                params += [low, high if high is not None else low]
+            elif key == 'min_salary':
+                where.append('salary_max >= ?')
+                params.append(low)
+            elif key == 'max_salary':
+                where.append('salary_min <= ?')
+                params.append(low)
+            elif key == 'city':
+                cities = split_values(value)
+                where.append(f"id IN (SELECT posting_id FROM posting_cities WHERE city IN ({','.join('?' * len(cities))}))")
+                params += cities
+            elif key == 'district':
+                where.append('district = ?')
+                params.append(value)
+            elif key == 'company_type':
+                types = split_values(value)
+                where.append(f"company_type IN ({','.join('?' * len(types))})")
+                params += types
+            elif key == 'education':
+                level = parse_education(value)
+                if level is None:
+                    raise ValueError(f"无法解析学历要求: {value}")
+                where.append('education_level >= ?' if '以上' in value else 'education_level = ?')
+                params.append(level)
+            elif key == 'experience':
+                low, high = parse_experience(value)
+                if low is None:
+                    raise ValueError(f"无法解析工作经验: {value}")
+                where.append('experience_max >= ? AND experience_min <= ?')
+                params += [low, high]
+            elif key == 'deadline':
+                where.append('deadline >= ?')
+                params.append(value)
+            elif key == 'published_range':
+                dates = DATE_VALUE.findall(value)
+                if not dates:
+                    raise ValueError(f"无法解析发布时间范围: {value}")
+                where.append('published BETWEEN ? AND ?')
+                params += [dates[0], dates[-1]]
+            elif key == 'keyword':
+                keywords = split_values(value)
+                where.append('(' + ' OR '.join('(title LIKE ? OR company LIKE ? OR record LIKE ?)' for _ in keywords) + ')')
+                for keyword in keywords:
+                    params += [f"%{keyword}%"] * 3
+
+        sql = 'SELECT * FROM postings'
+        if where:
+            sql += ' WHERE ' + ' AND '.join(where)
+        # 未指定排序时不加 ORDER BY（由调用方按路径排序），避免规划器为省去排序而放弃条件索引
+        order = {'salary': 'salary_max DESC, salary_min DESC', 'deadline': 'deadline IS NULL, deadline',
+                 'published': 'published DESC'}.get(order_by or '')
+        if order:
+            sql += f" ORDER BY {order}"
+        if limit:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        return sql, params
+
+    def query(self, conditions: Dict[str, str], order_by: Optional[str] = None,
+              limit: Optional[int] = None) -> List[Dict]:
+        """按条件查询，返回提取记录列表（未指定排序时按文档路径排序）"""
+        sql, params = self.build_query(conditions, order_by, None if not order_by else limit)
+        rows = self.conn.execute(sql, params).fetchall()
+        if not order_by:
+            rows.sort(key=lambda row: row['path'])
+            rows = rows[:limit] if limit else rows
+        return [json.loads(row['record']) for row in rows]
+
+    def iter_query(self, conditions: Dict[str, str], order_by: Optional[str] = None) -> Iterator[Dict]:
+        """按条件逐条返回提取记录（不一次取出全部结果，用于流式生成报告）"""
+        sql, params = self.build_query(conditions, order_by)
+        for row in self.conn.execute(sql, params):
+            yield json.loads(row['record'])
+
+    def explain(self, conditions: Dict[str, str], order_by: Optional[str] = None) -> List[str]:
+        """查询计划（确认条件使用了索引）"""
+        sql, params = self.build_query(conditions, order_by)
+        return [row[-1] for row in self.conn.execute('EXPLAIN QUERY PLAN ' + sql, params)]
+
+
+def parse_conditions(text: str) -> Tuple[Dict[str, str], List[str]]:
+    """
+    解析筛选条件模板格式的文本（每行"条件名：值"）
+
+    Returns:
+        (可查询的条件, 不支持自动筛选的条件名列表（如职位类型、公司规模、行业领域，需要人工判断）)
+    """
+    conditions, unsupported = {}, []
+    for line in text.splitlines():
+        match = CONDITION_LINE.match(line)
+        if not match:
+            continue
+        name, value = match.group(1).strip(), match.group(2).strip()
+        if name in CONDITION_KEYS:
+            conditions[CONDITION_KEYS[name]] = value
+        else:
+            unsupported.append(name)
+    return conditions, unsupported
+
+
+def template_examples(template: Path) -> List[Tuple[str, str]]:
+    """
+    收集筛选条件模板中可自动筛选的条件的示例值：条件说明中引号内的示例（如"1-3年"）、
+    可选值列表和示例模板中的条件行
+
+    Returns:
+        [(条件名, 示例值)]，按出现顺序去重
+    """
+    examples, name, in_block = [], None, False
+    for line in template.read_text(encoding='utf-8').splitlines():
+        if line.startswith('```'):
+            in_block = not in_block
+            continue
+        if in_block:
+            match = CONDITION_LINE.match(line)
+            if match:
+                examples.append((match.group(1).strip(), match.group(2).strip()))
+            continue
+        if line.startswith('## '):
+            name = None
+        match = re.match(r'^- `([^`]+)`[:：](.*)$', line)
+        if match:
+            name, rest = match.group(1), match.group(2)
+        elif name and line.startswith('  - '):
+            examples.append((name, line[4:].strip()))
+            continue
+        elif name and line.startswith('- '):
+            rest = line
+        else:
+            continue
+        examples += [(name, value) for value in re.findall(r'"([^"]+)"', rest) if 'YYYY' not in value]
+    return list(dict.fromkeys(example for example in examples if example[0] in CONDITION_KEYS))
+
+
+# 验证用的示例岗位：(路径, 薪资(下限, 上限), 城市, 企业性质, 学历, 经验, 截止时间, 发布时间)
+CHECK_POSTINGS = (
+    ('a.md', (15, 25), '北京', '国企', '本科及以上', '1-3年', '2024-12-31', '2024-03-01'),
+    ('b.md', (20, 40), '上海', '上市公司', '硕士', '应届生可', '2024-06-30', '2024-05-10'),
+    ('c.md', (8, 12), '深圳', '民企', '大专', '经验不限', '招满即止', '2024-01-15'),
+)
+
+# 需要核对结果的条件：(条件行, 应返回的岗位路径)
+CHECK_EXPECTATIONS = (
+    ('工作经验：有相关经验', {'a.md', 'c.md'}),
+    ('学历要求：不限', {'a.md', 'b.md', 'c.md'}),
+    ('学历要求：本科及以上', {'a.md', 'b.md'}),
+    ('薪资范围：8千-1.2万', {'c.md'}),
+    ('薪资范围：8000-1.2万', {'c.md'}),
+    ('最低薪资：13K', {'a.md', 'b.md'}),
+)
+
+
+def run_checks(template: Path = CONDITION_TEMPLATE) -> List[Dict]:
+    """
+    用筛选条件模板的示例值和 CHECK_EXPECTATIONS 验证条件解析和查询（内存数据库）
+
+    Returns:
+        [{'name', 'passed', 'detail'}]
+    """
+    store = PostingStore(':memory:')
+    try:
+        store.upsert({
+            'path': path, 'title': '后端开发工程师', 'company': f"{city}示例科技有限公司",
+            'salary': {'text': f"{low}-{high}K/月", 'min': low, 'max': high, 'months': None, 'negotiable': False},
+            'location': {'cities': [city], 'district': None}, 'company_type': company_type,
+            'education': education, 'experience': experience, 'deadline': deadline, 'published': published
+        } for path, (low, high), city, company_type, education, experience, deadline, published in CHECK_POSTINGS)
+
+        cases = [(f"{name}：{value}", None) for name, value in template_examples(template)]
+        cases += list(CHECK_EXPECTATIONS)
+        results = []
+        for line, expected in cases:
+            conditions, _ = parse_conditions(line)
+            try:
+                paths = {record['path'] for record in store.query(conditions)}
+            except (ValueError, IndexError) as e:
+                results.append({'name': line, 'passed': False, 'detail': str(e)})
+                continue
+            passed = expected is None or paths == expected
+            results.append({'name': line, 'passed': passed, 'detail': ','.join(sorted(paths)) or '无匹配'})
+        return results
+    finally:
+        store.close()
+
+
+def read_records(source: Path) -> Iterator[Dict]:
+    """
+    读取提取记录：extract_fields.py 输出的 JSON Lines，
+    或 process_postings.py 的结果文件（取每个成功或只有图片下载失败的文档的 fields）
+    """
+    with open(source, 'r', encoding='utf-8') as f:
+        if source.suffix == '.json':
+            for doc in json.load(f).get('documents', []):
+                if doc.get('status') in ('success', 'partial') and doc.get('fields'):
+                    yield doc['fields']
+            return
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def format_row(record: Dict) -> str:
+    location = record.get('location') or {}
+    return '\t'.join([
+        record.get('title') or '未提及', record.get('company') or '未提及', format_salary(record.get('salary')),
+        '或'.join(location.get('cities') or []) or '未提及', record.get('education') or '未提及',
+        record.get('experience') or '未提及', record.get('deadline') or '未提及', record['path']
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='招聘信息存储与筛选（SQLite 索引查询，修改条件无需重新处理文档）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 导入提取结果（extract_fields.py 的 JSONL 或 process_postings.py 的结果文件）
+  python posting_store.py load --input ./postings_fields.jsonl --db ./postings.db
+
+  # 增量处理后同步数据库：写入新增和变化的记录，删除结果文件中已不存在的文档
+  python posting_store.py load --input ./processing_results.json --db ./postings.db --sync
+
+  # 按筛选条件模板格式的文件查询
+  python posting_store.py query --db ./postings.db --conditions ./conditions.txt
+
+  # 直接在命令行给出条件，按薪资排序
+  python posting_store.py query --db ./postings.db --where "工作地点：北京或上海" --where "最低薪资：20K" --order-by salary
+
+  # 用筛选条件模板中的示例值验证条件解析和查询
+  python posting_store.py check
+        """
+    )
+    subparsers = parser.add_subparsers(dest="action", help="操作类型")
+
+    load_parser = subparsers.add_parser("load", help="导入提取结果")
+    load_parser.add_argument('--input', required=True, help='提取结果文件（.jsonl 或 .json）')
+    load_parser.add_argument('--db', default=DEFAULT_DB, help=f'数据库文件（默认：{DEFAULT_DB}）')
+    load_parser.add_argument('--sync', action='store_true', help='删除数据库中不在本次导入文件里的记录')
+
+    query_parser = subparsers.add_parser("query", help="按条件筛选")
+    query_parser.add_argument('--db', default=DEFAULT_DB, help=f'数据库文件（默认：{DEFAULT_DB}）')
+    query_parser.add_argument('--conditions', help='筛选条件文件（筛选条件模板格式，每行"条件名：值"）')
+    query_parser.add_argument('--where', action='append', default=[], help='单个筛选条件，如"工作地点：北京"，可重复')
+    query_parser.add_argument('--order-by', choices=['salary', 'deadline', 'published'], help='排序方式')
+    query_parser.add_argument('--limit', type=int, help='最多返回条数')
+    query_parser.add_argument('--format', choices=['table', 'json'], default='table', help='输出格式（默认：table）')
+    query_parser.add_argument('--explain', action='store_true', help='输出查询计划')
+
+    check_parser = subparsers.add_parser("check", help="用筛选条件模板的示例值验证条件解析和查询")
+    check_parser.add_argument('--template', default=str(CONDITION_TEMPLATE), help='筛选条件模板文件（默认：references/筛选条件模板.md）')
+
+    args = parser.parse_args()
+
+    if args.action == "check":
+        results = run_checks(Path(args.template))
+        for result in results:
+            flag = 'PASS' if result['passed'] else 'FAIL'
+            print(f"{flag}  {result['name']:<24} {result['detail'][:120]}")
+        failed = sum(1 for result in results if not result['passed'])
+        print(f"验证完成: 共 {len(results)} 个条件，通过 {len(results) - failed} 个，失败 {failed} 个", file=sys.stderr)
+        sys.exit(1 if failed else 0)
+
+    if args.action == "load":
+        store = PostingStore(args.db)
+        try:
+            loaded = set()
+
+            def tracked(records: Iterable[Dict]) -> Iterator[Dict]:
+                for record in records:
+                    loaded.add(record['path'])
+                    yield record
+
+            count = store.upsert(tracked(read_records(Path(args.input))))
+            removed = store.paths() - loaded if args.sync else set()
+            store.remove(removed)
+            print(f"导入完成: 写入 {count} 条，删除 {len(removed)} 条，数据库共 {store.count()} 条", file=sys.stderr)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"ERROR:导入失败: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            store.close()
+        return
+
+    if args.action == "query":
+        text = ''
+        if args.conditions:
+            text = Path(args.conditions).read_text(encoding='utf-8')
+        text += '\n' + '\n'.join(args.where)
+        conditions, unsupported = parse_conditions(text)
+        if unsupported:
+            print(f"以下条件不支持自动筛选，需要人工判断: {'、'.join(unsupported)}", file=sys.stderr)
+
+        store = PostingStore(args.db)
+        try:
+            if args.explain:
+                for line in store.explain(conditions, args.order_by):
+                    print(f"PLAN:{line}", file=sys.stderr)
+            records = store.query(conditions, args.order_by, args.limit)
+            total = store.count()
+        except (ValueError, IndexError) as e:
+            print(f"ERROR:筛选条件无效: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        finally:
+            store.close()
+
+        if args.format == 'json':
+            print(json.dumps(records, ensure_ascii=False, indent=2))
+        else:
+            for record in records:
+                print(format_row(record))
+        print(f"筛选完成: 共 {total} 条，符合条件 {len(records)} 条", file=sys.stderr)
+        return
+
+    parser.print_help()
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
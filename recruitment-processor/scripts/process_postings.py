@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+招聘文档批量处理工具
+扫描输入路径、规划批次（≤10个文档一次处理，否则每批10个），用线程池逐批处理文档：
+提取字段和图片引用、下载在线图片、核对本地图片，每处理完一个文档就追加写入台账（按路径和内容哈希记录），
+重复运行（包括中断后续跑和每天新增文档后再次运行）只处理新增或内容变化的文档，结果从台账汇总
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime
+from urllib.parse import urlparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from download_image import (HostLimiter, ImageSkipped, add_download_arguments, build_download_options,
+                            create_session, download_image, url_filename)
+from extract_fields import extract_fields
+from extract_image_links import extract_image_links_from_text, find_markdown_files, is_remote
+
+
+# 自适应分批：文档数不超过该值时一次处理，否则按该值分批
+BATCH_SIZE = 10
+
+# 默认同时处理的文档数
+DEFAULT_DOC_WORKERS = 4
+
+# 默认台账文件与结果文件
+DEFAULT_LEDGER = './processing_ledger.jsonl'
+DEFAULT_RESULTS = './processing_results.json'
+
+
+def plan_batches(files: List[Path], batch_size: int = BATCH_SIZE) -> List[List[Path]]:
+    """按自适应分批规则规划批次：文档数不超过 batch_size 时只有一批"""
+    return [files[i:i + batch_size] for i in range(0, len(files), batch_size)]
+
+
+class ImageFetcher:
+    """
+    处理文档时共享的图片下载器
+
+    所有文档共用一个连接池会话和每主机并发限制；同一URL只下载一次（其他文档等待同一结果）。
+    文件名统一追加URL哈希：不同URL的同名文件不会互相覆盖，且与处理顺序无关，
+    续跑时同一URL仍对应同一文件（可续传临时文件、复用缓存）。
+    """
+
+    def __init__(self, output_dir: str, workers: int, per_host: int, options: Dict):
+        self.output_dir = output_dir
+        self.options = options
+        self.session = create_session(workers, per_host)
+        self.limiter = HostLimiter(per_host)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+
+    @staticmethod
+    def filename(url: str) -> str:
+        stem, suffix = os.path.splitext(url_filename(url))
+        return f"{stem}_{hashlib.sha1(url.encode('utf-8')).hexdigest()[:8]}{suffix}"
+
+    def _download(self, url: str, filename: str) -> Dict:
+        semaphore = self.limiter.acquire(urlparse(url).netloc)
+        try:
+            path = download_image(url, self.output_dir, session=self.session, filename=filename,
+                                  quiet=True, **self.options)
+            return {'status': 'success', 'path': path}
+        except ImageSkipped as e:
+            return {'status': 'skipped', 'reason': str(e)}
+        except Exception as e:
+            return {'status': 'error', 'error': str(e)}
+        finally:
+            semaphore.release()
+
+    def fetch(self, urls: List[str]) -> Dict[str, Dict]:
+        """下载一组图片（已下载或正在下载的URL复用结果），返回 {URL: 下载结果}"""
+        with self._lock:
+            futures = {}
+            for url in urls:
+                if url not in self._futures:
+                    self._futures[url] = self.executor.submit(self._download, url, self.filename(url))
+                futures[url] = self._futures[url]
+        return {url: future.result() for url, future in futures.items()}
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        self.session.close()
+
+
+def process_document(md_file: Path, fetcher: Optional[ImageFetcher]) -> Dict:
+    """
+    处理单个文档：读取文本，用规则提取结构化字段，提取图片引用，下载在线图片并核对本地图片
+
+    图片下载失败记录在图片结果中（调用方据此把文档记为 partial，--retry-failed 时重新处理）；
+    文本不是有效的UTF-8时按替换字符解码并记录警告，仍然提取字段；文档无法读取时抛出异常，由调用方记为失败。
+
+    Returns:
+        {'sha256', 'size', 'mtime_ns': 处理时的内容哈希、大小和修改时间, 'chars': 文本字数,
+         'fields': 提取的字段（见 extract_fields，unresolved 为需要结合图片补充的字段）,
+         'images': [{'ref', 'source'（online/local）, 'status', 'path'/'reason'/'error'}],
+         'warnings': 处理中的警告（无警告时为空列表）}
+    """
+    # 先取修改时间再读取：读取期间文件被修改时，下次运行会因修改时间不一致而重新核对哈希
+    stat = md_file.stat()
+    with open(md_file, 'rb') as f:
+        data = f.read()
+    # 字段和图片引用都从同一份解码后的文本中提取，每个文档只读取一次
+    warnings = []
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # GBK 等编码或个别坏字节不应让整条招聘信息丢失，替换无法解码的字节后继续提取
+        text = data.decode('utf-8', errors='replace')
+        warnings.append(f"文本不是有效的UTF-8编码（位置 {e.start}），无法解码的字节已替换为 U+FFFD")
+    refs = extract_image_links_from_text(text)
+    online = [ref for ref in refs if is_remote(ref)]
+    downloads = fetcher.fetch(online) if fetcher and online else {}
+
+    images = []
+    for ref in refs:
+        if is_remote(ref):
+            result = downloads.get(ref, {'status': 'pending'})
+            images.append({'ref': ref, 'source': 'online', **result})
+        else:
+            local = ref if os.path.isabs(ref) else os.path.normpath(os.path.join(md_file.parent, ref))
+            status = 'success' if os.path.isfile(local) else 'missing'
+            images.append({'ref': ref, 'source': 'local', 'status': status, 'path': local})
+    return {'sha256': hashlib.sha256(data).hexdigest(), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'chars': len(text), 'fields': extract_fields(text, str(md_file)), 'images': images,
+            'warnings': warnings}
+
+
+class Ledger:
+    """
+    已处理文档台账（JSON Lines），按绝对路径记录内容 SHA-256、大小、修改时间和处理结果
+
+    使用绝对路径，同一文件夹以相对路径或绝对路径、在不同工作目录下输入时对应同一条记录。
+
+    每处理完一个文档追加一行并立即刷新到磁盘，中断时最多丢失正在写入的最后一行（读取时忽略）；
+    同一路径以最后一行为准。重复运行时内容未变化的文档直接使用台账中的结果，
+    运行结束后若有文件已删除或过期行多于有效行，压缩重写台账。
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.documents: Dict[str, Dict] = {}
+        self.lines = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> None:
+        if not self.path.exists():
+            return
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if entry.get('type') == 'document':
+                    # 旧版台账记录的是相对路径，按当前目录换算为绝对路径
+                    entry['path'] = os.path.abspath(entry['path'])
+                    self.documents[entry['path']] = entry
+                    self.lines += 1
+
+    def open(self, restart: bool = False) -> None:
+        """打开台账准备追加（restart 时清空）"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if restart:
+            self.documents, self.lines = {}, 0
+        self._file = open(self.path, 'w' if restart else 'a', encoding='utf-8')
+
+    def record(self, entry: Dict) -> None:
+        entry = {'type': 'document', **entry}
+        with self._lock:
+            self.documents[entry['path']] = entry
+            self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self.lines += 1
+
+    def compact(self) -> None:
+        """有文件已删除或过期行多于有效行时重写台账（先写临时文件再替换），只保留仍存在的文件"""
+        live = {path: doc for path, doc in self.documents.items() if os.path.exists(path)}
+        if len(live) == len(self.documents) and self.lines <= 2 * len(live):
+            return
+        self.documents = live
+        self.close()
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry in self.documents.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        os.replace(tmp_path, self.path)
+        self.lines = len(self.documents)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def classify_files(files: List[Path], ledger: Ledger, retry_failed: bool = False,
+                   rehash: bool = False) -> Tuple[List[Path], Dict[str, int]]:
+    """
+    对比台账找出需要处理的文档
+
+    大小和修改时间与台账一致时视为未变化（不读取文件）；不一致时计算内容哈希，
+    哈希相同（如只是被复制或touch过）同样视为未变化，并更新台账中的大小和修改时间。
+    rehash 时对所有文档计算哈希；retry_failed 时重新处理上次失败和有在线图片下载失败（partial）的文档。
+
+    Returns:
+        (需要处理的文档, {'new', 'changed', 'unchanged'} 计数)
+    """
+    todo, counts = [], {'new': 0, 'changed': 0, 'unchanged': 0}
+    for path in files:
+        entry = ledger.documents.get(str(path))
+        if entry is None:
+            todo.append(path)
+            counts['new'] += 1
+            continue
+        try:
+            stat = path.stat()
+            same_stat = entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns
+            unchanged = (same_stat and not rehash) or entry.get('sha256') == file_digest(path)
+        except OSError:
+            unchanged = False
+        if unchanged and not same_stat:
+            ledger.record({**entry, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns})
+        if unchanged and (entry['status'] == 'success' or not retry_failed):
+            counts['unchanged'] += 1
+        else:
+            todo.append(path)
+            counts['changed'] += 1
+    return todo, counts
+
+
+def progress_summary(files: List[Path], batches: List[List[Path]], documents: Dict[str, Dict],
+                     pending: int) -> Dict:
+    """统计进度：总数、已处理、待处理、成功、部分图片下载失败、失败"""
+    done = [documents[str(path)] for path in files if str(path) in documents]
+    success = sum(1 for doc in done if doc['status'] == 'success')
+    partial = sum(1 for doc in done if doc['status'] == 'partial')
+    return {
+        'total': len(files),
+        'processed': len(files) - pending,
+        'pending': pending,
+        'batches': len(batches),
+        'success': success,
+        'partial': partial,
+        'failed': len(done) - success - partial
+    }
+
+
+def run(input_path: Path, recursive: bool, ledger: Ledger, doc_workers: int,
+        fetcher: Optional[ImageFetcher], batch_size: int = BATCH_SIZE,
+        retry_failed: bool = False, restart: bool = False, rehash: bool = False) -> Dict:
+    """
+    扫描文档，只对新增或内容变化的文档分批处理，结果从台账汇总
+
+    中断后重新运行时，已写入台账的文档内容未变化，会直接跳过；restart 时清空台账从头处理。
+
+    Returns:
+        {'progress'（含 new/changed/unchanged/removed 计数）, 'batches'（本次处理的批次）,
+         'documents'（全部文档的台账记录，按扫描顺序排列）}
+    """
+    # 文档路径统一为绝对路径，与台账中的记录对应
+    files = [Path(os.path.abspath(path)) for path in find_markdown_files(input_path, recursive)]
+    if not restart:
+        ledger.load()
+    removed = sum(1 for path in ledger.documents if not os.path.exists(path))
+    ledger.open(restart)
+
+    todo, counts = classify_files(files, ledger, retry_failed, rehash)
+    batches = plan_batches(todo, batch_size)
+    print(f"扫描完成: 共 {len(files)} 个文件，新增 {counts['new']} 个，变化 {counts['changed']} 个，"
+          f"未变化 {counts['unchanged']} 个，已删除 {removed} 个", file=sys.stderr)
+
+    def handle(md_file: Path) -> Dict:
+        start = time.perf_counter()
+        result = {'path': str(md_file)}
+        try:
+            result.update(process_document(md_file, fetcher))
+            # 有在线图片下载失败时记为 partial，--retry-failed 时重新下载
+            failed_images = sum(1 for image in result['images']
+                                if image['source'] == 'online' and image['status'] == 'error')
+            result['status'] = 'partial' if failed_images else 'success'
+        except Exception as e:
+            result.update(status='error', error=str(e))
+            # 失败的文档同样记录内容标识，未修改时不再重复处理（除非 --retry-failed）
+            try:
+                stat = md_file.stat()
+                result.update(sha256=file_digest(md_file), size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+            except OSError:
+                pass
+        result['seconds'] = round(time.perf_counter() - start, 3)
+        result['processed_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        return result
+
+    pending = len(todo)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, doc_workers)) as executor:
+            for index, batch in enumerate(batches, 1):
+                print(f"正在处理第{index}批，共{len(batches)}批，文件数{len(batch)}个", file=sys.stderr)
+                futures = [executor.submit(handle, md_file) for md_file in batch]
+                for future in as_completed(futures):
+                    result = future.result()
+                    ledger.record(result)
+                    pending -= 1
+                    if result['status'] == 'success':
+                        print(f"SUCCESS:{result['path']}", flush=True)
+                    elif result['status'] == 'partial':
+                        failed_images = sum(1 for image in result['images'] if image['status'] == 'error')
+                        print(f"PARTIAL:{result['path']}\t{failed_images} 张图片下载失败", flush=True)
+                    else:
+                        print(f"ERROR:{result['path']}\t{result['error']}", flush=True)
+                    for warning in result.get('warnings', []):
+                        print(f"WARNING:{result['path']}\t{warning}", file=sys.stderr)
+                progress = progress_summary(files, batches, ledger.documents, pending)
+                print(f"第{index}批完成，已处理{progress['processed']}个文件，待处理{progress['pending']}个文件",
+                      file=sys.stderr)
+        ledger.compact()
+    finally:
+        ledger.close()
+
+    progress = progress_summary(files, batches, ledger.documents, pending)
+    progress.update(counts, removed=removed)
+    return {
+        'progress': progress,
+        'batches': [[str(path) for path in batch] for batch in batches],
+        'documents': [ledger.documents[str(path)] for path in files if str(path) in ledger.documents]
+    }
+
+
+def save_results(results: Dict, results_file: Path) -> None:
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    documents = [{key: value for key, value in doc.items() if key != 'type'} for doc in results['documents']]
+    with open(results_file, 'w', encoding='utf-8') as f:
+        json.dump({**results, 'documents': documents}, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='批量处理招聘markdown文档（分批、并发、按台账增量处理）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 处理文件夹中的所有文档，下载在线图片，结果写入台账
+  python process_postings.py --input ./postings --output-dir ./downloaded_images
+
+  # 新增文档或中断后用相同命令重新运行，只处理新增和内容变化的文档；--retry-failed 重新处理失败和图片下载失败的文档
+  python process_postings.py --input ./postings --retry-failed
+
+  # 只扫描和核对图片引用，不下载
+  python process_postings.py --input ./postings --recursive --no-download --restart
+        """
+    )
+    parser.add_argument('--input', required=True, help='markdown文件或文件夹路径')
+    parser.add_argument('--recursive', action='store_true', help='递归扫描子目录')
+    parser.add_argument('--ledger', default=DEFAULT_LEDGER,
+                        help=f'已处理文档台账（默认：{DEFAULT_LEDGER}）')
+    parser.add_argument('--results', default=DEFAULT_RESULTS, help=f'处理结果输出文件（默认：{DEFAULT_RESULTS}）')
+    parser.add_argument('--doc-workers', type=int, default=DEFAULT_DOC_WORKERS,
+                        help=f'同时处理的文档数（默认：{DEFAULT_DOC_WORKERS}）')
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help=f'每批文档数（默认：{BATCH_SIZE}）')
+    parser.add_argument('--restart', action='store_true', help='清空台账，从头处理所有文档')
+    parser.add_argument('--retry-failed', action='store_true', help='重新处理台账中失败和有图片下载失败（partial）的文档')
+    parser.add_argument('--rehash', action='store_true', help='对所有文档重新计算内容哈希（不信任修改时间）')
+    parser.add_argument('--no-download', action='store_true', help='不下载在线图片')
+    add_download_arguments(parser)
+
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists():
+        print(f"ERROR:路径不存在: {input_path}", file=sys.stderr)
+        sys.exit(1)
+
+    options = build_download_options(args)
+    cache = options.get('cache')
+    fetcher = None if args.no_download else ImageFetcher(args.output_dir, args.workers, args.per_host, options)
+
+    start = time.perf_counter()
+    try:
+        results = run(input_path, args.recursive, Ledger(Path(args.ledger)), args.doc_workers,
+                      fetcher, batch_size=max(1, args.batch_size), retry_failed=args.retry_failed,
+                      restart=args.restart, rehash=args.rehash)
+    finally:
+        if fetcher:
+            fetcher.close()
+        if cache:
+            cache.save()
+
+    save_results(results, Path(args.results))
+    progress = results['progress']
+    print(f"处理完成: 共 {progress['total']} 个文件，本次处理 {progress['batches']} 批，成功 {progress['success']} 个，"
+          f"图片下载失败 {progress['partial']} 个，失败 {progress['failed']} 个，用时 {time.perf_counter() - start:.2f} 秒", file=sys.stderr)
+    print(f"处理结果已保存到: {args.results}", file=sys.stderr)
+    sys.exit(1 if progress['failed'] else 0)
+
+
+if __name__ == "__main__":
+    main()